@@ -0,0 +1,17 @@
+-- ---! Materialized view refresh altyapısı
+-- ---! REFRESH MATERIALIZED VIEW CONCURRENTLY, view üzerinde unique index ister
+CREATE UNIQUE INDEX IF NOT EXISTS ux_mvw_analysis_result_call_id
+    ON public.mvw_analysis_result (call_id);
+
+-- ---! Her başarılı refresh bir satır ekler; version monoton artan view versiyonudur
+CREATE TABLE IF NOT EXISTS public.materialized_view_refresh (
+    version BIGSERIAL PRIMARY KEY,
+    view_name TEXT NOT NULL,
+    refreshed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    duration_ms DOUBLE PRECISION NOT NULL,
+    concurrent BOOLEAN NOT NULL,
+    trigger TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_materialized_view_refresh_view_version
+    ON public.materialized_view_refresh (view_name, version DESC);
@@ -0,0 +1,48 @@
+-- ---! AllResultViewRepository._apply_filters'ın kullandığı kolonlar için index paketi
+-- ---! Index'ler materialized view üzerinde; REFRESH ... CONCURRENTLY bunları da günceller
+-- ---! Kontrol: python scripts/check_filter_indexes.py
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- ---! agent_name / reason_contains: ILIKE '%x%' sadece trigram GIN index ile index'lenebilir
+CREATE INDEX IF NOT EXISTS ix_mvw_analysis_result_agent_name_trgm
+    ON public.mvw_analysis_result USING gin (call_agent_name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS ix_mvw_analysis_result_reason_trgm
+    ON public.mvw_analysis_result USING gin (base_analysis_reason gin_trgm_ops);
+
+-- ---! phone_number: eşitlik
+CREATE INDEX IF NOT EXISTS ix_mvw_analysis_result_phone_number
+    ON public.mvw_analysis_result (call_phone_number);
+
+-- ---! created_at_from / created_at_to: aralık + keyset pagination sırası (call_created_at, call_id)
+-- ---! BRIN yerine btree: view'ın fiziksel sırası call_created_at ile garanti değil ve sıralı okuma gerekiyor
+CREATE INDEX IF NOT EXISTS ix_mvw_analysis_result_created_at_call_id
+    ON public.mvw_analysis_result (call_created_at, call_id);
+
+-- ---! follow_up_required: düşük seçicilik; created_at ile birlikte sayfalama sırasını da karşılar
+CREATE INDEX IF NOT EXISTS ix_mvw_analysis_result_followup_created_at
+    ON public.mvw_analysis_result (base_analysis_call_requires_followup, call_created_at, call_id);
+
+-- ---! Sayısal aralık filtreleri
+CREATE INDEX IF NOT EXISTS ix_mvw_analysis_result_duration
+    ON public.mvw_analysis_result (call_duration);
+
+CREATE INDEX IF NOT EXISTS ix_mvw_analysis_result_agent_speech_rate
+    ON public.mvw_analysis_result (call_agent_speech_rate);
+
+CREATE INDEX IF NOT EXISTS ix_mvw_analysis_result_customer_speech_rate
+    ON public.mvw_analysis_result (call_customer_speech_rate);
+
+CREATE INDEX IF NOT EXISTS ix_mvw_analysis_result_silence_rate
+    ON public.mvw_analysis_result (call_silence_rate);
+
+CREATE INDEX IF NOT EXISTS ix_mvw_analysis_result_cross_talk_rate
+    ON public.mvw_analysis_result (call_cross_talk_rate);
+
+CREATE INDEX IF NOT EXISTS ix_mvw_analysis_result_agent_interrupt_count
+    ON public.mvw_analysis_result (call_agent_interrupt_count);
+
+CREATE INDEX IF NOT EXISTS ix_mvw_analysis_result_churn_risk
+    ON public.mvw_analysis_result (issue_analysis_churn_risk);
+
+ANALYZE public.mvw_analysis_result;
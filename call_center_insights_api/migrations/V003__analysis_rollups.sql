@@ -0,0 +1,148 @@
+-- ---! Zaman serisi grafikleri için saatlik/günlük rollup tabloları
+-- ---! Anahtar: (bucket, agent_name, call_reason); base analizi olmayan görüşmelerde call_reason = ''
+-- ---! Ortalamalar toplam/sayı olarak tutulur ki bucket'lar ve anahtarlar üzerinden doğru toplanabilsin
+CREATE TABLE IF NOT EXISTS public.analysis_rollup_hourly (
+    bucket TIMESTAMPTZ NOT NULL,
+    agent_name TEXT NOT NULL,
+    call_reason TEXT NOT NULL DEFAULT '',
+    call_count BIGINT NOT NULL,
+    total_duration DOUBLE PRECISION NOT NULL,
+    analyzed_count BIGINT NOT NULL,
+    follow_up_count BIGINT NOT NULL,
+    churn_scored_count BIGINT NOT NULL,
+    churn_risk_sum BIGINT NOT NULL,
+    PRIMARY KEY (bucket, agent_name, call_reason)
+);
+
+CREATE TABLE IF NOT EXISTS public.analysis_rollup_daily (
+    bucket TIMESTAMPTZ NOT NULL,
+    agent_name TEXT NOT NULL,
+    call_reason TEXT NOT NULL DEFAULT '',
+    call_count BIGINT NOT NULL,
+    total_duration DOUBLE PRECISION NOT NULL,
+    analyzed_count BIGINT NOT NULL,
+    follow_up_count BIGINT NOT NULL,
+    churn_scored_count BIGINT NOT NULL,
+    churn_risk_sum BIGINT NOT NULL,
+    PRIMARY KEY (bucket, agent_name, call_reason)
+);
+
+-- ---! Ajan filtresiz zaman serisi sorguları için
+CREATE INDEX IF NOT EXISTS ix_analysis_rollup_hourly_bucket ON public.analysis_rollup_hourly (bucket);
+CREATE INDEX IF NOT EXISTS ix_analysis_rollup_daily_bucket ON public.analysis_rollup_daily (bucket);
+
+-- ---! Verilen call_id'lerin düştüğü (bucket, agent) anahtarlarını mvw_analysis_result'tan yeniden hesaplar
+-- ---! Sadece etkilenen saatler okunur; upsert ile tekrar gelen kayıtlar çift sayılmaz
+-- ---! Gün/saat sınırları Europe/Istanbul'a göredir (ingestion script'leri de bu zaman dilimini kullanır)
+CREATE OR REPLACE FUNCTION public.refresh_analysis_rollups(p_call_ids UUID[])
+RETURNS INTEGER
+LANGUAGE plpgsql
+SET timezone = 'Europe/Istanbul'
+AS $$
+DECLARE
+    affected_count INTEGER;
+BEGIN
+    CREATE TEMP TABLE IF NOT EXISTS tmp_rollup_affected (
+        bucket TIMESTAMPTZ NOT NULL,
+        day_bucket TIMESTAMPTZ NOT NULL,
+        agent_name TEXT NOT NULL
+    ) ON COMMIT DROP;
+    TRUNCATE tmp_rollup_affected;
+
+    INSERT INTO tmp_rollup_affected (bucket, day_bucket, agent_name)
+    SELECT DISTINCT date_trunc('hour', call_created_at), date_trunc('day', call_created_at), call_agent_name
+    FROM public.mvw_analysis_result
+    WHERE call_id = ANY(p_call_ids);
+
+    GET DIAGNOSTICS affected_count = ROW_COUNT;
+
+    DELETE FROM public.analysis_rollup_hourly h
+    USING tmp_rollup_affected a
+    WHERE h.bucket = a.bucket AND h.agent_name = a.agent_name;
+
+    INSERT INTO public.analysis_rollup_hourly
+    SELECT
+        date_trunc('hour', m.call_created_at),
+        m.call_agent_name,
+        COALESCE(m.base_analysis_reason, ''),
+        count(*),
+        COALESCE(sum(m.call_duration), 0),
+        count(m.base_analysis_call_id),
+        count(*) FILTER (WHERE m.base_analysis_call_requires_followup),
+        count(m.issue_analysis_churn_risk),
+        COALESCE(sum(m.issue_analysis_churn_risk), 0)
+    FROM public.mvw_analysis_result m
+    JOIN (SELECT DISTINCT bucket, agent_name FROM tmp_rollup_affected) a
+        ON m.call_agent_name = a.agent_name
+       AND m.call_created_at >= a.bucket
+       AND m.call_created_at < a.bucket + INTERVAL '1 hour'
+    GROUP BY 1, 2, 3;
+
+    -- ---! Günlük rollup, etkilenen günlerin saatlik satırlarından türetilir
+    DELETE FROM public.analysis_rollup_daily d
+    USING (SELECT DISTINCT day_bucket, agent_name FROM tmp_rollup_affected) a
+    WHERE d.bucket = a.day_bucket AND d.agent_name = a.agent_name;
+
+    INSERT INTO public.analysis_rollup_daily
+    SELECT
+        date_trunc('day', h.bucket),
+        h.agent_name,
+        h.call_reason,
+        sum(h.call_count),
+        sum(h.total_duration),
+        sum(h.analyzed_count),
+        sum(h.follow_up_count),
+        sum(h.churn_scored_count),
+        sum(h.churn_risk_sum)
+    FROM public.analysis_rollup_hourly h
+    JOIN (SELECT DISTINCT day_bucket, agent_name FROM tmp_rollup_affected) a
+        ON h.agent_name = a.agent_name
+       AND h.bucket >= a.day_bucket
+       AND h.bucket < a.day_bucket + INTERVAL '1 day'
+    GROUP BY 1, 2, 3;
+
+    RETURN affected_count;
+END;
+$$;
+
+-- ---! Tüm rollup'ları sıfırdan kurar; backfill ve görüşmenin ajanı/zamanı değiştiğinde onarım için
+CREATE OR REPLACE FUNCTION public.rebuild_analysis_rollups()
+RETURNS VOID
+LANGUAGE plpgsql
+SET timezone = 'Europe/Istanbul'
+AS $$
+BEGIN
+    TRUNCATE public.analysis_rollup_hourly, public.analysis_rollup_daily;
+
+    INSERT INTO public.analysis_rollup_hourly
+    SELECT
+        date_trunc('hour', call_created_at),
+        call_agent_name,
+        COALESCE(base_analysis_reason, ''),
+        count(*),
+        COALESCE(sum(call_duration), 0),
+        count(base_analysis_call_id),
+        count(*) FILTER (WHERE base_analysis_call_requires_followup),
+        count(issue_analysis_churn_risk),
+        COALESCE(sum(issue_analysis_churn_risk), 0)
+    FROM public.mvw_analysis_result
+    GROUP BY 1, 2, 3;
+
+    INSERT INTO public.analysis_rollup_daily
+    SELECT
+        date_trunc('day', bucket),
+        agent_name,
+        call_reason,
+        sum(call_count),
+        sum(total_duration),
+        sum(analyzed_count),
+        sum(follow_up_count),
+        sum(churn_scored_count),
+        sum(churn_risk_sum)
+    FROM public.analysis_rollup_hourly
+    GROUP BY 1, 2, 3;
+END;
+$$;
+
+-- ---! Backfill
+SELECT public.rebuild_analysis_rollups();
@@ -0,0 +1,24 @@
+-- ---! Telefon -> merchant index'inin artımlı yenilenmesi için merchant_person değişiklik zaman damgası (watermark)
+-- ---! Mevcut satırlar migration zamanını alır; sonraki INSERT/UPDATE'lerde trigger günceller
+ALTER TABLE public.merchant_person
+    ADD COLUMN IF NOT EXISTS merchant_person_updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+
+CREATE OR REPLACE FUNCTION public.set_merchant_person_updated_at()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.merchant_person_updated_at := now();
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_merchant_person_updated_at ON public.merchant_person;
+CREATE TRIGGER trg_merchant_person_updated_at
+    BEFORE INSERT OR UPDATE ON public.merchant_person
+    FOR EACH ROW
+    EXECUTE FUNCTION public.set_merchant_person_updated_at();
+
+-- ---! Artımlı yenileme sorgusu: WHERE merchant_person_updated_at > watermark
+CREATE INDEX IF NOT EXISTS ix_merchant_person_updated_at
+    ON public.merchant_person (merchant_person_updated_at);
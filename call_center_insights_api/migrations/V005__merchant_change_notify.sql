@@ -0,0 +1,81 @@
+-- ---! Merchant complete cache invalidation: merchant verisini oluşturan tablolarda değişiklik olunca
+-- ---! merchant_changed kanalına merchant_id yayınlanır (API süreçleri LISTEN eder)
+-- ---! Aynı transaction içindeki aynı payload'lar Postgres tarafından tek bildirime indirilir
+
+CREATE OR REPLACE FUNCTION public.notify_merchant_changed()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    changed RECORD;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed := OLD;
+    ELSE
+        changed := NEW;
+    END IF;
+
+    PERFORM pg_notify('merchant_changed', changed.merchant_id::text);
+    -- UPDATE merchant_id'yi değiştirdiyse eski merchant'ın kaydı da geçersizdir
+    IF TG_OP = 'UPDATE' AND OLD.merchant_id IS DISTINCT FROM NEW.merchant_id THEN
+        PERFORM pg_notify('merchant_changed', OLD.merchant_id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- ---! ticket_details'te merchant_id yok; ticket üzerinden bulunur
+CREATE OR REPLACE FUNCTION public.notify_ticket_details_changed()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    changed_ticket_id INTEGER;
+    changed_merchant_id INTEGER;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_ticket_id := OLD.ticket_id;
+    ELSE
+        changed_ticket_id := NEW.ticket_id;
+    END IF;
+
+    SELECT t.merchant_id INTO changed_merchant_id
+    FROM public.merchant_ticket t
+    WHERE t.mercant_ticket_id = changed_ticket_id;
+
+    IF changed_merchant_id IS NOT NULL THEN
+        PERFORM pg_notify('merchant_changed', changed_merchant_id::text);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_merchant_changed_notify ON public.merchant;
+CREATE TRIGGER trg_merchant_changed_notify
+    AFTER INSERT OR UPDATE OR DELETE ON public.merchant
+    FOR EACH ROW
+    EXECUTE FUNCTION public.notify_merchant_changed();
+
+DROP TRIGGER IF EXISTS trg_merchant_person_changed_notify ON public.merchant_person;
+CREATE TRIGGER trg_merchant_person_changed_notify
+    AFTER INSERT OR UPDATE OR DELETE ON public.merchant_person
+    FOR EACH ROW
+    EXECUTE FUNCTION public.notify_merchant_changed();
+
+DROP TRIGGER IF EXISTS trg_merchant_contact_changed_notify ON public.merchant_contact;
+CREATE TRIGGER trg_merchant_contact_changed_notify
+    AFTER INSERT OR UPDATE OR DELETE ON public.merchant_contact
+    FOR EACH ROW
+    EXECUTE FUNCTION public.notify_merchant_changed();
+
+DROP TRIGGER IF EXISTS trg_merchant_ticket_changed_notify ON public.merchant_ticket;
+CREATE TRIGGER trg_merchant_ticket_changed_notify
+    AFTER INSERT OR UPDATE OR DELETE ON public.merchant_ticket
+    FOR EACH ROW
+    EXECUTE FUNCTION public.notify_merchant_changed();
+
+DROP TRIGGER IF EXISTS trg_ticket_details_changed_notify ON public.ticket_details;
+CREATE TRIGGER trg_ticket_details_changed_notify
+    AFTER INSERT OR UPDATE OR DELETE ON public.ticket_details
+    FOR EACH ROW
+    EXECUTE FUNCTION public.notify_ticket_details_changed();
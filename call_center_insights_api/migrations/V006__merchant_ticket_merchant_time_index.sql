@@ -0,0 +1,5 @@
+-- ---! Merchant endpoint'lerinde ticket sayfalama: merchant başına merchant_ticket_time'a göre en yeni ticket'lar
+-- ---! Sıra MerchantTicketRepository.get_pages_by_merchant_ids ile aynı: time DESC NULLS LAST, ticket id DESC
+-- ---! LATERAL ... LIMIT n sorgusu merchant başına index'ten sadece n+1 satır okur; tickets_since aralık koşulu da aynı index'i kullanır
+CREATE INDEX IF NOT EXISTS ix_merchant_ticket_merchant_id_time
+    ON public.merchant_ticket (merchant_id, merchant_ticket_time DESC NULLS LAST, mercant_ticket_id DESC);
@@ -0,0 +1,10 @@
+-- ---! Ticket detayları üzerinde Türkçe tam metin arama: generated tsvector kolonu + GIN index
+-- ---! Kolon ticket_detail'den otomatik hesaplanır; ingestion tarafında değişiklik gerekmez
+-- ---! 'turkish' yapılandırması (snowball stemmer + stopword listesi) Postgres ile birlikte gelir
+ALTER TABLE public.ticket_details
+    ADD COLUMN IF NOT EXISTS ticket_detail_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('turkish'::regconfig, COALESCE(ticket_detail, ''))) STORED;
+
+-- ---! TicketDetailsRepository.search: ticket_detail_tsv @@ websearch_to_tsquery('turkish', ...)
+CREATE INDEX IF NOT EXISTS ix_ticket_details_detail_tsv
+    ON public.ticket_details USING gin (ticket_detail_tsv);
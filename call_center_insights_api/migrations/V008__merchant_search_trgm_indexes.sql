@@ -0,0 +1,19 @@
+-- ---! /api/v1/merchants/search için trigram GIN index'leri (MerchantRepository.search)
+-- ---! Index ifadeleri sorgulardaki ::text cast'leri ile birebir aynı olmalı, yoksa planner index'i kullanmaz
+-- ---! gin_trgm_ops hem <% (word_similarity) hem ILIKE '%x%' koşullarını karşılar
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_merchant_name_trgm
+    ON public.merchant USING gin ((merchant_name::text) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS ix_merchant_brand_trgm
+    ON public.merchant USING gin ((merchant_brand::text) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS ix_merchant_tax_no_trgm
+    ON public.merchant USING gin ((merchant_tax_no::text) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS ix_merchant_city_trgm
+    ON public.merchant USING gin ((merchant_city::text) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS ix_merchant_person_name_trgm
+    ON public.merchant_person USING gin ((merchant_person_name::text) gin_trgm_ops);
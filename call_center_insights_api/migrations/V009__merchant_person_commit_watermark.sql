@@ -0,0 +1,21 @@
+-- ---! Telefon index'i için commit sırasına dayanan watermark (merchant_person_updated_at yerine)
+-- ---! now() transaction başlangıç zamanıdır; uzun süren bir transaction watermark'ın gerisinde commit edip kaçabiliyordu
+-- ---! Satıra yazan transaction'ın id'si tutulur; okuyucu snapshot xmin'inden (bitmemiş en eski transaction) itibaren okur
+-- ---! xid8 PostgreSQL 13+ gerektirir
+ALTER TABLE public.merchant_person
+    ADD COLUMN IF NOT EXISTS merchant_person_xid xid8 NOT NULL DEFAULT '0';
+
+CREATE OR REPLACE FUNCTION public.set_merchant_person_updated_at()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.merchant_person_updated_at := now();
+    NEW.merchant_person_xid := pg_current_xact_id();
+    RETURN NEW;
+END;
+$$;
+
+-- ---! Artımlı yenileme sorgusu: WHERE merchant_person_xid >= önceki snapshot xmin'i
+CREATE INDEX IF NOT EXISTS ix_merchant_person_xid
+    ON public.merchant_person (merchant_person_xid);
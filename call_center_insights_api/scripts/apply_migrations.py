@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Script to apply versioned SQL migrations from the migrations directory
+Each VNNN__description.sql file is applied once, in version order, inside its own transaction
+Applied versions are recorded in public.schema_migrations
+Uses asyncpg directly without datalayer dependencies
+"""
+
+import asyncio
+import asyncpg
+import os
+import re
+import sys
+from pathlib import Path
+from typing import List, Set, Tuple
+
+# ---! Add the src directory to the path so we can import config
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config import Config
+
+
+class MigrationRunner:
+    """Applies pending SQL migrations and records them in schema_migrations"""
+    
+    MIGRATION_PATTERN = re.compile(r'^V(\d+)__([\w-]+)\.sql$')
+    
+    def __init__(self):
+        self.config = Config()
+        self.migrations_path = Path(__file__).parent.parent / "migrations"
+        if not self.migrations_path.exists():
+            raise FileNotFoundError(f"Migrations directory not found: {self.migrations_path}")
+    
+    async def get_database_connection(self):
+        """Get database connection"""
+        try:
+            conn = await asyncpg.connect(
+                host=self.config.postgres_host,
+                port=self.config.postgres_port,
+                user=self.config.postgres_user,
+                password=self.config.postgres_password,
+                database=self.config.postgres_database
+            )
+            return conn
+        except Exception as e:
+            print(f"❌ Database connection failed: {e}")
+            raise
+    
+    async def ensure_migrations_table(self, conn) -> None:
+        """Create schema_migrations table if it does not exist"""
+        await conn.execute("""
+        CREATE TABLE IF NOT EXISTS public.schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        )
+        """)
+    
+    async def get_applied_versions(self, conn) -> Set[int]:
+        """Return versions that are already applied"""
+        rows = await conn.fetch("SELECT version FROM public.schema_migrations")
+        return {row['version'] for row in rows}
+    
+    def scan_migrations(self) -> List[Tuple[int, str, Path]]:
+        """Return (version, description, path) tuples sorted by version"""
+        migrations = []
+        for file_path in self.migrations_path.glob("*.sql"):
+            match = self.MIGRATION_PATTERN.match(file_path.name)
+            if not match:
+                print(f"⚠️  Skipping file with unexpected name: {file_path.name}")
+                continue
+            migrations.append((int(match.group(1)), match.group(2), file_path))
+        
+        versions = [version for version, _, _ in migrations]
+        if len(versions) != len(set(versions)):
+            raise ValueError("Duplicate migration versions found")
+        
+        return sorted(migrations)
+    
+    async def apply_migration(self, conn, version: int, description: str, file_path: Path) -> None:
+        """Apply a single migration inside a transaction"""
+        sql = file_path.read_text(encoding='utf-8')
+        async with conn.transaction():
+            await conn.execute(sql)
+            await conn.execute(
+                "INSERT INTO public.schema_migrations (version, description) VALUES ($1, $2)",
+                version,
+                description
+            )
+    
+    async def run(self) -> None:
+        """Main execution method"""
+        print("🚀 Starting database migrations...")
+        
+        conn = await self.get_database_connection()
+        
+        try:
+            await self.ensure_migrations_table(conn)
+            applied = await self.get_applied_versions(conn)
+            pending = [m for m in self.scan_migrations() if m[0] not in applied]
+            
+            if not pending:
+                print("ℹ️  Database is up to date")
+                return
+            
+            print(f"📋 Found {len(pending)} pending migrations")
+            
+            for version, description, file_path in pending:
+                print(f"💾 Applying V{version:03d} {description}...")
+                await self.apply_migration(conn, version, description, file_path)
+                print(f"✅ Applied: {file_path.name}")
+            
+            print("✅ Migrations completed successfully!")
+            
+        finally:
+            await conn.close()
+            print("🔌 Database connection closed")
+
+
+async def main():
+    """Main entry point"""
+    try:
+        runner = MigrationRunner()
+        await runner.run()
+    except KeyboardInterrupt:
+        print("\n⏹️  Process interrupted by user")
+    except Exception as e:
+        print(f"❌ Fatal error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
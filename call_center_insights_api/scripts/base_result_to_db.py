@@ -2,7 +2,7 @@
 """
 Script to convert base analysis results from JSON files to database
 Reads analysis files from /calls/out directory and inserts into base_analysis_result table
-Uses asyncpg directly without datalayer dependencies
+Writes through BaseAnalysisResultRepository.upsert_many, refreshes with asyncpg
 """
 
 import asyncio
@@ -19,6 +19,9 @@ from uuid import UUID
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from config import Config
+from refresh_materialized_views import refresh_analysis_view, refresh_analysis_rollups
+from ingestion_session import ingestion_session, close_ingestion_engine
+from datalayer import BaseAnalysisResultDB, BaseAnalysisResultRepository
 
 
 class BaseResultToDBConverter:
@@ -120,54 +123,36 @@ class BaseResultToDBConverter:
         
         return results
     
-    async def insert_into_database(self, conn, results: List[tuple[Path, str, Dict[str, Any]]]) -> None:
-        """Insert parsed results into database"""
+    async def insert_into_database(self, results: List[tuple[Path, str, Dict[str, Any]]]) -> List[str]:
+        """Insert parsed results into database and return the inserted call ids"""
         if not results:
             print("ℹ️  No results to insert")
-            return
+            return []
         
-        success_count = 0
-        error_count = 0
+        entities = [
+            BaseAnalysisResultDB(
+                base_analysis_call_id=UUID(call_id),
+                base_analysis_reason=data['call_reason'],
+                base_analysis_reason_detail=data['call_reason_detail'],
+                base_analysis_call_requires_followup=data['is_follow_up_required']
+            )
+            for file_path, call_id, data in results
+        ]
         
-        for file_path, call_id, data in results:
-            try:
-                # ---! Check if record already exists
-                check_sql = """
-                SELECT 1 FROM call_center_insight.base_analysis_result 
-                WHERE base_analysis_call_id = $1
-                """
-                existing = await conn.fetchval(check_sql, call_id)
-                
-                if existing:
-                    print(f"⚠️  Record already exists for {call_id}, skipping...")
-                    continue
-                
-                # ---! Insert new record
-                insert_sql = """
-                INSERT INTO call_center_insight.base_analysis_result (
-                    base_analysis_call_id,
-                    base_analysis_reason,
-                    base_analysis_reason_detail,
-                    base_analysis_call_requires_followup
-                ) VALUES ($1, $2, $3, $4)
-                """
-                
-                await conn.execute(
-                    insert_sql,
-                    call_id,
-                    data['call_reason'],
-                    data['call_reason_detail'],
-                    data['is_follow_up_required']
-                )
-                
-                success_count += 1
-                print(f"✅ Inserted: {call_id}")
-                
-            except Exception as e:
-                error_count += 1
-                print(f"❌ Error inserting {call_id}: {e}")
+        # ---! Mevcut kayıtlar atlanır (ON CONFLICT DO NOTHING), sadece yeni eklenenler döner
+        async with ingestion_session() as session:
+            repository = BaseAnalysisResultRepository(session)
+            inserted_ids = await repository.upsert_many(
+                entities,
+                conflict_keys=["base_analysis_call_id"],
+                update_columns=[]
+            )
         
-        print(f"\n📊 Summary: {success_count} successful, {error_count} errors")
+        inserted_call_ids = [str(call_id) for call_id in inserted_ids]
+        skipped_count = len(results) - len(inserted_call_ids)
+        
+        print(f"\n📊 Summary: {len(inserted_call_ids)} inserted, {skipped_count} already existed")
+        return inserted_call_ids
     
     async def run(self) -> None:
         """Main execution method"""
@@ -190,12 +175,21 @@ class BaseResultToDBConverter:
                 
                 # ---! Insert results into database
                 print("💾 Inserting results into database...")
-                await self.insert_into_database(conn, results)
+                inserted_call_ids = await self.insert_into_database(results)
+                
+                # ---! Yeni sonuçların API'de görünmesi için view'ı yenile
+                print("🔄 Refreshing analysis result view...")
+                await refresh_analysis_view(conn)
+                
+                # ---! Zaman serisi rollup'larını sadece eklenen görüşmeler için güncelle
+                print("🔄 Updating analysis rollups...")
+                await refresh_analysis_rollups(conn, inserted_call_ids)
                 
                 print("✅ Conversion completed successfully!")
                 
             finally:
                 await conn.close()
+                await close_ingestion_engine()
                 print("🔌 Database connection closed")
             
         except Exception as e:
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Script to verify that every analysis result filter is index-backed
+Builds each filter through AllResultViewRepository._apply_filters and reads its EXPLAIN plan
+Sequential scans are disabled for the check so that small tables still show the index choice
+Exits with status 1 when a filter does not use its expected index
+"""
+
+import asyncio
+import os
+import sys
+from typing import Any, Dict, List, Set
+
+# ---! Add the src directory to the path so we can import datalayer
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sqlalchemy import text
+from sqlalchemy.future import select
+
+from datalayer.database import session_scope
+from datalayer.repository.all_result_view_repository import AllResultViewRepository
+
+
+# ---! filter -> (örnek değer, beklenen index); migrations/V002 ile senkron tutulmalı
+FILTER_CHECKS: Dict[str, Any] = {
+    "agent_name": ("john", "ix_mvw_analysis_result_agent_name_trgm"),
+    "reason_contains": ("fatura", "ix_mvw_analysis_result_reason_trgm"),
+    "phone_number": ("5422147888", "ix_mvw_analysis_result_phone_number"),
+    "follow_up_required": (True, "ix_mvw_analysis_result_followup_created_at"),
+    "created_at_from": ("2024-01-01", "ix_mvw_analysis_result_created_at_call_id"),
+    "created_at_to": ("2024-01-31", "ix_mvw_analysis_result_created_at_call_id"),
+    "duration_min": (600.0, "ix_mvw_analysis_result_duration"),
+    "duration_max": (30.0, "ix_mvw_analysis_result_duration"),
+    "agent_speech_rate_min": (80.0, "ix_mvw_analysis_result_agent_speech_rate"),
+    "agent_speech_rate_max": (5.0, "ix_mvw_analysis_result_agent_speech_rate"),
+    "customer_speech_rate_min": (80.0, "ix_mvw_analysis_result_customer_speech_rate"),
+    "customer_speech_rate_max": (5.0, "ix_mvw_analysis_result_customer_speech_rate"),
+    "silence_rate_min": (80.0, "ix_mvw_analysis_result_silence_rate"),
+    "silence_rate_max": (0.1, "ix_mvw_analysis_result_silence_rate"),
+    "cross_talk_rate_min": (50.0, "ix_mvw_analysis_result_cross_talk_rate"),
+    "cross_talk_rate_max": (0.01, "ix_mvw_analysis_result_cross_talk_rate"),
+    "agent_interrupt_count_min": (20, "ix_mvw_analysis_result_agent_interrupt_count"),
+    "agent_interrupt_count_max": (0, "ix_mvw_analysis_result_agent_interrupt_count"),
+    "churn_risk_min": (4, "ix_mvw_analysis_result_churn_risk"),
+    "churn_risk_max": (1, "ix_mvw_analysis_result_churn_risk"),
+}
+
+
+def collect_index_names(plan: Dict[str, Any]) -> Set[str]:
+    """Return every index name used anywhere in the plan tree"""
+    names = set()
+    if "Index Name" in plan:
+        names.add(plan["Index Name"])
+    for child in plan.get("Plans", []):
+        names |= collect_index_names(child)
+    return names
+
+
+async def check_filters() -> List[str]:
+    """EXPLAIN each filter and return the filters that are not index-backed"""
+    failures = []
+    
+    async with session_scope() as session:
+        repository = AllResultViewRepository(session)
+        # ---! Sadece bu transaction için; küçük tablolarda planner seq scan'i tercih etmesin
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        
+        for filter_key, (sample_value, expected_index) in FILTER_CHECKS.items():
+            stmt = repository._apply_filters(select(repository.model_class.call_id), {filter_key: sample_value})
+            plan = await repository._explain(stmt)
+            used_indexes = collect_index_names(plan["Plan"])
+            
+            if expected_index in used_indexes:
+                print(f"✅ {filter_key}: {expected_index}")
+            else:
+                used = ", ".join(sorted(used_indexes)) or plan["Plan"]["Node Type"]
+                print(f"❌ {filter_key}: expected {expected_index}, plan uses {used}")
+                failures.append(filter_key)
+        
+        await session.rollback()
+    
+    return failures
+
+
+async def main():
+    """Main entry point"""
+    print("🚀 Checking analysis result filter indexes...")
+    try:
+        failures = await check_filters()
+    except KeyboardInterrupt:
+        print("\n⏹️  Process interrupted by user")
+        return
+    except Exception as e:
+        print(f"❌ Fatal error: {e}")
+        sys.exit(1)
+    
+    print("=" * 50)
+    if failures:
+        print(f"❌ {len(failures)} of {len(FILTER_CHECKS)} filters are not index-backed: {', '.join(failures)}")
+        sys.exit(1)
+    print(f"✅ All {len(FILTER_CHECKS)} filters are index-backed")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -17,6 +17,7 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from config import Config
+from refresh_materialized_views import refresh_analysis_view, refresh_analysis_rollups
 
 class ConversationImporter:
     def __init__(self):
@@ -207,6 +208,7 @@ class ConversationImporter:
             # ---! Process each file
             successful_imports = 0
             failed_imports = 0
+            imported_call_ids = []
             
             for file_path in conversation_files:
                 print(f"📄 Processing: {file_path.name}")
@@ -221,10 +223,20 @@ class ConversationImporter:
                 # ---! Insert into database
                 if await self.insert_conversation(conn, data):
                     successful_imports += 1
+                    imported_call_ids.append(data['call_id'])
                     print(f"✅ Imported: {data['call_id']}")
                 else:
                     failed_imports += 1
             
+            # ---! Yeni görüşmelerin API'de görünmesi için view'ı yenile
+            if successful_imports:
+                print("🔄 Refreshing analysis result view...")
+                await refresh_analysis_view(conn)
+                
+                # ---! Zaman serisi rollup'larını sadece içe aktarılan görüşmeler için güncelle
+                print("🔄 Updating analysis rollups...")
+                await refresh_analysis_rollups(conn, imported_call_ids)
+            
             # ---! Print summary
             print(f"\n📊 Import Summary:")
             print(f"   ✅ Successful imports: {successful_imports}")
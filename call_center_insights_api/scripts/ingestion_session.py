@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Ingestion script'lerinin API ile aynı repository kod yolunu (upsert_many) kullanması için session yardımcıları.
+ORM modelleri public şemasını gösterir; script'lerin yazdığı tablolar call_center_insight şemasındadır.
+"""
+
+import os
+import sys
+from contextlib import asynccontextmanager
+
+# ---! Add the src directory to the path so we can import datalayer
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from datalayer import session_scope
+from datalayer.database import db_manager
+
+# ---! ORM modellerindeki public şemasını ingestion şemasına çevirir
+INGESTION_SCHEMA_MAP = {"public": "call_center_insight"}
+
+
+@asynccontextmanager
+async def ingestion_session():
+    """call_center_insight şemasına yazan, çıkışta commit eden session"""
+    async with session_scope() as session:
+        await session.connection(execution_options={"schema_translate_map": INGESTION_SCHEMA_MAP})
+        yield session
+
+
+async def close_ingestion_engine() -> None:
+    """Script sonunda havuzdaki bağlantıları kapatır"""
+    await db_manager.engine.dispose()
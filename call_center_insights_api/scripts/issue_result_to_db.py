@@ -2,7 +2,7 @@
 """
 Script to convert issue analysis results from JSON files to database
 Reads analysis files from /calls/out directory and inserts into issue_analysis_result table
-Uses asyncpg directly without datalayer dependencies
+Writes through IssueAnalysisResultRepository.upsert_many, refreshes with asyncpg
 """
 
 import asyncio
@@ -19,6 +19,9 @@ from uuid import UUID
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from config import Config
+from refresh_materialized_views import refresh_analysis_view, refresh_analysis_rollups
+from ingestion_session import ingestion_session, close_ingestion_engine
+from datalayer import IssueAnalysisResultDB, IssueAnalysisResultRepository
 
 
 class IssueResultToDBConverter:
@@ -133,71 +136,50 @@ class IssueResultToDBConverter:
         
         return results
     
-    async def insert_into_database(self, conn, results: List[tuple[Path, str, Dict[str, Any]]]) -> None:
-        """Insert parsed issue results into database"""
+    async def insert_into_database(self, conn, results: List[tuple[Path, str, Dict[str, Any]]]) -> List[str]:
+        """Insert parsed issue results into database and return the inserted call ids"""
         if not results:
             print("ℹ️  No issue results to insert")
-            return
+            return []
         
-        success_count = 0
-        error_count = 0
+        # ---! Foreign key: base analysis sonucu olmayan görüşmeler tek sorguda elenir
+        base_check_sql = """
+        SELECT base_analysis_call_id FROM call_center_insight.base_analysis_result 
+        WHERE base_analysis_call_id = ANY($1::uuid[])
+        """
+        base_rows = await conn.fetch(base_check_sql, [call_id for _, call_id, _ in results])
+        base_call_ids = {str(row['base_analysis_call_id']) for row in base_rows}
         
+        entities = []
         for file_path, call_id, data in results:
-            try:
-                # ---! Check if record already exists
-                check_sql = """
-                SELECT 1 FROM call_center_insight.issue_analysis_result 
-                WHERE issue_analysis_id = $1
-                """
-                existing = await conn.fetchval(check_sql, call_id)
-                
-                if existing:
-                    print(f"⚠️  Issue record already exists for {call_id}, skipping...")
-                    continue
-                
-                # ---! Check if base analysis result exists (foreign key constraint)
-                base_check_sql = """
-                SELECT 1 FROM call_center_insight.base_analysis_result 
-                WHERE base_analysis_call_id = $1
-                """
-                base_exists = await conn.fetchval(base_check_sql, call_id)
-                
-                if not base_exists:
-                    print(f"⚠️  Base analysis result not found for {call_id}, skipping...")
-                    continue
-                
-                # ---! Insert new issue record
-                insert_sql = """
-                INSERT INTO call_center_insight.issue_analysis_result (
-                    issue_analysis_id,
-                    issue_analysis_sub_category,
-                    issue_analysis_sub_issue_type,
-                    issue_analysis_churn_risk,
-                    issue_analysis_urgency_level,
-                    issue_analysis_related_with_previous_call,
-                    issue_analysis_related_with_previous_call_detail
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7)
-                """
-                
-                await conn.execute(
-                    insert_sql,
-                    call_id,
-                    data['issue_sub_category'],
-                    data['sub_issue_type'],
-                    data['churn_risk'],
-                    data['urgency_level'],
-                    data['related_with_previous_call'],
-                    data['related_with_previous_call_detail']
-                )
-                
-                success_count += 1
-                print(f"✅ Inserted issue: {call_id}")
-                
-            except Exception as e:
-                error_count += 1
-                print(f"❌ Error inserting issue {call_id}: {e}")
+            if call_id not in base_call_ids:
+                print(f"⚠️  Base analysis result not found for {call_id}, skipping...")
+                continue
+            
+            entities.append(IssueAnalysisResultDB(
+                issue_analysis_id=UUID(call_id),
+                issue_analysis_sub_category=data['issue_sub_category'],
+                issue_analysis_sub_issue_type=data['sub_issue_type'],
+                issue_analysis_churn_risk=data['churn_risk'],
+                issue_analysis_urgency_level=data['urgency_level'],
+                issue_analysis_related_with_previous_call=data['related_with_previous_call'],
+                issue_analysis_related_with_previous_call_detail=data['related_with_previous_call_detail']
+            ))
+        
+        # ---! Mevcut kayıtlar atlanır (ON CONFLICT DO NOTHING), sadece yeni eklenenler döner
+        async with ingestion_session() as session:
+            repository = IssueAnalysisResultRepository(session)
+            inserted_ids = await repository.upsert_many(
+                entities,
+                conflict_keys=["issue_analysis_id"],
+                update_columns=[]
+            )
+        
+        inserted_call_ids = [str(call_id) for call_id in inserted_ids]
+        skipped_count = len(results) - len(inserted_call_ids)
         
-        print(f"\n📊 Summary: {success_count} successful, {error_count} errors")
+        print(f"\n📊 Summary: {len(inserted_call_ids)} inserted, {skipped_count} skipped")
+        return inserted_call_ids
     
     async def run(self) -> None:
         """Main execution method"""
@@ -220,12 +202,21 @@ class IssueResultToDBConverter:
                 
                 # ---! Insert results into database
                 print("💾 Inserting issue results into database...")
-                await self.insert_into_database(conn, results)
+                inserted_call_ids = await self.insert_into_database(conn, results)
+                
+                # ---! Yeni sonuçların API'de görünmesi için view'ı yenile
+                print("🔄 Refreshing analysis result view...")
+                await refresh_analysis_view(conn)
+                
+                # ---! Zaman serisi rollup'larını sadece eklenen görüşmeler için güncelle
+                print("🔄 Updating analysis rollups...")
+                await refresh_analysis_rollups(conn, inserted_call_ids)
                 
                 print("✅ Issue conversion completed successfully!")
                 
             finally:
                 await conn.close()
+                await close_ingestion_engine()
                 print("🔌 Database connection closed")
             
         except Exception as e:
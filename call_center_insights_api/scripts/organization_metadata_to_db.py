@@ -19,6 +19,7 @@ from uuid import UUID
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from config import Config
+from refresh_materialized_views import refresh_analysis_view
 
 
 class OrganizationMetadataToDBUpdater:
@@ -242,6 +243,10 @@ class OrganizationMetadataToDBUpdater:
                 print("💾 Updating organization metadata in base_analysis_result table...")
                 await self.update_database(conn, results)
                 
+                # ---! Güncellenen metadata'nın API'de görünmesi için view'ı yenile
+                print("🔄 Refreshing analysis result view...")
+                await refresh_analysis_view(conn)
+                
                 print("✅ Organization metadata update completed successfully!")
                 
             finally:
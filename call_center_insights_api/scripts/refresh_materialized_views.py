@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Script to refresh the analysis result materialized view after ingestion
+Runs REFRESH MATERIALIZED VIEW CONCURRENTLY so readers are not locked out
+and records a new view version in public.materialized_view_refresh
+Also maintains the hourly/daily analysis rollup tables for ingested calls
+Uses asyncpg directly without datalayer dependencies
+"""
+
+import asyncio
+import asyncpg
+import os
+import sys
+import time
+from typing import List, Optional
+
+# ---! Add the src directory to the path so we can import config
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from config import Config
+
+ANALYSIS_RESULT_VIEW = "public.mvw_analysis_result"
+
+
+async def refresh_analysis_view(conn, trigger: str = "ingestion", wait: bool = True) -> Optional[int]:
+    """
+    Refresh mvw_analysis_result concurrently and return the new view version.
+    With wait=True the refresh waits for a running refresh to finish, so the view is
+    guaranteed to contain rows committed before the call (rollups depend on this).
+    With wait=False it returns None when another refresh already holds the advisory lock.
+    """
+    async with conn.transaction():
+        # ---! API scheduler ile aynı advisory lock; aynı anda tek refresh çalışır
+        if wait:
+            await conn.execute("SELECT pg_advisory_xact_lock(hashtext($1))", ANALYSIS_RESULT_VIEW)
+        else:
+            locked = await conn.fetchval("SELECT pg_try_advisory_xact_lock(hashtext($1))", ANALYSIS_RESULT_VIEW)
+            if not locked:
+                print(f"⚠️  Refresh already running for {ANALYSIS_RESULT_VIEW}, skipping...")
+                return None
+        
+        started = time.perf_counter()
+        await conn.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {ANALYSIS_RESULT_VIEW}")
+        duration_ms = (time.perf_counter() - started) * 1000
+        
+        version = await conn.fetchval(
+            """
+            INSERT INTO public.materialized_view_refresh (view_name, duration_ms, concurrent, trigger)
+            VALUES ($1, $2, TRUE, $3)
+            RETURNING version
+            """,
+            ANALYSIS_RESULT_VIEW,
+            duration_ms,
+            trigger
+        )
+    
+    print(f"✅ Refreshed {ANALYSIS_RESULT_VIEW} in {duration_ms:.0f} ms, version: {version}")
+    return version
+
+
+async def refresh_analysis_rollups(conn, call_ids: List[str]) -> int:
+    """
+    Recompute the hourly/daily rollup rows that the given calls fall into.
+    Must run after refresh_analysis_view since the rollups are derived from the view.
+    Returns the number of affected (hour, agent) keys.
+    """
+    if not call_ids:
+        return 0
+    
+    async with conn.transaction():
+        affected = await conn.fetchval("SELECT public.refresh_analysis_rollups($1::uuid[])", call_ids)
+    
+    print(f"✅ Updated analysis rollups for {len(call_ids)} calls, {affected} hourly buckets")
+    return affected
+
+
+async def main():
+    """Main entry point"""
+    config = Config()
+    try:
+        conn = await asyncpg.connect(
+            host=config.postgres_host,
+            port=config.postgres_port,
+            user=config.postgres_user,
+            password=config.postgres_password,
+            database=config.postgres_database
+        )
+        try:
+            await refresh_analysis_view(conn, trigger="manual", wait=False)
+        finally:
+            await conn.close()
+            print("🔌 Database connection closed")
+    except KeyboardInterrupt:
+        print("\n⏹️  Process interrupted by user")
+    except Exception as e:
+        print(f"❌ Fatal error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
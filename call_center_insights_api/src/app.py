@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 import logging
 import os
@@ -14,15 +15,36 @@ from routes import (
     call_router,
     all_result_view_router,
     qdrant_router,
-    merchant_unified_router
+    merchant_unified_router,
+    database_router
 )
+from services.materialized_view_service import materialized_view_scheduler
+from services.merchant_phone_index_service import merchant_phone_index
+from services.merchant_cache_service import merchant_cache_listener
+from datalayer.database import db_manager
+from middleware import CancelOnDisconnectMiddleware, QueryStatsMiddleware
 
 from logger import setup_logger
 
 setup_logger()
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # ---! Arka plan işleri: materialized view zamanlanmış refresh, replica sağlık kontrolü, telefon index'i,
+    # ---! merchant cache invalidation dinleyicisi
+    materialized_view_scheduler.start()
+    db_manager.start_replica_health_checks()
+    merchant_phone_index.start()
+    merchant_cache_listener.start()
+    yield
+    await merchant_cache_listener.stop()
+    await merchant_phone_index.stop()
+    await db_manager.stop_replica_health_checks()
+    await materialized_view_scheduler.stop()
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Call Center Insight with Swagger",
     description="A production-ready FastAPI application with comprehensive Swagger documentation",
     version="1.0.0",
@@ -44,6 +66,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ---! Client bağlantıyı kapatınca okuma isteğini (ve bekleyen sorguyu) iptal et
+app.add_middleware(CancelOnDisconnectMiddleware)
+# ---! İstek başına SQL sayacı: sorgu sayısı/DB süresi eşiği ve N+1 şüphesi loglanır
+app.add_middleware(QueryStatsMiddleware)
+
 # Static files mounting (hata kontrolü ile)
 static_dir = "static" if os.path.exists("static") else "src/static"
 if os.path.exists(static_dir):
@@ -66,6 +93,7 @@ try:
     app.include_router(all_result_view_router)
     app.include_router(qdrant_router)
     app.include_router(merchant_unified_router)  # Unified merchant endpoint
+    app.include_router(database_router)
     logger.info("Routers included successfully")
 except Exception as e:
     logger.error(f"Failed to include routers: {e}")
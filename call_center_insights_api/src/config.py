@@ -1,4 +1,5 @@
 from dotenv import load_dotenv
+from typing import Dict, List, Tuple
 import os
 
 class Config:
@@ -23,10 +24,49 @@ class Config:
         self.postgres_password = self._get_postgres_password()
         self.postgres_database = self._get_postgres_database()
         
+        # Connection pool configuration
+        self.db_pool_size = self._get_db_pool_size()
+        self.db_max_overflow = self._get_db_max_overflow()
+        self.db_pool_timeout_seconds = self._get_db_pool_timeout_seconds()
+        self.db_pool_recycle_seconds = self._get_db_pool_recycle_seconds()
+        self.db_pool_pre_ping = self._get_db_pool_pre_ping()
+        self.db_statement_cache_size = self._get_db_statement_cache_size()
+        self.db_pgbouncer_mode = self._get_db_pgbouncer_mode()
+        self.filter_statement_cache_size = self._get_filter_statement_cache_size()
+        self.db_statement_timeout_ms = self._get_db_statement_timeout_ms()
+        self.db_route_statement_timeouts = self._get_db_route_statement_timeouts()
+        
+        # SQL instrumentation (istek başına sorgu sayacı, yavaş sorgu ve N+1 logları)
+        self.slow_query_ms = self._get_slow_query_ms()
+        self.request_max_queries = self._get_request_max_queries()
+        self.request_max_db_time_ms = self._get_request_max_db_time_ms()
+        self.n_plus_one_threshold = self._get_n_plus_one_threshold()
+        
+        # Merchant complete endpoint'lerinde JSON'u Postgres'te kuran hızlı yol
+        self.merchant_json_fast_path = self._get_merchant_json_fast_path()
+        
+        # Merchant complete data cache (LRU + TTL, opsiyonel Redis) ve invalidation dinleyicisi
+        self.merchant_cache_ttl_seconds = self._get_merchant_cache_ttl_seconds()
+        self.merchant_cache_max_size = self._get_merchant_cache_max_size()
+        self.merchant_cache_redis_url = self._get_merchant_cache_redis_url()
+        self.merchant_cache_listen = self._get_merchant_cache_listen()
+        
+        # Read replica configuration (opsiyonel)
+        self.postgres_replica_hosts = self._get_postgres_replica_hosts()
+        self.replica_health_check_interval_seconds = self._get_replica_health_check_interval_seconds()
+        self.replica_max_lag_seconds = self._get_replica_max_lag_seconds()
+        
         # Search API Service configuration
         self.search_api_host = self._get_search_api_host()
         self.search_api_port = self._get_search_api_port()
         
+        # Materialized view refresh configuration
+        self.mv_refresh_interval_seconds = self._get_mv_refresh_interval_seconds()
+        
+        # Telefon -> merchant bellek içi index'i (screen-pop aramaları)
+        self.phone_index_refresh_interval_seconds = self._get_phone_index_refresh_interval_seconds()
+        self.phone_index_full_reload_seconds = self._get_phone_index_full_reload_seconds()
+        
         Config._initialized = True
         
     def _load_env_file(self) -> None:
@@ -75,6 +115,136 @@ class Config:
             raise ValueError("POSTGRES_PASSWORD environment variable bulunmadı")
         return postgres_password
     
+    def _get_db_pool_size(self) -> int:
+        """Engine başına kalıcı bağlantı sayısını environment variable'dan al"""
+        db_pool_size = os.getenv("DB_POOL_SIZE", "20")
+        return int(db_pool_size)
+    
+    def _get_db_max_overflow(self) -> int:
+        """Havuz dolduğunda açılabilecek ek bağlantı sayısını environment variable'dan al"""
+        db_max_overflow = os.getenv("DB_MAX_OVERFLOW", "0")
+        return int(db_max_overflow)
+    
+    def _get_db_pool_timeout_seconds(self) -> float:
+        """Havuzdan bağlantı beklemek için en fazla süreyi (saniye) environment variable'dan al"""
+        db_pool_timeout_seconds = os.getenv("DB_POOL_TIMEOUT_SECONDS", "30")
+        return float(db_pool_timeout_seconds)
+    
+    def _get_db_pool_recycle_seconds(self) -> int:
+        """Bağlantıların yenilenme yaşını (saniye) environment variable'dan al, -1 kapatır"""
+        db_pool_recycle_seconds = os.getenv("DB_POOL_RECYCLE_SECONDS", "1800")
+        return int(db_pool_recycle_seconds)
+    
+    def _get_db_pool_pre_ping(self) -> bool:
+        """Havuzdan alınan bağlantının kullanılmadan önce test edilip edilmeyeceğini environment variable'dan al"""
+        db_pool_pre_ping = os.getenv("DB_POOL_PRE_PING", "true")
+        return db_pool_pre_ping.lower() in ("1", "true", "yes")
+    
+    def _get_db_statement_cache_size(self) -> int:
+        """asyncpg prepared statement cache boyutunu environment variable'dan al"""
+        db_statement_cache_size = os.getenv("DB_STATEMENT_CACHE_SIZE", "100")
+        return int(db_statement_cache_size)
+    
+    def _get_db_pgbouncer_mode(self) -> bool:
+        """PgBouncer (transaction pooling) uyumlu modu environment variable'dan al"""
+        db_pgbouncer_mode = os.getenv("DB_PGBOUNCER_MODE", "false")
+        return db_pgbouncer_mode.lower() in ("1", "true", "yes")
+    
+    def _get_filter_statement_cache_size(self) -> int:
+        """Filtre şekline göre önbelleğe alınan statement sayısını environment variable'dan al (0 kapatır)"""
+        filter_statement_cache_size = os.getenv("FILTER_STATEMENT_CACHE_SIZE", "512")
+        return int(filter_statement_cache_size)
+    
+    def _get_db_statement_timeout_ms(self) -> int:
+        """Bağlantıların varsayılan statement_timeout değerini (ms) environment variable'dan al, 0 kapatır"""
+        db_statement_timeout_ms = os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000")
+        return int(db_statement_timeout_ms)
+    
+    def _get_db_route_statement_timeouts(self) -> Dict[str, int]:
+        """
+        Route bazlı statement_timeout'ları environment variable'dan al: virgülle ayrılmış path_prefix=ms listesi.
+        Örnek: /analysis-result=10000,/analysis-result/export=0
+        """
+        route_statement_timeouts = os.getenv("DB_ROUTE_STATEMENT_TIMEOUTS", "")
+        timeouts = {}
+        for entry in route_statement_timeouts.split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            prefix, _, timeout_ms = entry.partition("=")
+            timeouts[prefix.strip()] = int(timeout_ms)
+        return timeouts
+    
+    def _get_slow_query_ms(self) -> float:
+        """Tek statement için yavaş sorgu eşiğini (ms) environment variable'dan al, 0 kapatır"""
+        slow_query_ms = os.getenv("SLOW_QUERY_MS", "200")
+        return float(slow_query_ms)
+    
+    def _get_request_max_queries(self) -> int:
+        """Bir istekte loglanmadan çalışabilecek en fazla sorgu sayısını environment variable'dan al, 0 kapatır"""
+        request_max_queries = os.getenv("REQUEST_MAX_QUERIES", "20")
+        return int(request_max_queries)
+    
+    def _get_request_max_db_time_ms(self) -> float:
+        """Bir istekte loglanmadan harcanabilecek toplam DB süresini (ms) environment variable'dan al, 0 kapatır"""
+        request_max_db_time_ms = os.getenv("REQUEST_MAX_DB_TIME_MS", "500")
+        return float(request_max_db_time_ms)
+    
+    def _get_n_plus_one_threshold(self) -> int:
+        """Aynı statement'ın bir istekte kaç tekrarının N+1 şüphesi sayılacağını environment variable'dan al, 0 kapatır"""
+        n_plus_one_threshold = os.getenv("N_PLUS_ONE_THRESHOLD", "5")
+        return int(n_plus_one_threshold)
+    
+    def _get_merchant_json_fast_path(self) -> bool:
+        """Merchant complete yanıtlarının Postgres'te JSON olarak kurulup kurulmayacağını environment variable'dan al"""
+        merchant_json_fast_path = os.getenv("MERCHANT_JSON_FAST_PATH", "false")
+        return merchant_json_fast_path.lower() in ("1", "true", "yes")
+    
+    def _get_merchant_cache_ttl_seconds(self) -> int:
+        """Merchant complete cache kayıtlarının yaşam süresini (saniye) environment variable'dan al, 0 cache'i kapatır"""
+        merchant_cache_ttl_seconds = os.getenv("MERCHANT_CACHE_TTL_SECONDS", "300")
+        return int(merchant_cache_ttl_seconds)
+    
+    def _get_merchant_cache_max_size(self) -> int:
+        """Süreç içi merchant cache'inde tutulacak en fazla merchant sayısını environment variable'dan al, 0 cache'i kapatır"""
+        merchant_cache_max_size = os.getenv("MERCHANT_CACHE_MAX_SIZE", "10000")
+        return int(merchant_cache_max_size)
+    
+    def _get_merchant_cache_redis_url(self) -> str:
+        """Merchant cache için Redis uyumlu store adresini environment variable'dan al, boşsa süreç içi cache kullanılır"""
+        merchant_cache_redis_url = os.getenv("MERCHANT_CACHE_REDIS_URL", "")
+        return merchant_cache_redis_url.strip()
+    
+    def _get_merchant_cache_listen(self) -> bool:
+        """merchant_changed bildirimleriyle cache invalidation yapılıp yapılmayacağını environment variable'dan al"""
+        merchant_cache_listen = os.getenv("MERCHANT_CACHE_LISTEN", "true")
+        return merchant_cache_listen.lower() in ("1", "true", "yes")
+    
+    def _get_postgres_replica_hosts(self) -> List[Tuple[str, str]]:
+        """
+        Read replica'ları environment variable'dan al: virgülle ayrılmış host[:port] listesi.
+        Kullanıcı, şifre ve database primary ile aynıdır; tanımlı değilse okumalar primary'ye gider.
+        """
+        replica_hosts = os.getenv("POSTGRES_REPLICA_HOSTS", "")
+        replicas = []
+        for entry in replica_hosts.split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            host, _, port = entry.partition(":")
+            replicas.append((host, port or self.postgres_port))
+        return replicas
+    
+    def _get_replica_health_check_interval_seconds(self) -> int:
+        """Replica sağlık kontrolü aralığını (saniye) environment variable'dan al"""
+        replica_health_check_interval_seconds = os.getenv("REPLICA_HEALTH_CHECK_INTERVAL_SECONDS", "10")
+        return int(replica_health_check_interval_seconds)
+    
+    def _get_replica_max_lag_seconds(self) -> float:
+        """Replica'nın okuma almaya devam edebileceği en fazla replikasyon gecikmesi (saniye), 0 kontrolü kapatır"""
+        replica_max_lag_seconds = os.getenv("REPLICA_MAX_LAG_SECONDS", "30")
+        return float(replica_max_lag_seconds)
+    
     def _get_search_api_host(self) -> str:
         """Search API service host bilgisini environment variable'dan al"""
         search_api_host = os.getenv("SEARCH_API_HOST", "localhost")
@@ -84,6 +254,21 @@ class Config:
         """Search API service port bilgisini environment variable'dan al"""
         search_api_port = os.getenv("SEARCH_API_PORT", "8083")
         return int(search_api_port)
+    
+    def _get_mv_refresh_interval_seconds(self) -> int:
+        """Materialized view zamanlanmış refresh aralığını (saniye) environment variable'dan al, 0 kapatır"""
+        mv_refresh_interval_seconds = os.getenv("MV_REFRESH_INTERVAL_SECONDS", "600")
+        return int(mv_refresh_interval_seconds)
+    
+    def _get_phone_index_refresh_interval_seconds(self) -> int:
+        """Telefon index'inin artımlı yenilenme aralığını (saniye) environment variable'dan al, 0 index'i kapatır"""
+        phone_index_refresh_interval_seconds = os.getenv("PHONE_INDEX_REFRESH_INTERVAL_SECONDS", "30")
+        return int(phone_index_refresh_interval_seconds)
+    
+    def _get_phone_index_full_reload_seconds(self) -> int:
+        """Telefon index'inin (silinen satırlar için) baştan kurulma aralığını (saniye) environment variable'dan al, 0 kapatır"""
+        phone_index_full_reload_seconds = os.getenv("PHONE_INDEX_FULL_RELOAD_SECONDS", "3600")
+        return int(phone_index_full_reload_seconds)
 
     
     def validate_config(self) -> bool:
@@ -3,10 +3,16 @@ from .repository import *
 from .mapper import *
 from .database import (
     get_db_session,
+    get_read_session,
+    session_scope,
+    read_session_scope,
 )
 
 __all__ = [
     *model.__all__,
     *repository.__all__,
     "get_db_session",
+    "get_read_session",
+    "session_scope",
+    "read_session_scope",
 ]
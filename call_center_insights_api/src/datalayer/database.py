@@ -1,11 +1,35 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set
+from uuid import uuid4
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from fastapi import Request
 from contextlib import asynccontextmanager
 from config import Config
+from datalayer.pool import InstrumentedAsyncPool
+from datalayer.query_stats import install_query_instrumentation
+
+logger = logging.getLogger(__name__)
 
 class DatabaseManager:
     _instance = None
     _engine = None
     _session_local = None
+    _replica_engines: List[AsyncEngine] = []
+    _replica_session_locals: List[async_sessionmaker] = []
+    _healthy_replicas: Set[int] = set()
+    _replica_cursor = 0
+    _health_check_task: Optional[asyncio.Task] = None
+    _route_statement_timeouts: Dict[str, int] = {}
+    _default_statement_timeout = 0
+    _connection_statement_timeout: Optional[int] = None
+    
+    # Replica'nın primary'ye göre gecikmesi; WAL tamamen uygulanmışsa 0 (boşta primary'de replay zamanı eskir)
+    REPLICA_HEALTH_SQL = text(
+        "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )
     
     def __new__(cls):
         if cls._instance is None:
@@ -16,40 +40,225 @@ class DatabaseManager:
     def _initialize(self):
         try:
             config = Config()  # Artık singleton olduğu için güvenli
-            self._engine = create_async_engine(
-                f"postgresql+asyncpg://{config.postgres_user}:{config.postgres_password}@{config.postgres_host}:{config.postgres_port}/{config.postgres_database}",
-                echo=False,  # Set to True for SQL logging
-                pool_size=20,
-                max_overflow=0
-            )
+            self._engine = self._create_engine(config, config.postgres_host, config.postgres_port)
+            install_query_instrumentation(self._engine, "primary")
             self._session_local = async_sessionmaker(
                 self._engine, 
                 class_=AsyncSession, 
                 expire_on_commit=False
             )
+            
+            # Read replica'lar: tanımlı değilse okuma session'ları primary'ye gider
+            self._replica_engines = [
+                self._create_engine(config, host, port)
+                for host, port in config.postgres_replica_hosts
+            ]
+            for engine, (host, port) in zip(self._replica_engines, config.postgres_replica_hosts):
+                install_query_instrumentation(engine, f"replica:{host}:{port}")
+            self._replica_session_locals = [
+                async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+                for engine in self._replica_engines
+            ]
+            # İlk sağlık kontrolüne kadar tüm replica'lar sağlıklı kabul edilir
+            self._healthy_replicas = set(range(len(self._replica_engines)))
+            
+            # Varsayılan statement_timeout bağlantı açılırken verilir; PgBouncer başlangıç parametresini taşımaz
+            self._default_statement_timeout = config.db_statement_timeout_ms
+            self._connection_statement_timeout = None if config.db_pgbouncer_mode else config.db_statement_timeout_ms
+            # En uzun prefix önce eşleşsin
+            self._route_statement_timeouts = dict(
+                sorted(config.db_route_statement_timeouts.items(), key=lambda item: len(item[0]), reverse=True)
+            )
         except Exception as e:
             print(f"Error loading config: {e}")
             exit(1)
     
+    @staticmethod
+    def _create_engine(config: Config, host: str, port: str) -> AsyncEngine:
+        if config.db_pgbouncer_mode:
+            # PgBouncer transaction pooling: sunucu tarafı prepared statement'lar bağlantılar arasında
+            # taşınamaz; cache kapatılır ve her statement'a benzersiz isim verilir
+            connect_args = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            }
+        else:
+            connect_args = {
+                "prepared_statement_cache_size": config.db_statement_cache_size,
+                "server_settings": {"statement_timeout": str(config.db_statement_timeout_ms)},
+            }
+        
+        return create_async_engine(
+            f"postgresql+asyncpg://{config.postgres_user}:{config.postgres_password}@{host}:{port}/{config.postgres_database}",
+            echo=False,  # Set to True for SQL logging
+            poolclass=InstrumentedAsyncPool,
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            pool_timeout=config.db_pool_timeout_seconds,
+            pool_recycle=config.db_pool_recycle_seconds,
+            pool_pre_ping=config.db_pool_pre_ping,
+            connect_args=connect_args
+        )
+    
+    def statement_timeout_for(self, path: str) -> int:
+        """Path ile en uzun prefix'i eşleşen route'un statement_timeout'u (ms), yoksa varsayılan"""
+        for prefix, timeout_ms in self._route_statement_timeouts.items():
+            if path.startswith(prefix):
+                return timeout_ms
+        return self._default_statement_timeout
+    
+    def needs_statement_timeout(self, timeout_ms: int) -> bool:
+        """Bağlantının başlangıçta aldığı statement_timeout'tan farklıysa SET LOCAL gerekir"""
+        return timeout_ms != self._connection_statement_timeout
+    
     @property
     def session_local(self):
         return self._session_local
     
+    @property
+    def read_session_local(self):
+        """Sağlıklı replica'lar arasında round-robin seçer; hiçbiri sağlıklı değilse primary'ye düşer"""
+        healthy = sorted(self._healthy_replicas)
+        if not healthy:
+            return self._session_local
+        
+        self._replica_cursor = (self._replica_cursor + 1) % len(healthy)
+        return self._replica_session_locals[healthy[self._replica_cursor]]
+    
     @property
     def engine(self):
         return self._engine
+    
+    @property
+    def replica_engines(self) -> List[AsyncEngine]:
+        return self._replica_engines
+    
+    def pool_stats(self) -> List[Dict[str, Any]]:
+        """Primary ve replica bağlantı havuzlarının sayaçlarını döndürür"""
+        stats = [{"name": "primary", "healthy": True, **self._engine.pool.stats()}]
+        for index, engine in enumerate(self._replica_engines):
+            stats.append({
+                "name": f"replica:{engine.url.host}:{engine.url.port}",
+                "healthy": index in self._healthy_replicas,
+                **engine.pool.stats()
+            })
+        return stats
+    
+    async def check_replicas(self) -> None:
+        """Her replica'ya bağlanıp gecikmesini ölçer; ulaşılamayan veya çok geride kalanları okuma havuzundan çıkarır"""
+        max_lag = Config().replica_max_lag_seconds
+        
+        for index, engine in enumerate(self._replica_engines):
+            replica = f"{engine.url.host}:{engine.url.port}"
+            try:
+                # Bağlantı kurma da zaman aşımına dahil; erişilemeyen host döngüyü bekletmesin
+                lag = await asyncio.wait_for(self._replica_lag(engine), timeout=5)
+                healthy = max_lag <= 0 or lag <= max_lag
+                if not healthy:
+                    logger.warning(f"⚠️ Replica {replica} lagging {lag:.1f}s behind primary")
+            except Exception as e:
+                healthy = False
+                logger.warning(f"⚠️ Replica {replica} health check failed: {e}")
+            
+            if healthy and index not in self._healthy_replicas:
+                logger.info(f"✅ Replica {replica} back in read pool")
+                self._healthy_replicas.add(index)
+            elif not healthy and index in self._healthy_replicas:
+                logger.warning(f"❌ Replica {replica} removed from read pool")
+                self._healthy_replicas.discard(index)
+    
+    async def _replica_lag(self, engine: AsyncEngine) -> float:
+        async with engine.connect() as conn:
+            return float((await conn.execute(self.REPLICA_HEALTH_SQL)).scalar())
+    
+    def start_replica_health_checks(self) -> None:
+        """Replica sağlık kontrolü döngüsünü başlatır; replica tanımlı değilse bir şey yapmaz"""
+        if not self._replica_engines or (self._health_check_task and not self._health_check_task.done()):
+            return
+        
+        self._health_check_task = asyncio.create_task(self._run_health_checks(Config().replica_health_check_interval_seconds))
+        logger.info(f"✅ Replica health checks started for {len(self._replica_engines)} replicas")
+    
+    async def stop_replica_health_checks(self) -> None:
+        """Sağlık kontrolü döngüsünü durdurur"""
+        if not self._health_check_task:
+            return
+        
+        self._health_check_task.cancel()
+        try:
+            await self._health_check_task
+        except asyncio.CancelledError:
+            pass
+        self._health_check_task = None
+    
+    async def _run_health_checks(self, interval: int) -> None:
+        while True:
+            try:
+                await self.check_replicas()
+            except Exception as e:
+                logger.error(f"❌ Replica health check loop error: {e}")
+            await asyncio.sleep(interval)
 
 # Singleton instance'ını oluştur
 db_manager = DatabaseManager()
 
+async def set_statement_timeout(session: AsyncSession, timeout_ms: int) -> None:
+    """statement_timeout'u sadece açık transaction için ayarlar; commit/rollback ile eski değere döner"""
+    await session.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+
+
 # Dependency for getting DB session
-async def get_db_session() -> AsyncSession:
+async def get_db_session(request: Request) -> AsyncSession:
+    timeout_ms = db_manager.statement_timeout_for(request.url.path)
     async with db_manager.session_local() as session:
         try:
+            if db_manager.needs_statement_timeout(timeout_ms):
+                await set_statement_timeout(session, timeout_ms)
             yield session
             await session.commit()
         except Exception as e:
             await session.rollback()
             raise e
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+# Dependency for read-only work: sağlıklı bir replica'ya, yoksa primary'ye gider
+# Bağlantı AUTOCOMMIT modunda alınır; BEGIN/COMMIT round trip'i olmaz, commit çağrılmaz
+# Route'a özel statement_timeout varsa SET LOCAL için transaction açılır, close'taki rollback ile biter
+async def get_read_session(request: Request) -> AsyncSession:
+    timeout_ms = db_manager.statement_timeout_for(request.url.path)
+    async with db_manager.read_session_local() as session:
+        try:
+            if db_manager.needs_statement_timeout(timeout_ms):
+                await set_statement_timeout(session, timeout_ms)
+            else:
+                await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+            yield session
+        finally:
+            await session.close()
+
+
+# Request dependency'si dışında (StreamingResponse, arka plan işleri) kullanılacak session
+@asynccontextmanager
+async def session_scope() -> AsyncSession:
+    async with db_manager.session_local() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            raise e
+
+
+# session_scope'un okuma amaçlı karşılığı (replica'ya yönlenir)
+# Server-side cursor transaction gerektirdiği için READ ONLY transaction açılır; commit edilmez, close ile biter
+# statement_timeout_ms verilirse (örn. route timeout'u) SET LOCAL ile bu transaction'a uygulanır
+@asynccontextmanager
+async def read_session_scope(statement_timeout_ms: Optional[int] = None) -> AsyncSession:
+    async with db_manager.read_session_local() as session:
+        await session.connection(execution_options={"postgresql_readonly": True})
+        if statement_timeout_ms is not None and db_manager.needs_statement_timeout(statement_timeout_ms):
+            await set_statement_timeout(session, statement_timeout_ms)
+        yield session
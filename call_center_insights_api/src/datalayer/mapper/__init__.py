@@ -8,6 +8,8 @@ from .merchant_person_mapper import MerchantPersonMapper
 from .merchant_ticket_mapper import MerchantTicketMapper
 from .ticket_details_mapper import TicketDetailsMapper
 from .merchant_contact_mapper import MerchantContactMapper
+from .materialized_view_refresh_mapper import MaterializedViewRefreshMapper
+from .analysis_rollup_mapper import AnalysisRollupMapper
 
 
 __all__ = [
@@ -19,4 +21,6 @@ __all__ = [
     "MerchantTicketMapper",
     "TicketDetailsMapper",
     "MerchantContactMapper",
+    "MaterializedViewRefreshMapper",
+    "AnalysisRollupMapper",
 ]
\ No newline at end of file
@@ -1,6 +1,7 @@
 from datalayer.model.schema_call_center_insight.all_result_view_db import AllResultViewDB
-from datalayer.model.dto.all_result_view_dto import AllResultViewDto
-from typing import List
+from datalayer.model.dto.all_result_view_dto import AllResultViewDto, AllResultViewPartialDto
+from datalayer.model.dto.agent_stats_dto import AgentStatsDto
+from typing import Iterable, Iterator, List, Dict, Optional
 import logging
 import json
 
@@ -12,6 +13,32 @@ class AllResultViewMapper:
     Not: Bu bir view olduğu için sadece READ işlemleri desteklenir.
     """
     
+    # DTO alan adı -> view kolon adı
+    FIELD_COLUMNS: Dict[str, str] = {
+        "call_id": "call_id",
+        "agent_name": "call_agent_name",
+        "phone_number": "call_phone_number",
+        "duration": "call_duration",
+        "agent_speech_rate": "call_agent_speech_rate",
+        "customer_speech_rate": "call_customer_speech_rate",
+        "silence_rate": "call_silence_rate",
+        "cross_talk_rate": "call_cross_talk_rate",
+        "agent_interrupt_count": "call_agent_interrupt_count",
+        "created_at": "call_created_at",
+        "base_analysis_call_id": "base_analysis_call_id",
+        "call_reason": "base_analysis_reason",
+        "call_reason_detail": "base_analysis_reason_detail",
+        "is_follow_up_required": "base_analysis_call_requires_followup",
+        "organization_metadata": "base_analysis_organization_metadata",
+        "issue_analysis_id": "issue_analysis_id",
+        "issue_sub_category": "issue_analysis_sub_category",
+        "sub_issue_type": "issue_analysis_sub_issue_type",
+        "churn_risk": "issue_analysis_churn_risk",
+        "urgency_level": "issue_analysis_urgency_level",
+        "related_with_previous_call": "issue_analysis_related_with_previous_call",
+        "previous_call_relation_detail": "issue_analysis_related_with_previous_call_detail",
+    }
+    
     @staticmethod
     def _convert_organization_metadata(metadata) -> str:
         """
@@ -118,4 +145,73 @@ class AllResultViewMapper:
         if not db_models:
             return []
         
-        return [AllResultViewMapper.to_dto(db_model) for db_model in db_models]
\ No newline at end of file
+        return [AllResultViewMapper.to_dto(db_model) for db_model in db_models]
+
+    @staticmethod
+    def resolve_fields(fields: List[str]) -> List[str]:
+        """
+        fields= parametresindeki adları (snake_case veya camelCase) DTO alan adlarına çevirir.
+        Bilinmeyen bir alan varsa ValueError fırlatır.
+        """
+        aliases = {
+            info.alias or name: name
+            for name, info in AllResultViewDto.model_fields.items()
+        }
+        resolved = []
+        for field in fields:
+            name = field if field in AllResultViewMapper.FIELD_COLUMNS else aliases.get(field)
+            if name is None:
+                raise ValueError(f"Bilinmeyen alan: {field}")
+            if name not in resolved:
+                resolved.append(name)
+        return resolved
+
+    @staticmethod
+    def to_columns(fields: List[str]) -> List[str]:
+        """DTO alan adlarını view kolon adlarına çevirir"""
+        return [AllResultViewMapper.FIELD_COLUMNS[field] for field in fields]
+
+    @staticmethod
+    def to_partial_dto(row, fields: List[str]) -> AllResultViewPartialDto:
+        """
+        Kolon projeksiyonu ile gelen satırı sadece istenen alanları set edilmiş
+        AllResultViewPartialDto'ya dönüştürür.
+        """
+        values = {}
+        for field in fields:
+            value = getattr(row, AllResultViewMapper.FIELD_COLUMNS[field])
+            if field == "organization_metadata":
+                value = AllResultViewMapper._convert_organization_metadata(value)
+            elif field == "churn_risk":
+                value = AllResultViewMapper._convert_churn_risk(value)
+            values[field] = value
+        return AllResultViewPartialDto(**values)
+
+    @staticmethod
+    def to_agent_stats_dto(row, churn_risk_distribution: Optional[Dict[str, int]] = None) -> AgentStatsDto:
+        """
+        GROUP BY satırını AgentStatsDto'ya dönüştürür.
+        AVG tamsayı kolonlarda Decimal döndüğü için ortalamalar float'a çevrilir.
+        """
+        def _to_float(value):
+            return float(value) if value is not None else None
+        
+        return AgentStatsDto(
+            agent_name=row.agent_name,
+            call_count=row.call_count,
+            avg_duration=_to_float(row.avg_duration),
+            avg_silence_rate=_to_float(row.avg_silence_rate),
+            avg_cross_talk_rate=_to_float(row.avg_cross_talk_rate),
+            avg_agent_interrupt_count=_to_float(row.avg_agent_interrupt_count),
+            total_agent_interrupt_count=int(row.total_agent_interrupt_count),
+            churn_risk_distribution=churn_risk_distribution or {}
+        )
+
+    @staticmethod
+    def iter_partial_dto(rows: Iterable, fields: List[str]) -> Iterator[AllResultViewPartialDto]:
+        """
+        Satırları tek tek dönüştüren generator; export gibi büyük sonuçlarda
+        ara liste oluşturmadan kullanılır.
+        """
+        for row in rows:
+            yield AllResultViewMapper.to_partial_dto(row, fields)
@@ -0,0 +1,21 @@
+from datalayer.model.dto.analysis_timeseries_dto import AnalysisTimeseriesPointDto
+
+class AnalysisRollupMapper:
+    """
+    Rollup toplamlarını zaman serisi DTO'suna dönüştürür.
+    Ortalamalar ve oranlar toplam/sayı olarak burada hesaplanır.
+    """
+    
+    @staticmethod
+    def _ratio(numerator, denominator):
+        return float(numerator) / float(denominator) if denominator else None
+    
+    @staticmethod
+    def to_timeseries_dto(row) -> AnalysisTimeseriesPointDto:
+        return AnalysisTimeseriesPointDto(
+            bucket=row.bucket,
+            call_count=int(row.call_count),
+            avg_duration=AnalysisRollupMapper._ratio(row.total_duration, row.call_count),
+            follow_up_ratio=AnalysisRollupMapper._ratio(row.follow_up_count, row.analyzed_count),
+            avg_churn_risk=AnalysisRollupMapper._ratio(row.churn_risk_sum, row.churn_scored_count)
+        )
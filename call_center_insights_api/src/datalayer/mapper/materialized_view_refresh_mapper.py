@@ -0,0 +1,15 @@
+from datalayer.model.schema_call_center_insight import MaterializedViewRefreshDB
+from datalayer.model.dto import MaterializedViewVersionDto
+
+class MaterializedViewRefreshMapper:
+    
+    @staticmethod
+    def to_dto(db_model: MaterializedViewRefreshDB) -> MaterializedViewVersionDto:
+        return MaterializedViewVersionDto(
+            view_name=db_model.view_name,
+            version=db_model.version,
+            refreshed_at=db_model.refreshed_at,
+            duration_ms=db_model.duration_ms,
+            concurrent=db_model.concurrent,
+            trigger=db_model.trigger
+        )
@@ -1,8 +1,22 @@
 from datalayer.model.schema_call_center_insight import MerchantDB
-from datalayer.model.dto import MerchantDto, MerchantCreateDto
+from datalayer.model.dto import MerchantDto, MerchantCreateDto, MerchantSummaryDto
 
 class MerchantMapper:
     
+    @staticmethod
+    def to_summary_dto(row) -> MerchantSummaryDto:
+        return MerchantSummaryDto(
+            merchant_id=row.merchant_id,
+            merchant_name=row.merchant_name,
+            merchant_brand=row.merchant_brand,
+            merchant_status=row.merchant_status,
+            merchant_city=row.merchant_city,
+            merchant_district=row.merchant_district,
+            merchant_tax_no=row.merchant_tax_no,
+            merchant_person_name=row.merchant_person_name,
+            score=row.score
+        )
+    
     @staticmethod
     def to_dto(db_model: MerchantDB) -> MerchantDto:
         import logging
@@ -1,5 +1,8 @@
+import html
+from typing import Optional
 from datalayer.model.schema_call_center_insight import TicketDetailsDB
-from datalayer.model.dto import TicketDetailsDto, TicketDetailsCreateDto
+from datalayer.model.dto import TicketDetailsDto, TicketDetailsCreateDto, TicketSearchHitDto
+from datalayer.model.dto.ticket_search_dto import SNIPPET_START_SEL, SNIPPET_STOP_SEL
 
 class TicketDetailsMapper:
     
@@ -10,6 +13,27 @@ class TicketDetailsMapper:
             ticket_detail=db_model.ticket_detail
         )
 
+    @staticmethod
+    def to_search_hit_dto(row) -> TicketSearchHitDto:
+        return TicketSearchHitDto(
+            ticket_id=row.ticket_id,
+            merchant_id=row.merchant_id,
+            merchant_ticket_time=row.merchant_ticket_time,
+            rank=row.rank,
+            snippet=TicketDetailsMapper.to_snippet_html(row.snippet)
+        )
+
+    @staticmethod
+    def to_snippet_html(snippet: Optional[str]) -> Optional[str]:
+        """ts_headline parçasını HTML escape eder ve eşleşme ayraçlarını <mark> etiketine çevirir"""
+        if snippet is None:
+            return None
+        return (
+            html.escape(snippet)
+            .replace(SNIPPET_START_SEL, "<mark>")
+            .replace(SNIPPET_STOP_SEL, "</mark>")
+        )
+
     @staticmethod
     def to_db(dto: TicketDetailsCreateDto) -> TicketDetailsDB:
         return TicketDetailsDB(
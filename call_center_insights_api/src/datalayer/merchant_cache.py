@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCacheStore:
+    """
+    Redis'in kullanılan alt kümesini (mget, set(ex=), delete, scan_iter) süreç içinde sağlayan LRU + TTL store.
+    MERCHANT_CACHE_REDIS_URL tanımlı değilse kullanılır; testlerde Redis yerine geçer.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Optional[float], str]]" = OrderedDict()
+        self._lock = Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str, now: float) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= now:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._get(key, time.monotonic())
+
+    async def mget(self, keys: Iterable[str]) -> List[Optional[str]]:
+        now = time.monotonic()
+        with self._lock:
+            return [self._get(key, now) for key in keys]
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
+        if self.max_size <= 0:
+            return False
+        expires_at = time.monotonic() + ex if ex else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._entries.pop(key, None) is not None)
+
+    async def scan_iter(self, match: Optional[str] = None) -> AsyncIterator[str]:
+        # Sadece sonda '*' olan prefix pattern'leri desteklenir (bu modülün ihtiyacı kadar)
+        prefix = match[:-1] if match and match.endswith("*") else match
+        with self._lock:
+            keys = [key for key in self._entries if prefix is None or key.startswith(prefix)]
+        for key in keys:
+            yield key
+
+
+class MerchantCompleteCache:
+    """
+    merchant_id -> MerchantCompleteDto JSON'u cache'i.
+    Değerler JSON metni olarak saklanır; böylece aynı kod süreç içi store ile de Redis ile de çalışır.
+    Store hataları isteği düşürmez: okuma miss, yazma/silme no-op sayılır.
+    Her invalidation bir generation sayacını artırır; yükleme başında generation() alınıp set_many'ye verilirse
+    yükleme sürerken invalidate edilen merchant'ların (artık eski olabilecek) dokümanı cache'e yazılmaz.
+    """
+
+    KEY_PREFIX = "merchant:complete:"
+    # Generation'ı hatırlanan en fazla merchant; taşınca daha eski token'lı yüklemeler hiç cache'e yazmaz
+    INVALIDATION_HISTORY_SIZE = 100_000
+
+    def __init__(self, store: Any, ttl_seconds: int, max_size: int, backend: str):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.backend = backend
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._errors = 0
+        self._generation = 0
+        self._invalidated_at: "OrderedDict[int, int]" = OrderedDict()
+        # Bu generation'dan eski token'lar için invalidation geçmişi eksik (clear veya geçmiş taşması)
+        self._floor_generation = 0
+        self._stale_skips = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_size > 0
+
+    @classmethod
+    def key(cls, merchant_id: int) -> str:
+        return f"{cls.KEY_PREFIX}{merchant_id}"
+
+    async def get_many(self, merchant_ids: List[int]) -> Dict[int, str]:
+        """Cache'te bulunan merchant'ların JSON'unu döndürür; bulunamayanlar sonuçta yer almaz"""
+        if not self.enabled or not merchant_ids:
+            return {}
+
+        merchant_ids = list(dict.fromkeys(merchant_ids))
+        try:
+            values = await self.store.mget([self.key(merchant_id) for merchant_id in merchant_ids])
+        except Exception as e:
+            self._errors += 1
+            self._misses += len(merchant_ids)
+            logger.warning(f"⚠️ Merchant cache read failed, falling back to database: {e}")
+            return {}
+
+        documents = {merchant_id: value for merchant_id, value in zip(merchant_ids, values) if value is not None}
+        self._hits += len(documents)
+        self._misses += len(merchant_ids) - len(documents)
+        return documents
+
+    def generation(self) -> int:
+        """Yükleme başlamadan önce alınıp set_many(generation=...) ile geri verilecek token"""
+        return self._generation
+
+    def _record_invalidation(self, merchant_ids: List[int]) -> None:
+        self._generation += 1
+        for merchant_id in merchant_ids:
+            self._invalidated_at[merchant_id] = self._generation
+            self._invalidated_at.move_to_end(merchant_id)
+        while len(self._invalidated_at) > self.INVALIDATION_HISTORY_SIZE:
+            _, generation = self._invalidated_at.popitem(last=False)
+            self._floor_generation = max(self._floor_generation, generation)
+
+    async def set_many(self, documents: Dict[int, str], generation: Optional[int] = None) -> None:
+        """
+        Dokümanları TTL ile yazar. generation verilirse o token alındıktan sonra invalidate edilen
+        merchant'lar atlanır; yükleme sırasında gelen değişiklik eski dokümanla ezilmez.
+        """
+        if not self.enabled or not documents:
+            return
+
+        if generation is not None:
+            if generation < self._floor_generation:
+                self._stale_skips += len(documents)
+                return
+            fresh = {
+                merchant_id: document for merchant_id, document in documents.items()
+                if self._invalidated_at.get(merchant_id, 0) <= generation
+            }
+            self._stale_skips += len(documents) - len(fresh)
+            documents = fresh
+            if not documents:
+                return
+
+        try:
+            await asyncio.gather(*(
+                self.store.set(self.key(merchant_id), document, ex=self.ttl_seconds)
+                for merchant_id, document in documents.items()
+            ))
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"⚠️ Merchant cache write failed: {e}")
+
+    async def invalidate(self, merchant_ids: Iterable[int]) -> int:
+        """Verilen merchant'ların cache kayıtlarını siler; silinen kayıt sayısını döndürür"""
+        merchant_ids = list(dict.fromkeys(merchant_ids))
+        if not merchant_ids:
+            return 0
+        # Store hatası olsa bile süren yüklemelerin eski dokümanı yazmaması için önce kaydedilir
+        self._record_invalidation(merchant_ids)
+        keys = [self.key(merchant_id) for merchant_id in merchant_ids]
+
+        try:
+            deleted = await self.store.delete(*keys)
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"⚠️ Merchant cache invalidation failed for {len(keys)} merchants: {e}")
+            return 0
+
+        self._invalidations += deleted
+        return deleted
+
+    async def clear(self) -> int:
+        """Tüm merchant kayıtlarını siler (örn. invalidation bildirimleri kaçırıldığında)"""
+        # Öncesinde başlamış yüklemeler hiçbir merchant'ı cache'e yazmaz
+        self._generation += 1
+        self._invalidated_at.clear()
+        self._floor_generation = self._generation
+        try:
+            keys = [key async for key in self.store.scan_iter(match=f"{self.KEY_PREFIX}*")]
+            deleted = await self.store.delete(*keys) if keys else 0
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"⚠️ Merchant cache clear failed: {e}")
+            return 0
+
+        self._invalidations += deleted
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        is_local = isinstance(self.store, LocalCacheStore)
+        return {
+            "backend": self.backend,
+            "enabled": self.enabled,
+            "size": len(self.store) if is_local else None,
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations,
+            "evictions": self.store.evictions if is_local else None,
+            "expirations": self.store.expirations if is_local else None,
+            "errors": self._errors,
+            "stale_skips": self._stale_skips,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _create_merchant_cache(config: Config) -> MerchantCompleteCache:
+    """MERCHANT_CACHE_REDIS_URL tanımlıysa ve redis paketi kuruluysa Redis, değilse süreç içi store kullanılır"""
+    if config.merchant_cache_redis_url:
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            logger.warning("⚠️ MERCHANT_CACHE_REDIS_URL set but the redis package is not installed, using the local cache")
+        else:
+            # Redis'te boyut sınırı ve LRU tahliyesi sunucu tarafındadır (maxmemory + allkeys-lru)
+            store = redis_asyncio.from_url(config.merchant_cache_redis_url, decode_responses=True)
+            return MerchantCompleteCache(store, config.merchant_cache_ttl_seconds, config.merchant_cache_max_size, "redis")
+
+    store = LocalCacheStore(config.merchant_cache_max_size)
+    return MerchantCompleteCache(store, config.merchant_cache_ttl_seconds, config.merchant_cache_max_size, "local")
+
+
+merchant_complete_cache = _create_merchant_cache(Config())
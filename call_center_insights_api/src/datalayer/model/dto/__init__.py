@@ -23,6 +23,11 @@ from .call_dto import (
 
 from .all_result_view_dto import (
     AllResultViewDto,
+    AllResultViewPartialDto,
+)
+
+from .agent_stats_dto import (
+    AgentStatsDto,
 )
 
 from .qdrant_dto import (
@@ -68,10 +73,41 @@ from .merchant_contact_dto import (
 from .merchant_complete_dto import (
     MerchantCompleteDto,
     MerchantTicketWithDetailsDto,
+    MerchantTicketQueryDto,
     MerchantBatchRequestDto,
     MerchantBatchResponseDto
 )
 
+from .materialized_view_dto import (
+    MaterializedViewVersionDto
+)
+
+from .analysis_timeseries_dto import (
+    AnalysisTimeseriesPointDto,
+)
+
+from .database_pool_dto import (
+    DatabasePoolStatsDto,
+)
+
+from .statement_cache_dto import (
+    StatementCacheStatsDto,
+)
+
+from .merchant_cache_dto import (
+    MerchantCacheStatsDto,
+)
+
+from .ticket_search_dto import (
+    TicketSearchHitDto,
+    TicketSearchResponseDto,
+)
+
+from .merchant_search_dto import (
+    MerchantSummaryDto,
+    MerchantSearchResponseDto,
+)
+
 __all__ = [
     "BusinessLogicDto",
     "BaseDto",
@@ -82,6 +118,8 @@ __all__ = [
     "CallDto",
     "CallCreateDto",
     "AllResultViewDto",
+    "AllResultViewPartialDto",
+    "AgentStatsDto",
     "QdrantSearchRequestDto",
     "QdrantSearchResponseDto",
     "QdrantTextSearchRequestDto",
@@ -106,6 +144,16 @@ __all__ = [
     "MerchantContactCreateDto",
     "MerchantCompleteDto",
     "MerchantTicketWithDetailsDto",
+    "MerchantTicketQueryDto",
     "MerchantBatchRequestDto",
     "MerchantBatchResponseDto",
+    "MaterializedViewVersionDto",
+    "AnalysisTimeseriesPointDto",
+    "DatabasePoolStatsDto",
+    "StatementCacheStatsDto",
+    "MerchantCacheStatsDto",
+    "TicketSearchHitDto",
+    "TicketSearchResponseDto",
+    "MerchantSummaryDto",
+    "MerchantSearchResponseDto",
 ]
@@ -0,0 +1,25 @@
+# datalayer/model/dto/agent_stats_dto.py
+
+from pydantic import Field
+from typing import Dict, Optional
+from .base_dto import BaseDto
+
+
+# --- RESPONSE DTO ---
+class AgentStatsDto(BaseDto):
+    """
+    Bir ajanın filtreye uyan görüşmeleri üzerinden SQL tarafında hesaplanan istatistikleri.
+    """
+    
+    agent_name: str = Field(..., description="Ajan adı", alias="agentName")
+    call_count: int = Field(..., description="Görüşme sayısı", alias="callCount")
+    avg_duration: Optional[float] = Field(None, description="Ortalama görüşme süresi (saniye)", alias="avgDuration")
+    avg_silence_rate: Optional[float] = Field(None, description="Ortalama sessizlik oranı (%)", alias="avgSilenceRate")
+    avg_cross_talk_rate: Optional[float] = Field(None, description="Ortalama karşılıklı konuşma oranı (%)", alias="avgCrossTalkRate")
+    avg_agent_interrupt_count: Optional[float] = Field(None, description="Görüşme başına ortalama söz kesme sayısı", alias="avgAgentInterruptCount")
+    total_agent_interrupt_count: int = Field(0, description="Toplam söz kesme sayısı", alias="totalAgentInterruptCount")
+    churn_risk_distribution: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Churn risk seviyesi -> görüşme sayısı; issue analizi olmayan görüşmeler 'unknown' altında sayılır",
+        alias="churnRiskDistribution"
+    )
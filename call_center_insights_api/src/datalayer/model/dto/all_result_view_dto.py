@@ -67,4 +67,35 @@ class AllResultViewDto(BaseDto):
     churn_risk: Optional[Union[str, int]] = Field(None, description="Churn risk seviyesi", alias="churnRisk")
     urgency_level: Optional[str] = Field(None, description="Aciliyet seviyesi", alias="urgencyLevel")
     related_with_previous_call: Optional[bool] = Field(None, description="Önceki çağrı ile ilişkili mi", alias="relatedWithPreviousCall")
-    previous_call_relation_detail: Optional[str] = Field(None, description="Önceki çağrı ilişki detayı", alias="previousCallRelationDetail")
\ No newline at end of file
+    previous_call_relation_detail: Optional[str] = Field(None, description="Önceki çağrı ilişki detayı", alias="previousCallRelationDetail")
+
+# --- PARTIAL RESPONSE DTO ---
+# fields= parametresi ile sadece istenen kolonlar döndürüldüğünde kullanılan veri modeli
+class AllResultViewPartialDto(BaseDto):
+    """
+    AllResultViewDto'nun tüm alanları opsiyonel olan projeksiyon karşılığı.
+    Sadece istenen alanlar set edilir; response'ta set edilmeyen alanlar yer almaz.
+    """
+    
+    call_id: Optional[UUID] = Field(None, description="Call kaydının benzersiz ID'si", alias="callId")
+    agent_name: Optional[str] = Field(None, description="Görüşmeyi yapan ajanın adı", alias="agentName")
+    phone_number: Optional[str] = Field(None, description="Müşterinin telefon numarası", alias="phoneNumber")
+    duration: Optional[float] = Field(None, description="Görüşmenin saniye cinsinden süresi")
+    agent_speech_rate: Optional[float] = Field(None, description="Ajanın konuşma oranı (%)", alias="agentSpeechRate")
+    customer_speech_rate: Optional[float] = Field(None, description="Müşterinin konuşma oranı (%)", alias="customerSpeechRate")
+    silence_rate: Optional[float] = Field(None, description="Görüşmedeki sessizlik oranı (%)", alias="silenceRate")
+    cross_talk_rate: Optional[float] = Field(None, description="Karşılıklı konuşma oranı (%)", alias="crossTalkRate")
+    agent_interrupt_count: Optional[int] = Field(None, description="Ajanın müşterinin sözünü kesme sayısı", alias="agentInterruptCount")
+    created_at: Optional[datetime] = Field(None, description="Kaydın oluşturulma zamanı", alias="createdAt")
+    base_analysis_call_id: Optional[UUID] = Field(None, description="Base analysis call ID", alias="baseAnalysisCallId")
+    call_reason: Optional[str] = Field(None, description="Aramanın ana nedeni", alias="callReason")
+    call_reason_detail: Optional[str] = Field(None, description="Arama nedeninin detaylı açıklaması", alias="callReasonDetail")
+    is_follow_up_required: Optional[bool] = Field(None, description="Aramanın takip gerektirip gerektirmediği", alias="isFollowUpRequired")
+    organization_metadata: Optional[Union[str, dict, Any]] = Field(None, description="Organizasyon metadata'sı", alias="organizationMetadata")
+    issue_analysis_id: Optional[UUID] = Field(None, description="Issue analysis ID", alias="issueAnalysisId")
+    issue_sub_category: Optional[str] = Field(None, description="Issue alt kategorisi", alias="issueSubCategory")
+    sub_issue_type: Optional[str] = Field(None, description="Alt issue tipi", alias="subIssueType")
+    churn_risk: Optional[Union[str, int]] = Field(None, description="Churn risk seviyesi", alias="churnRisk")
+    urgency_level: Optional[str] = Field(None, description="Aciliyet seviyesi", alias="urgencyLevel")
+    related_with_previous_call: Optional[bool] = Field(None, description="Önceki çağrı ile ilişkili mi", alias="relatedWithPreviousCall")
+    previous_call_relation_detail: Optional[str] = Field(None, description="Önceki çağrı ilişki detayı", alias="previousCallRelationDetail")
@@ -1,14 +1,15 @@
-from typing import Generic, List, Optional, TypeVar
+from typing import Generic, List, Optional, TypeVar, Union
 from pydantic import BaseModel, Field
 
 from datalayer.model.dto.base_dto import BaseDto
-from datalayer.model.dto.all_result_view_dto import AllResultViewDto
+from datalayer.model.dto.all_result_view_dto import AllResultViewDto, AllResultViewPartialDto
 
 T = TypeVar('T')
 
 class AnalysisResultResponseDto(BaseDto):
     """Analysis result response model with count"""
     is_success: bool = Field(..., description="Success status")
-    count: int = Field(..., description="Total count of records")
+    count: Optional[int] = Field(None, description="Total count of records (planner estimate for countMode=estimate, null for countMode=none)")
     message: Optional[str] = Field(None, description="Response message")
-    data: List[AllResultViewDto] = Field(..., description="Analysis result data")
\ No newline at end of file
+    data: List[Union[AllResultViewDto, AllResultViewPartialDto]] = Field(..., description="Analysis result data (only the requested fields when fields= is used)")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, null on the last page")
\ No newline at end of file
@@ -0,0 +1,19 @@
+# datalayer/model/dto/analysis_timeseries_dto.py
+
+from pydantic import Field
+from datetime import datetime
+from typing import Optional
+from .base_dto import BaseDto
+
+
+# --- RESPONSE DTO ---
+class AnalysisTimeseriesPointDto(BaseDto):
+    """
+    Saatlik/günlük rollup tablolarından okunan tek bir zaman serisi noktası.
+    """
+    
+    bucket: datetime = Field(..., description="Bucket başlangıcı (saat veya gün, Europe/Istanbul)")
+    call_count: int = Field(..., description="Bucket'taki görüşme sayısı", alias="callCount")
+    avg_duration: Optional[float] = Field(None, description="Ortalama görüşme süresi (saniye)", alias="avgDuration")
+    follow_up_ratio: Optional[float] = Field(None, description="Analiz edilmiş görüşmelerde takip gerektirenlerin oranı (0-1)", alias="followUpRatio")
+    avg_churn_risk: Optional[float] = Field(None, description="Churn risk skoru olan görüşmelerde ortalama churn risk", alias="avgChurnRisk")
@@ -0,0 +1,23 @@
+from pydantic import Field
+from .base_dto import BaseDto
+
+
+# --- RESPONSE DTO ---
+class DatabasePoolStatsDto(BaseDto):
+    """
+    Bir engine'in bağlantı havuzu durumu ve bağlantı alma sayaçları.
+    """
+    
+    name: str = Field(..., description="Havuz adı: primary veya replica:host:port")
+    healthy: bool = Field(..., description="Replica okuma havuzunda mı (primary için her zaman true)")
+    size: int = Field(..., description="Kalıcı bağlantı sayısı (pool_size)")
+    max_overflow: int = Field(..., description="İzin verilen ek bağlantı sayısı", alias="maxOverflow")
+    checked_in: int = Field(..., description="Havuzda boşta bekleyen bağlantı sayısı", alias="checkedIn")
+    checked_out: int = Field(..., description="Şu an kullanımda olan bağlantı sayısı", alias="checkedOut")
+    overflow: int = Field(..., description="Anlık overflow (negatifse henüz açılmamış kalıcı bağlantı sayısı)")
+    timeout_seconds: float = Field(..., description="Bağlantı bekleme zaman aşımı (saniye)", alias="timeoutSeconds")
+    checkouts: int = Field(..., description="Başlangıçtan beri alınan bağlantı sayısı")
+    timeouts: int = Field(..., description="Zaman aşımına uğrayan bağlantı alma sayısı")
+    total_wait_ms: float = Field(..., description="Bağlantı almak için toplam bekleme süresi (ms)", alias="totalWaitMs")
+    avg_wait_ms: float = Field(..., description="Ortalama bağlantı alma süresi (ms)", alias="avgWaitMs")
+    max_wait_ms: float = Field(..., description="En uzun bağlantı alma süresi (ms)", alias="maxWaitMs")
@@ -0,0 +1,18 @@
+from pydantic import Field
+from datetime import datetime
+from .base_dto import BaseDto
+
+
+# --- RESPONSE DTO ---
+class MaterializedViewVersionDto(BaseDto):
+    """
+    Bir materialized view'ın son refresh bilgisini ve versiyonunu döndüren DTO.
+    Cache ve ETag'ler version alanını anahtar olarak kullanabilir.
+    """
+    
+    view_name: str = Field(..., description="Materialized view adı", alias="viewName")
+    version: int = Field(..., description="Her refresh'te artan view versiyonu")
+    refreshed_at: datetime = Field(..., description="Refresh'in tamamlandığı zaman", alias="refreshedAt")
+    duration_ms: float = Field(..., description="Refresh süresi (ms)", alias="durationMs")
+    concurrent: bool = Field(..., description="REFRESH ... CONCURRENTLY ile mi yapıldı")
+    trigger: str = Field(..., description="Refresh'i başlatan kaynak: schedule, manual veya ingestion")
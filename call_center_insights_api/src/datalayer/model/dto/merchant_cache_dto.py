@@ -0,0 +1,24 @@
+from typing import Optional
+from pydantic import Field
+from .base_dto import BaseDto
+
+
+# --- RESPONSE DTO ---
+class MerchantCacheStatsDto(BaseDto):
+    """
+    Merchant complete data cache'inin durumu ve isabet sayaçları (sayaçlar bu süreç içindir).
+    """
+    
+    backend: str = Field(..., description="Cache store'u: local veya redis")
+    enabled: bool = Field(..., description="TTL ve kapasite 0'dan büyükse True")
+    size: Optional[int] = Field(None, description="Cache'teki merchant sayısı (sadece local store)")
+    max_size: int = Field(..., description="Süreç içi cache kapasitesi (MERCHANT_CACHE_MAX_SIZE)", alias="maxSize")
+    ttl_seconds: int = Field(..., description="Kayıt yaşam süresi (MERCHANT_CACHE_TTL_SECONDS)", alias="ttlSeconds")
+    hits: int = Field(..., description="Cache'ten dönen merchant sayısı")
+    misses: int = Field(..., description="DB'den yüklenen merchant sayısı")
+    invalidations: int = Field(..., description="Değişiklik bildirimiyle silinen kayıt sayısı")
+    evictions: Optional[int] = Field(None, description="Kapasite dolduğu için çıkarılan kayıt sayısı (sadece local store)")
+    expirations: Optional[int] = Field(None, description="TTL'i dolduğu için çıkarılan kayıt sayısı (sadece local store)")
+    errors: int = Field(..., description="Store hatası sayısı (istekler DB'ye düşer)")
+    stale_skips: int = Field(..., description="Yüklenirken invalidate edildiği için cache'e yazılmayan doküman sayısı", alias="staleSkips")
+    hit_rate: float = Field(..., description="hits / (hits + misses)", alias="hitRate")
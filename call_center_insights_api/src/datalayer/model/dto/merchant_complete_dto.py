@@ -4,6 +4,10 @@ from typing import Optional, List
 from .base_dto import BaseDto
 
 
+# ---! include= ile seçilebilen bölümler (merchant başlığı her zaman döner); ticket_details, tickets'ı da getirir
+MERCHANT_INCLUDE_SECTIONS = ("person", "contacts", "tickets", "ticket_details")
+
+
 # --- Consolidated response DTO for all merchant data ---
 class MerchantCompleteDto(BaseDto):
     """
@@ -38,6 +42,8 @@ class MerchantCompleteDto(BaseDto):
     
     # Merchant tickets with details
     tickets: Optional[List["MerchantTicketWithDetailsDto"]] = Field(None, description="Merchant ile ilişkili ticket ve detayları", alias="tickets")
+    # Sadece ticket sayfalaması istendiğinde döner; null ise son sayfa
+    tickets_next_cursor: Optional[str] = Field(None, description="Sonraki ticket sayfası için opak cursor (tickets_cursor), son sayfada null", alias="ticketsNextCursor")
 
 
 class MerchantTicketWithDetailsDto(BaseDto):
@@ -59,6 +65,17 @@ class MerchantTicketWithDetailsDto(BaseDto):
     ticket_detail: Optional[str] = Field(None, description="Ticket detayı", alias="ticketDetail")
 
 
+class MerchantTicketQueryDto(BaseDto):
+    """
+    Merchant endpoint'lerinde ticket yüklemesini sınırlayan parametreler.
+    Ticket'lar merchant_ticket_time'a göre en yeniden eskiye sıralanır.
+    """
+    
+    since: Optional[datetime] = Field(None, description="Sadece bu zamandan (dahil) sonraki ticket'lar", alias="ticketsSince")
+    limit: Optional[int] = Field(None, description="Merchant başına en fazla ticket sayısı", alias="ticketsLimit")
+    cursor: Optional[str] = Field(None, description="Önceki yanıttaki ticketsNextCursor", alias="ticketsCursor")
+
+
 class MerchantBatchRequestDto(BaseDto):
     """
     Batch request için kullanılan DTO - tek veya birden fazla merchant_id.
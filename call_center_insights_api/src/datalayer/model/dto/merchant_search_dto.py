@@ -0,0 +1,29 @@
+from pydantic import Field
+from typing import List, Optional
+from .base_dto import BaseDto
+
+
+# --- RESPONSE DTO ---
+class MerchantSummaryDto(BaseDto):
+    """
+    Merchant aramasında dönen hafif özet satır; tüm veri /api/v1/merchants/complete/{merchantId} ile alınır.
+    """
+    
+    merchant_id: int = Field(..., description="Merchant benzersiz ID'si", alias="merchantId")
+    merchant_name: Optional[str] = Field(None, description="Merchant adı", alias="merchantName")
+    merchant_brand: Optional[str] = Field(None, description="Merchant markası", alias="merchantBrand")
+    merchant_status: Optional[str] = Field(None, description="Merchant durumu", alias="merchantStatus")
+    merchant_city: Optional[str] = Field(None, description="Merchant şehri", alias="merchantCity")
+    merchant_district: Optional[str] = Field(None, description="Merchant ilçesi", alias="merchantDistrict")
+    merchant_tax_no: Optional[str] = Field(None, description="Merchant vergi numarası", alias="merchantTaxNo")
+    merchant_person_name: Optional[str] = Field(None, description="Merchant kişi adı", alias="merchantPersonName")
+    score: float = Field(..., description="En iyi eşleşen alanın word_similarity skoru (0-1)")
+
+
+class MerchantSearchResponseDto(BaseDto):
+    """
+    Merchant aramasının bir sayfası; sonuçlar skora göre azalan sıradadır.
+    """
+    
+    merchants: List[MerchantSummaryDto] = Field(..., description="Sayfadaki merchant özetleri")
+    next_cursor: Optional[str] = Field(None, description="Sonraki sayfa için opak cursor, son sayfada null", alias="nextCursor")
@@ -0,0 +1,16 @@
+from pydantic import Field
+from .base_dto import BaseDto
+
+
+# --- RESPONSE DTO ---
+class StatementCacheStatsDto(BaseDto):
+    """
+    Filtre şekline göre önbelleğe alınan SQL statement cache'inin durumu ve isabet sayaçları.
+    """
+    
+    size: int = Field(..., description="Cache'teki statement sayısı")
+    max_size: int = Field(..., description="Cache kapasitesi (FILTER_STATEMENT_CACHE_SIZE)", alias="maxSize")
+    hits: int = Field(..., description="Cache'ten dönen statement sayısı")
+    misses: int = Field(..., description="Yeniden kurulan statement sayısı")
+    evictions: int = Field(..., description="Kapasite dolduğu için çıkarılan statement sayısı")
+    hit_rate: float = Field(..., description="hits / (hits + misses)", alias="hitRate")
@@ -0,0 +1,32 @@
+from pydantic import Field
+from datetime import datetime
+from typing import List, Optional
+from .base_dto import BaseDto
+
+# ts_headline'ın eşleşmeleri işaretlediği HTML olmayan ayraçlar (Unicode private use alanı).
+# Parça önce HTML escape edilir, sonra bu ayraçlar <mark> etiketlerine çevrilir; ticket metnindeki HTML çalışmaz.
+SNIPPET_START_SEL = "\ue000"
+SNIPPET_STOP_SEL = "\ue001"
+
+
+# --- RESPONSE DTO ---
+class TicketSearchHitDto(BaseDto):
+    """
+    Tam metin aramasında eşleşen tek bir ticket detayı.
+    """
+    
+    ticket_id: int = Field(..., description="Eşleşen ticket'ın ID'si", alias="ticketId")
+    merchant_id: int = Field(..., description="Ticket'ın bağlı olduğu merchant ID'si", alias="merchantId")
+    merchant_ticket_time: Optional[datetime] = Field(None, description="Ticket zamanı", alias="merchantTicketTime")
+    rank: float = Field(..., description="ts_rank skoru (yüksek daha alakalı)")
+    snippet: Optional[str] = Field(None, description="Eşleşen kelimeleri <mark> ile işaretlenmiş, HTML escape edilmiş parça")
+
+
+class TicketSearchResponseDto(BaseDto):
+    """
+    Ticket detayı aramasının bir sayfası; sonuçlar rank'e göre azalan sıradadır.
+    """
+    
+    hits: List[TicketSearchHitDto] = Field(..., description="Sayfadaki eşleşmeler")
+    merchant_ids: List[int] = Field(..., description="Sayfadaki eşleşmelerin merchant ID'leri (tekrarsız, ilk görülme sırasıyla)", alias="merchantIds")
+    next_cursor: Optional[str] = Field(None, description="Sonraki sayfa için opak cursor, son sayfada null", alias="nextCursor")
@@ -37,6 +37,15 @@ from .merchant_contact_db import (
     MerchantContactDB,
 )
 
+from .materialized_view_refresh_db import (
+    MaterializedViewRefreshDB,
+)
+
+from .analysis_rollup_db import (
+    AnalysisRollupHourlyDB,
+    AnalysisRollupDailyDB,
+)
+
 # ---! Tüm modelleri dışa aktarma listesi
 __all__ = [
     "BaseAnalysisResultDB",
@@ -48,4 +57,7 @@ __all__ = [
     "MerchantTicketDB",
     "TicketDetailsDB",
     "MerchantContactDB",
+    "MaterializedViewRefreshDB",
+    "AnalysisRollupHourlyDB",
+    "AnalysisRollupDailyDB",
 ]
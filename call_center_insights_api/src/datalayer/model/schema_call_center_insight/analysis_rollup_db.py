@@ -0,0 +1,35 @@
+from datetime import datetime
+from sqlalchemy import DateTime
+from sqlmodel import Field, SQLModel
+
+
+class AnalysisRollupHourlyDB(SQLModel, table=True):
+    __tablename__ = "analysis_rollup_hourly"
+    __table_args__ = {"schema": "public"}
+
+    # Composite primary key: (bucket, agent_name, call_reason)
+    bucket: datetime = Field(primary_key=True, sa_type=DateTime(timezone=True), description="Saat başlangıcı (Europe/Istanbul)")
+    agent_name: str = Field(primary_key=True)
+    call_reason: str = Field(primary_key=True, description="Base analizi olmayan görüşmelerde boş string")
+    call_count: int = Field(nullable=False)
+    total_duration: float = Field(nullable=False)
+    analyzed_count: int = Field(nullable=False)
+    follow_up_count: int = Field(nullable=False)
+    churn_scored_count: int = Field(nullable=False)
+    churn_risk_sum: int = Field(nullable=False)
+
+
+class AnalysisRollupDailyDB(SQLModel, table=True):
+    __tablename__ = "analysis_rollup_daily"
+    __table_args__ = {"schema": "public"}
+
+    # Composite primary key: (bucket, agent_name, call_reason)
+    bucket: datetime = Field(primary_key=True, sa_type=DateTime(timezone=True), description="Gün başlangıcı (Europe/Istanbul)")
+    agent_name: str = Field(primary_key=True)
+    call_reason: str = Field(primary_key=True, description="Base analizi olmayan görüşmelerde boş string")
+    call_count: int = Field(nullable=False)
+    total_duration: float = Field(nullable=False)
+    analyzed_count: int = Field(nullable=False)
+    follow_up_count: int = Field(nullable=False)
+    churn_scored_count: int = Field(nullable=False)
+    churn_risk_sum: int = Field(nullable=False)
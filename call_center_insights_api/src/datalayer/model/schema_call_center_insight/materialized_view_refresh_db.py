@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import DateTime, text
+from sqlmodel import Field, SQLModel
+
+
+class MaterializedViewRefreshDB(SQLModel, table=True):
+    __tablename__ = "materialized_view_refresh"
+    __table_args__ = {"schema": "public"}
+
+    # Monoton artan view versiyonu (BIGSERIAL)
+    version: Optional[int] = Field(default=None, primary_key=True)
+    view_name: str = Field(nullable=False)
+    # V001'de TIMESTAMPTZ; aware datetime naive TIMESTAMP olarak bağlanırsa asyncpg hata verir
+    refreshed_at: datetime = Field(
+        nullable=False,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": text("now()")}
+    )
+    duration_ms: float = Field(nullable=False)
+    concurrent: bool = Field(nullable=False)
+    trigger: str = Field(nullable=False)
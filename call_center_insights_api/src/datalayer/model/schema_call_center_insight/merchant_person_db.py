@@ -1,4 +1,6 @@
 from datetime import datetime
+from typing import Optional
+from sqlalchemy import DateTime, text
 from sqlmodel import Field, SQLModel
 
 
@@ -9,4 +11,10 @@ class MerchantPersonDB(SQLModel, table=True):
     merchant_id: int = Field(primary_key=True, foreign_key="call_center_insight.merchant.merchant_id")
     merchant_person_state: int = Field(nullable=True)  # Fixed: database stores as integer
     merchant_person_name: str = Field(nullable=True)
-    merchant_person_phone: str = Field(nullable=True)
\ No newline at end of file
+    merchant_person_phone: str = Field(nullable=True)
+    # Trigger ile güncellenir (migrations/V004); telefon index'i watermark olarak merchant_person_xid'i (V009) kullanır
+    merchant_person_updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": text("now()")}
+    )
\ No newline at end of file
@@ -0,0 +1,50 @@
+import time
+from typing import Any, Dict
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Bağlantı alma sürelerini ölçen AsyncAdaptedQueuePool.
+    Havuz dolduğunda istekler sessizce beklemesin diye bekleme süresi ve timeout sayaçları tutulur;
+    ölçülen süre kuyrukta bekleme, yeni bağlantı açma ve pre-ping'i kapsar.
+    Sayaçlar havuz yeniden oluşturulduğunda (dispose) sıfırlanır.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+    
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self._timeouts += 1
+            raise
+        
+        waited = time.perf_counter() - started
+        self._checkouts += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        return connection
+    
+    def stats(self) -> Dict[str, Any]:
+        """Anlık havuz durumu ve başlangıçtan beri biriken sayaçlar"""
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "timeout_seconds": self._timeout,
+            "checkouts": self._checkouts,
+            "timeouts": self._timeouts,
+            "total_wait_ms": self._total_wait * 1000,
+            "avg_wait_ms": (self._total_wait / self._checkouts) * 1000 if self._checkouts else 0.0,
+            "max_wait_ms": self._max_wait * 1000,
+        }
@@ -0,0 +1,103 @@
+import heapq
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """
+    Bir isteğin çalıştırdığı SQL statement'larının sayacı.
+    Statement şekli, bind parametreli SQL metnidir; aynı metnin tekrar tekrar çalışması N+1 şüphesidir.
+    """
+    
+    # Saklanan en yavaş statement sayısı
+    SLOWEST_LIMIT = 5
+    
+    def __init__(self):
+        self.query_count = 0
+        self.total_ms = 0.0
+        self.slowest: List[Tuple[float, str]] = []
+        self.shapes: Counter = Counter()
+    
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.query_count += 1
+        self.total_ms += elapsed_ms
+        self.shapes[statement] += 1
+        
+        if len(self.slowest) < self.SLOWEST_LIMIT:
+            heapq.heappush(self.slowest, (elapsed_ms, statement))
+        elif elapsed_ms > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (elapsed_ms, statement))
+    
+    def slowest_statements(self) -> List[Tuple[float, str]]:
+        return sorted(self.slowest, reverse=True)
+    
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """threshold veya daha fazla kez çalışan statement şekilleri (N+1 şüphesi)"""
+        return [(statement, count) for statement, count in self.shapes.most_common() if count >= threshold]
+
+
+# Aktif isteğin sayacı; istek dışında (arka plan işleri, script'ler) None
+_current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def start_query_stats():
+    """Yeni bir sayaç başlatır; dönen token stop_query_stats'a verilir"""
+    return _current_query_stats.set(QueryStats())
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_query_stats.get()
+
+
+def stop_query_stats(token) -> Optional[QueryStats]:
+    """Sayacı bırakır ve son halini döndürür"""
+    stats = _current_query_stats.get()
+    _current_query_stats.reset(token)
+    return stats
+
+
+def shorten_statement(statement: str, length: int = 300) -> str:
+    """Log için statement'ı tek satıra indirip kısaltır"""
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= length else statement[:length] + "..."
+
+
+def install_query_instrumentation(engine: AsyncEngine, name: str) -> None:
+    """
+    Engine'e cursor execute event'lerini bağlar: her statement aktif isteğin sayacına yazılır,
+    SLOW_QUERY_MS'i aşan statement'lar istekten bağımsız olarak hemen loglanır.
+    """
+    slow_query_ms = Config().slow_query_ms
+    sync_engine = engine.sync_engine
+    
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+    
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+        
+        stats = _current_query_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed_ms)
+        
+        if slow_query_ms and elapsed_ms >= slow_query_ms:
+            logger.warning(f"⚠️ Slow query on {name} ({elapsed_ms:.1f} ms): {shorten_statement(statement)}")
+    
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        # Hata alan statement'ın başlangıç zamanı yığında kalmasın
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
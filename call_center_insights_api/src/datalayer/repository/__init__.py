@@ -33,6 +33,22 @@ from .merchant_contact_repository import (
     MerchantContactRepository,
 )
 
+from .materialized_view_refresh_repository import (
+    MaterializedViewRefreshRepository,
+)
+
+from .analysis_rollup_repository import (
+    AnalysisRollupRepository,
+)
+
+from .issue_analysis_result_repository import (
+    IssueAnalysisResultRepository,
+)
+
+from .merchant_complete_json_repository import (
+    MerchantCompleteJsonRepository,
+)
+
 # ---! Tüm repository'leri dışa aktarma listesi
 __all__ = [
     "BaseAnalysisResultRepository",
@@ -43,4 +59,8 @@ __all__ = [
     "MerchantTicketRepository",
     "TicketDetailsRepository",
     "MerchantContactRepository",
+    "MaterializedViewRefreshRepository",
+    "AnalysisRollupRepository",
+    "IssueAnalysisResultRepository",
+    "MerchantCompleteJsonRepository",
 ]
@@ -5,11 +5,13 @@ import asyncio
 from datetime import datetime
 
 # SQLAlchemy imports
-from sqlalchemy import select, update, delete, and_, or_
-from sqlalchemy.orm import Session, selectinload, joinedload
+from sqlalchemy import select, update, delete, and_, or_, insert, inspect, any_, bindparam
+from sqlalchemy.orm import Session, selectinload, joinedload, make_transient_to_detached
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.exc import NoResultFound, MultipleResultsFound
 from ._repository_abc import RepositoryABC, AsyncRepositoryABC
+from datalayer.statement_cache import statement_cache
 # Type variables
 T = TypeVar('T')
 PrimaryKeyType = Union[int, str]
@@ -128,6 +130,26 @@ class BaseRepository(RepositoryABC[T]):
 class AsyncBaseRepository(AsyncRepositoryABC[T]):
     """Asynchronous SQLAlchemy repository implementation"""
     
+    # Bulk insert'te tek bir çok satırlı INSERT ... RETURNING statement'ına giren en fazla satır
+    BULK_INSERT_BATCH_SIZE = 1000
+    # upsert_many'de tek INSERT ... ON CONFLICT statement'ına giren varsayılan satır sayısı
+    UPSERT_BATCH_SIZE = 1000
+    # Postgres wire protokolünün statement başına bind parametresi sınırı
+    MAX_BIND_PARAMS = 32767
+    # get_many_by'da tek = ANY($1) sorgusuna giren en fazla değer
+    GET_MANY_CHUNK_SIZE = 1000
+    # find_by'da {'op': ..., 'value': ...} ile kullanılabilen operatörler
+    FILTER_OPERATORS = {
+        'like': lambda attr, value: attr.like(value),
+        'ilike': lambda attr, value: attr.ilike(value),
+        'gt': lambda attr, value: attr > value,
+        'gte': lambda attr, value: attr >= value,
+        'lt': lambda attr, value: attr < value,
+        'lte': lambda attr, value: attr <= value,
+        'ne': lambda attr, value: attr != value,
+        'eq': lambda attr, value: attr == value,
+    }
+    
     def __init__(self, session: AsyncSession, model_class: type[T]):
         self.session = session
         self.model_class = model_class
@@ -148,37 +170,91 @@ class AsyncBaseRepository(AsyncRepositoryABC[T]):
         result = await self.session.execute(stmt)
         return result.scalars().all()
     
+    async def get_by_ids(self, ids: List[Any]) -> Dict[Any, T]:
+        """
+        Primary key listesi ile entity'leri toplu getirir; id -> entity sözlüğü döner.
+        Bulunamayan id'ler sözlükte yer almaz.
+        """
+        primary_key = inspect(self.model_class).primary_key
+        if len(primary_key) != 1:
+            raise ValueError(f"{self.model_class.__name__} has a composite primary key, use get_many_by")
+        
+        key = inspect(self.model_class).get_property_by_column(primary_key[0]).key
+        rows = await self.get_many_by(key, ids)
+        return {value: entities[0] for value, entities in rows.items()}
+    
+    async def get_many_by(self, column: str, values: List[Any]) -> Dict[Any, List[T]]:
+        """
+        column = ANY($1) ile değer listesine uyan entity'leri chunk'lar halinde getirir.
+        Değer -> entity listesi sözlüğü döner. Liste tek bir array parametresi olarak gittiği için
+        sorgu metni değer sayısından bağımsızdır ve prepared statement cache'inde tek kayıt tutar.
+        """
+        attr = getattr(self.model_class, column)
+        values = list(dict.fromkeys(value for value in values if value is not None))
+        
+        stmt = select(self.model_class).where(
+            attr == any_(bindparam("values", type_=ARRAY(attr.type)))
+        )
+        
+        rows: Dict[Any, List[T]] = {}
+        for start in range(0, len(values), self.GET_MANY_CHUNK_SIZE):
+            chunk = values[start:start + self.GET_MANY_CHUNK_SIZE]
+            result = await self.session.execute(stmt, {"values": chunk})
+            for entity in result.scalars():
+                rows.setdefault(getattr(entity, column), []).append(entity)
+        
+        return rows
+    
     async def find_by(self, **filters) -> List[T]:
-        """Find entities by filter criteria"""
-        stmt = select(self.model_class)
+        """
+        Find entities by filter criteria.
+        Statement filtre şekline (anahtar + operatör) göre önbelleğe alınır, değerler bind parametresi olarak gider.
+        """
+        shape = []
+        params = {}
         for key, value in filters.items():
             if hasattr(self.model_class, key):
                 if isinstance(value, (list, tuple)):
-                    stmt = stmt.where(getattr(self.model_class, key).in_(value))
+                    # Liste tek array parametresi olarak gider; uzunluğu şekli değiştirmez
+                    shape.append((key, 'in'))
+                    params[f"filter_{key}"] = list(value)
                 elif isinstance(value, dict) and 'op' in value:
                     # Support for complex operations
-                    op = value['op']
-                    val = value['value']
-                    attr = getattr(self.model_class, key)
-                    if op == 'like':
-                        stmt = stmt.where(attr.like(val))
-                    elif op == 'ilike':
-                        stmt = stmt.where(attr.ilike(val))
-                    elif op == 'gt':
-                        stmt = stmt.where(attr > val)
-                    elif op == 'gte':
-                        stmt = stmt.where(attr >= val)
-                    elif op == 'lt':
-                        stmt = stmt.where(attr < val)
-                    elif op == 'lte':
-                        stmt = stmt.where(attr <= val)
-                    elif op == 'ne':
-                        stmt = stmt.where(attr != val)
+                    if value['op'] == 'ne' and value['value'] is None:
+                        shape.append((key, 'is_not_null'))
+                    elif value['op'] in self.FILTER_OPERATORS:
+                        shape.append((key, value['op']))
+                        params[f"filter_{key}"] = value['value']
+                elif value is None:
+                    # = NULL hiçbir satırla eşleşmez; IS NULL parametresiz ayrı bir şekil olarak kurulur
+                    shape.append((key, 'is_null'))
                 else:
-                    stmt = stmt.where(getattr(self.model_class, key) == value)
-        result = await self.session.execute(stmt)
+                    shape.append((key, 'eq'))
+                    params[f"filter_{key}"] = value
+        
+        shape = tuple(shape)
+        stmt = statement_cache.get_or_build(
+            (self.model_class.__name__, "find_by", shape),
+            lambda: select(self.model_class).where(*self._filter_clauses(shape))
+        )
+        result = await self.session.execute(stmt, params)
         return result.scalars().all()
     
+    def _filter_clauses(self, shape: tuple) -> List[Any]:
+        """find_by filtre şeklindeki her (anahtar, operatör) için bindparam'lı WHERE koşulunu kurar"""
+        clauses = []
+        for key, op in shape:
+            attr = getattr(self.model_class, key)
+            if op == 'in':
+                clauses.append(attr == any_(bindparam(f"filter_{key}", type_=ARRAY(attr.type))))
+            elif op == 'is_null':
+                clauses.append(attr.is_(None))
+            elif op == 'is_not_null':
+                clauses.append(attr.is_not(None))
+            else:
+                clauses.append(self.FILTER_OPERATORS[op](attr, bindparam(f"filter_{key}", type_=attr.type)))
+        return clauses
+    
     async def find_one_by(self, **filters) -> Optional[T]:
         """Find single entity by filter criteria"""
         results = await self.find_by(**filters)
@@ -194,13 +270,122 @@ class AsyncBaseRepository(AsyncRepositoryABC[T]):
         return entity
     
     async def save_all(self, entities: List[T]) -> List[T]:
-        """Save multiple entities"""
-        self.session.add_all(entities)
-        await self.session.flush()
-        for entity in entities:
-            await self.session.refresh(entity)
+        """
+        Save multiple entities.
+        Yeni (transient) entity'ler çok satırlı INSERT ... RETURNING ile BULK_INSERT_BATCH_SIZE'lık
+        parçalar halinde yazılır; üretilen alanlar satır başına refresh yapılmadan gelir.
+        RETURNING değerleri verilen entity'lerin üzerine yazılır ve entity'ler session'a persistent olarak
+        bağlanır; yani çağıran kendi nesnelerini kullanmaya devam eder.
+        Session'a zaten bağlı entity'ler (update) için flush + refresh kullanılır.
+        """
+        new_entities = [entity for entity in entities if inspect(entity).transient]
+        existing_entities = [entity for entity in entities if not inspect(entity).transient]
+        
+        column_keys = [column_attr.key for column_attr in inspect(self.model_class).column_attrs]
+        stmt = insert(self.model_class).returning(
+            *[getattr(self.model_class, key) for key in column_keys],
+            sort_by_parameter_order=True
+        )
+        for start in range(0, len(new_entities), self.BULK_INSERT_BATCH_SIZE):
+            batch = new_entities[start:start + self.BULK_INSERT_BATCH_SIZE]
+            result = await self.session.execute(stmt, [self._to_insert_row(entity) for entity in batch])
+            for entity, row in zip(batch, result.all()):
+                for key, value in zip(column_keys, row):
+                    setattr(entity, key, value)
+                # Satır zaten yazıldı; entity INSERT edilmeden detached yapılıp session'a persistent olarak eklenir
+                make_transient_to_detached(entity)
+                self.session.add(entity)
+        
+        if existing_entities:
+            self.session.add_all(existing_entities)
+            await self.session.flush()
+            for entity in existing_entities:
+                await self.session.refresh(entity)
+        
         return entities
     
+    async def upsert_many(
+        self,
+        entities: List[T],
+        conflict_keys: List[str],
+        update_columns: Optional[List[str]] = None,
+        batch_size: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Entity'leri batch'ler halinde INSERT ... ON CONFLICT (conflict_keys) ile yazar.
+        conflict_keys ve update_columns ORM attribute adlarıdır.
+        update_columns None ise conflict key dışındaki tüm yazılan kolonlar güncellenir (DO UPDATE),
+        boş liste ise mevcut satırlara dokunulmaz (DO NOTHING).
+        Eklenen veya güncellenen satırların conflict key değerlerini döndürür; tek key'de skaler,
+        birden fazla key'de tuple. DO NOTHING ile atlanan satırlar listede yer almaz.
+        """
+        if not entities:
+            return []
+        
+        table = self.model_class.__table__
+        # pg_insert tablo kolon adlarıyla çalışır; ORM attribute adı kolon adından farklı olabilir
+        # (örn. MerchantTicketDB.merchant_ticket_id -> mercant_ticket_id)
+        column_names = {
+            column_attr.key: column_attr.columns[0].name
+            for column_attr in inspect(self.model_class).column_attrs
+        }
+        rows = {}
+        for entity in entities:
+            row = {key: getattr(entity, key) for key in column_names}
+            # Aynı statement'ta aynı key iki kez olursa ON CONFLICT hata verir; son gelen kazanır
+            rows[tuple(row[key] for key in conflict_keys)] = row
+        rows = list(rows.values())
+        
+        # Kolon listesi tüm batch'ler için bir kez belirlenir: sadece server default'lu (veya PK) ve
+        # hiçbir satırda değeri olmayan kolonlar atlanır; böylece None her batch'te aynı şekilde yazılır
+        server_generated = {
+            column_attr.key
+            for column_attr in inspect(self.model_class).column_attrs
+            if any(column.primary_key or column.server_default is not None for column in column_attr.columns)
+        }
+        insert_keys = [
+            key for key in column_names
+            if key in conflict_keys or key not in server_generated or any(row[key] is not None for row in rows)
+        ]
+        if update_columns is None:
+            update_columns = [key for key in insert_keys if key not in conflict_keys]
+        
+        # Satır başına kolon sayısı kadar parametre gider; batch Postgres sınırını aşmamalı
+        batch_size = min(batch_size or self.UPSERT_BATCH_SIZE, self.MAX_BIND_PARAMS // len(insert_keys))
+        conflict_columns = [column_names[key] for key in conflict_keys]
+        
+        affected = []
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            stmt = pg_insert(table).values([{column_names[key]: row[key] for key in insert_keys} for row in batch])
+            
+            if update_columns:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=conflict_columns,
+                    set_={column_names[key]: stmt.excluded[column_names[key]] for key in update_columns}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+            
+            stmt = stmt.returning(*[table.c[name] for name in conflict_columns])
+            result = await self.session.execute(stmt)
+            affected.extend(row[0] if len(conflict_keys) == 1 else tuple(row) for row in result.all())
+        
+        return affected
+    
+    def _to_insert_row(self, entity: T) -> Dict[str, Any]:
+        """
+        Entity'nin kolon değerlerini INSERT parametresine çevirir.
+        None olan primary key ve server default'lu kolonlar atlanır ki veritabanı üretsin.
+        """
+        row = {}
+        for column_attr in inspect(self.model_class).column_attrs:
+            value = getattr(entity, column_attr.key)
+            if value is None and any(column.primary_key or column.server_default is not None for column in column_attr.columns):
+                continue
+            row[column_attr.key] = value
+        return row
+    
     async def delete(self, entity: T) -> None:
         """Delete entity"""
         await self.session.delete(entity)
@@ -0,0 +1,23 @@
+import base64
+import binascii
+import json
+from typing import Any, List
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Keyset pagination değerlerini opak (base64url) bir cursor string'ine dönüştürür"""
+    payload = json.dumps(values, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Opak cursor string'ini keyset değerlerine çözer, geçersizse ValueError fırlatır"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Geçersiz cursor: {cursor}") from e
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"Geçersiz cursor: {cursor}")
+    return values
@@ -1,9 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, text, tuple_, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.future import select
 from uuid import UUID
-from typing import Optional, List
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, List, Tuple
 from datalayer.model.schema_call_center_insight.all_result_view_db import AllResultViewDB
+from datalayer.statement_cache import statement_cache
 
+import json
 import logging
 logger = logging.getLogger(__name__)
 
@@ -13,6 +18,35 @@ class AllResultViewRepository:
     Bu bir view olduğu için sadece SELECT işlemleri desteklenir.
     """
     
+    # Export sırasında server-side cursor'dan tek seferde çekilen satır sayısı
+    STREAM_BATCH_SIZE = 1000
+    # get_by_call_ids'de tek = ANY($1) sorgusuna giren en fazla call_id
+    GET_MANY_CHUNK_SIZE = 1000
+    
+    # Filtre anahtarı -> (view kolonu, operatör); değerler bind parametresi olarak verilir
+    FILTER_OPERATORS = {
+        'agent_name': ('call_agent_name', 'contains'),
+        'phone_number': ('call_phone_number', 'eq'),
+        'follow_up_required': ('base_analysis_call_requires_followup', 'eq'),
+        'reason_contains': ('base_analysis_reason', 'contains'),
+        'created_at_from': ('call_created_at', 'gte'),
+        'created_at_to': ('call_created_at', 'lte'),
+        'duration_min': ('call_duration', 'gte'),
+        'duration_max': ('call_duration', 'lte'),
+        'agent_speech_rate_min': ('call_agent_speech_rate', 'gte'),
+        'agent_speech_rate_max': ('call_agent_speech_rate', 'lte'),
+        'customer_speech_rate_min': ('call_customer_speech_rate', 'gte'),
+        'customer_speech_rate_max': ('call_customer_speech_rate', 'lte'),
+        'silence_rate_min': ('call_silence_rate', 'gte'),
+        'silence_rate_max': ('call_silence_rate', 'lte'),
+        'cross_talk_rate_min': ('call_cross_talk_rate', 'gte'),
+        'cross_talk_rate_max': ('call_cross_talk_rate', 'lte'),
+        'agent_interrupt_count_min': ('call_agent_interrupt_count', 'gte'),
+        'agent_interrupt_count_max': ('call_agent_interrupt_count', 'lte'),
+        'churn_risk_min': ('issue_analysis_churn_risk', 'gte'),
+        'churn_risk_max': ('issue_analysis_churn_risk', 'lte'),
+    }
+    
     def __init__(self, session: AsyncSession):
         self.session = session
         self.model_class = AllResultViewDB
@@ -35,6 +69,21 @@ class AllResultViewRepository:
             
         return db_model
 
+    async def get_by_call_ids(self, call_ids: List[UUID]) -> Dict[UUID, AllResultViewDB]:
+        """call_id listesi ile view kayıtlarını toplu getirir; call_id -> kayıt sözlüğü döner"""
+        call_ids = list(dict.fromkeys(call_ids))
+        stmt = select(self.model_class).where(
+            self.model_class.call_id == any_(bindparam("call_ids", type_=ARRAY(self.model_class.call_id.type)))
+        )
+        
+        rows = {}
+        for start in range(0, len(call_ids), self.GET_MANY_CHUNK_SIZE):
+            result = await self.session.execute(stmt, {"call_ids": call_ids[start:start + self.GET_MANY_CHUNK_SIZE]})
+            rows.update((db_model.call_id, db_model) for db_model in result.scalars())
+        
+        logger.info(f"✅ {len(rows)}/{len(call_ids)} analysis result view kaydı bulundu")
+        return rows
+
     async def get_all(self, limit: Optional[int] = None, offset: Optional[int] = None) -> List[AllResultViewDB]:
         """Tüm analysis result view kayıtlarını getirir"""
         logger.info(f"🚀 Getting all analysis result view records with limit: {limit}, offset: {offset}")
@@ -55,88 +104,277 @@ class AllResultViewRepository:
         """Custom filtering methods for analysis results"""
         logger.info(f"🚀 Filtering analysis results with filters: {filters}")
         
-        stmt = select(self.model_class)
-        stmt = self._apply_filters(stmt, filters)
+        stmt, params = self._cached_statement(
+            ("by_filter",), filters,
+            lambda clauses: select(self.model_class).where(*clauses)
+        )
         
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(stmt, params)
         results = result.scalars().all()
         
         logger.info(f"✅ Found {len(results)} analysis result view records matching filters")
         return results
 
+    async def get_page(
+        self,
+        limit: int,
+        cursor: Optional[Tuple[datetime, UUID]] = None,
+        offset: Optional[int] = None,
+        with_total: bool = False,
+        columns: Optional[List[str]] = None,
+        **filters
+    ) -> Tuple[List[Any], Optional[int]]:
+        """
+        Filtrelenmiş sayfayı SQL tarafında (call_created_at, call_id) sırasıyla getirir.
+        cursor verilirse keyset pagination uygulanır ve offset yok sayılır.
+        with_total=True ise aynı filtrelerle toplam sayı, sayfa sorgusuna skaler alt sorgu
+        olarak eklenir ve tek round trip'te döner (sayfa boşsa None döner).
+        columns verilirse sadece bu kolonlar seçilir ve AllResultViewDB yerine Row listesi döner;
+        keyset kolonları (call_created_at, call_id) her zaman seçime eklenir.
+        """
+        logger.info(f"🚀 Getting analysis result page with limit: {limit}, cursor: {cursor}, offset: {offset}, columns: {columns}, filters: {filters}")
+        
+        def build(clauses):
+            if columns:
+                keyset_columns = ["call_created_at", "call_id"]
+                selected = [getattr(self.model_class, column) for column in dict.fromkeys([*columns, *keyset_columns])]
+            else:
+                selected = [self.model_class]
+            
+            if with_total:
+                total_stmt = select(func.count(self.model_class.call_id)).where(*clauses)
+                # correlate(None): alt sorgu dış sorguya bağlanmaz, Postgres onu bir kez (InitPlan) çalıştırır
+                selected.append(total_stmt.correlate(None).scalar_subquery().label("total_count"))
+            
+            stmt = select(*selected).where(*clauses)
+            
+            if cursor:
+                stmt = stmt.where(
+                    tuple_(self.model_class.call_created_at, self.model_class.call_id) > tuple_(
+                        bindparam("cursor_created_at", type_=self.model_class.call_created_at.type),
+                        bindparam("cursor_call_id", type_=self.model_class.call_id.type),
+                    )
+                )
+            elif offset:
+                stmt = stmt.offset(bindparam("offset", type_=Integer))
+            
+            return stmt.order_by(self.model_class.call_created_at, self.model_class.call_id).limit(
+                bindparam("limit", type_=Integer)
+            )
+        
+        stmt, params = self._cached_statement(
+            ("page", tuple(columns or ()), with_total, cursor is not None, bool(offset) and cursor is None),
+            filters, build
+        )
+        params["limit"] = limit
+        if cursor:
+            params["cursor_created_at"], params["cursor_call_id"] = cursor
+        elif offset:
+            params["offset"] = offset
+        
+        result = await self.session.execute(stmt, params)
+        rows = result.all()
+        results = rows if columns else [row[0] for row in rows]
+        total = rows[0].total_count if with_total and rows else None
+        
+        logger.info(f"✅ Found {len(results)} analysis result view records for page, total: {total}")
+        return results, total
+
+    async def stream_by_filter(self, columns: List[str], **filters) -> AsyncIterator[List[Any]]:
+        """
+        Filtreye uyan satırları server-side cursor ile (call_created_at, call_id) sırasında
+        STREAM_BATCH_SIZE'lık parçalar halinde döndürür; bellek kullanımı sonuç boyutundan bağımsızdır.
+        """
+        logger.info(f"🚀 Streaming analysis result view records with columns: {columns}, filters: {filters}")
+        
+        stmt, params = self._cached_statement(
+            ("stream", tuple(columns)), filters,
+            lambda clauses: select(*[getattr(self.model_class, column) for column in columns])
+            .where(*clauses)
+            .order_by(self.model_class.call_created_at, self.model_class.call_id)
+            .execution_options(yield_per=self.STREAM_BATCH_SIZE)
+        )
+        
+        result = await self.session.stream(stmt, params)
+        streamed = 0
+        async for partition in result.partitions():
+            streamed += len(partition)
+            yield partition
+        
+        logger.info(f"✅ Streamed {streamed} analysis result view records")
+
+    async def get_agent_stats(self, **filters) -> List[Any]:
+        """
+        Filtreye uyan görüşmeleri call_agent_name'e göre GROUP BY ile toplar.
+        Her satır: agent_name, call_count, avg_duration, avg_silence_rate, avg_cross_talk_rate,
+        avg_agent_interrupt_count, total_agent_interrupt_count.
+        """
+        logger.info(f"🚀 Aggregating agent stats with filters: {filters}")
+        
+        stmt, params = self._cached_statement(
+            ("agent_stats",), filters,
+            lambda clauses: select(
+                self.model_class.call_agent_name.label("agent_name"),
+                func.count(self.model_class.call_id).label("call_count"),
+                func.avg(self.model_class.call_duration).label("avg_duration"),
+                func.avg(self.model_class.call_silence_rate).label("avg_silence_rate"),
+                func.avg(self.model_class.call_cross_talk_rate).label("avg_cross_talk_rate"),
+                func.avg(self.model_class.call_agent_interrupt_count).label("avg_agent_interrupt_count"),
+                func.coalesce(func.sum(self.model_class.call_agent_interrupt_count), 0).label("total_agent_interrupt_count"),
+            )
+            .where(*clauses)
+            .group_by(self.model_class.call_agent_name)
+            .order_by(self.model_class.call_agent_name)
+        )
+        
+        result = await self.session.execute(stmt, params)
+        rows = result.all()
+        
+        logger.info(f"✅ Aggregated stats for {len(rows)} agents")
+        return rows
+
+    async def get_agent_churn_distribution(self, **filters) -> List[Any]:
+        """
+        Filtreye uyan görüşmeleri (call_agent_name, issue_analysis_churn_risk) çiftine göre sayar.
+        Her satır: agent_name, churn_risk (issue analizi yoksa None), call_count.
+        """
+        logger.info(f"🚀 Aggregating agent churn risk distribution with filters: {filters}")
+        
+        stmt, params = self._cached_statement(
+            ("agent_churn_distribution",), filters,
+            lambda clauses: select(
+                self.model_class.call_agent_name.label("agent_name"),
+                self.model_class.issue_analysis_churn_risk.label("churn_risk"),
+                func.count(self.model_class.call_id).label("call_count"),
+            )
+            .where(*clauses)
+            .group_by(self.model_class.call_agent_name, self.model_class.issue_analysis_churn_risk)
+        )
+        
+        result = await self.session.execute(stmt, params)
+        rows = result.all()
+        
+        logger.info(f"✅ Found {len(rows)} agent churn risk groups")
+        return rows
+
+    async def estimate_count(self, **filters) -> int:
+        """
+        Planner istatistiklerinden tahmini kayıt sayısı döndürür.
+        Filtre yoksa pg_class.reltuples, varsa EXPLAIN satır tahmini kullanılır.
+        """
+        logger.info(f"🚀 Estimating entity count with filters: {filters}")
+        
+        if not filters:
+            result = await self.session.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:relation AS regclass)"),
+                {"relation": self._relation_name()}
+            )
+            estimate = result.scalar()
+            # reltuples hiç ANALYZE edilmemiş tabloda -1 döner
+            if estimate is None or estimate < 0:
+                logger.warning("⚠️ No planner statistics for analysis result view, falling back to exact count")
+                return await self.count()
+        else:
+            stmt = self._apply_filters(select(self.model_class.call_id), filters)
+            plan = await self._explain(stmt)
+            estimate = int(plan["Plan"]["Plan Rows"])
+        
+        logger.debug(f"✅ Estimated entity count: {estimate}")
+        return estimate
+
+    async def _explain(self, stmt) -> Dict[str, Any]:
+        """Statement'ı çalıştırmadan EXPLAIN (FORMAT JSON) planını döndürür"""
+        # EXPLAIN bind parametresi almadığı için değerler SQLAlchemy tarafından kaçışlanarak gömülür
+        compiled = stmt.compile(
+            dialect=self.session.bind.dialect,
+            compile_kwargs={"literal_binds": True}
+        )
+        connection = await self.session.connection()
+        result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]
+
+    def _relation_name(self) -> str:
+        table = self.model_class.__table__
+        return f"{table.schema}.{table.name}" if table.schema else table.name
+
     def _apply_filters(self, stmt, filters):
-        """Apply all filter conditions to the statement"""
-        from datetime import datetime
+        """Apply all filter conditions to the statement, with the filter values bound in place"""
+        shape, params = self._filter_params(filters)
+        return stmt.where(*self._filter_clauses(shape)).params(params)
+
+    def _cached_statement(self, kind: Tuple, filters: Dict[str, Any], build) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Filtre şekli (kind + filtre anahtarları) için statement'ı cache'ten alır, yoksa
+        build(clauses) ile kurar. Filtre değerleri, execute'a verilecek parametre sözlüğü olarak döner.
+        """
+        shape, params = self._filter_params(filters)
+        stmt = statement_cache.get_or_build(
+            (self.__class__.__name__, *kind, shape),
+            lambda: build(self._filter_clauses(shape))
+        )
+        return stmt, params
+
+    def _filter_params(self, filters: Dict[str, Any]) -> Tuple[Tuple[str, ...], Dict[str, Any]]:
+        """
+        Filtre sözlüğünü (şekil, bind değerleri) çiftine çevirir.
+        Şekil, uygulanan filtre anahtarlarının sıralı listesidir; geçersiz tarih ve bilinmeyen alanlar atlanır.
+        """
+        params = {}
         
         for key, value in filters.items():
-            if value is not None:
-                if key == 'agent_name':
-                    stmt = stmt.where(self.model_class.call_agent_name.ilike(f"%{value}%"))
-                elif key == 'phone_number':
-                    stmt = stmt.where(self.model_class.call_phone_number == value)
-                elif key == 'follow_up_required':
-                    stmt = stmt.where(self.model_class.base_analysis_call_requires_followup == value)
-                elif key == 'reason_contains':
-                    stmt = stmt.where(self.model_class.base_analysis_reason.ilike(f"%{value}%"))
-                
-                # Date range filters
-                elif key == 'created_at_from':
-                    try:
-                        if 'T' not in value and ' ' not in value:
-                            # If only date provided, add start of day
-                            value += ' 00:00:00'
-                        date_from = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                        stmt = stmt.where(self.model_class.call_created_at >= date_from)
-                    except ValueError as e:
-                        logger.warning(f"⚠️ Invalid created_at_from date format: {value}, error: {e}")
-                elif key == 'created_at_to':
-                    try:
-                        if 'T' not in value and ' ' not in value:
-                            # If only date provided, add end of day
-                            value += ' 23:59:59'
-                        date_to = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                        stmt = stmt.where(self.model_class.call_created_at <= date_to)
-                    except ValueError as e:
-                        logger.warning(f"⚠️ Invalid created_at_to date format: {value}, error: {e}")
-                
-                # Numeric range filters
-                elif key == 'duration_min':
-                    stmt = stmt.where(self.model_class.call_duration >= value)
-                elif key == 'duration_max':
-                    stmt = stmt.where(self.model_class.call_duration <= value)
-                elif key == 'agent_speech_rate_min':
-                    stmt = stmt.where(self.model_class.call_agent_speech_rate >= value)
-                elif key == 'agent_speech_rate_max':
-                    stmt = stmt.where(self.model_class.call_agent_speech_rate <= value)
-                elif key == 'customer_speech_rate_min':
-                    stmt = stmt.where(self.model_class.call_customer_speech_rate >= value)
-                elif key == 'customer_speech_rate_max':
-                    stmt = stmt.where(self.model_class.call_customer_speech_rate <= value)
-                elif key == 'silence_rate_min':
-                    stmt = stmt.where(self.model_class.call_silence_rate >= value)
-                elif key == 'silence_rate_max':
-                    stmt = stmt.where(self.model_class.call_silence_rate <= value)
-                elif key == 'cross_talk_rate_min':
-                    stmt = stmt.where(self.model_class.call_cross_talk_rate >= value)
-                elif key == 'cross_talk_rate_max':
-                    stmt = stmt.where(self.model_class.call_cross_talk_rate <= value)
-                elif key == 'agent_interrupt_count_min':
-                    stmt = stmt.where(self.model_class.call_agent_interrupt_count >= value)
-                elif key == 'agent_interrupt_count_max':
-                    stmt = stmt.where(self.model_class.call_agent_interrupt_count <= value)
-                elif key == 'churn_risk_min':
-                    stmt = stmt.where(self.model_class.issue_analysis_churn_risk >= value)
-                elif key == 'churn_risk_max':
-                    stmt = stmt.where(self.model_class.issue_analysis_churn_risk <= value)
-                
-                else:
-                    # Only use hasattr for unknown fields
-                    if hasattr(self.model_class, key):
-                        stmt = stmt.where(getattr(self.model_class, key) == value)
-                    else:
-                        logger.warning(f"⚠️ Unknown filter field: {key}")
-        
-        return stmt
+            if value is None:
+                continue
+            
+            if key in self.FILTER_OPERATORS:
+                operator = self.FILTER_OPERATORS[key][1]
+                if operator == 'contains':
+                    value = f"%{value}%"
+                elif key == 'created_at_from' or key == 'created_at_to':
+                    value = self._parse_date_filter(key, value)
+                    if value is None:
+                        continue
+            elif not hasattr(self.model_class, key):
+                # Only use hasattr for unknown fields
+                logger.warning(f"⚠️ Unknown filter field: {key}")
+                continue
+            
+            params[f"filter_{key}"] = value
+        
+        shape = tuple(sorted(param[len("filter_"):] for param in params))
+        return shape, params
+
+    def _filter_clauses(self, shape: Tuple[str, ...]) -> List[Any]:
+        """Filtre şeklindeki her anahtar için bindparam'lı WHERE koşulunu kurar"""
+        clauses = []
+        
+        for key in shape:
+            column_name, operator = self.FILTER_OPERATORS.get(key, (key, 'eq'))
+            column = getattr(self.model_class, column_name)
+            value = bindparam(f"filter_{key}", type_=column.type)
+            
+            if operator == 'contains':
+                clauses.append(column.ilike(value))
+            elif operator == 'gte':
+                clauses.append(column >= value)
+            elif operator == 'lte':
+                clauses.append(column <= value)
+            else:
+                clauses.append(column == value)
+        
+        return clauses
+
+    def _parse_date_filter(self, key: str, value: str) -> Optional[datetime]:
+        """created_at_from/created_at_to değerini datetime'a çevirir; sadece tarih verilirse günün başı/sonu alınır"""
+        try:
+            if 'T' not in value and ' ' not in value:
+                value += ' 00:00:00' if key == 'created_at_from' else ' 23:59:59'
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError as e:
+            logger.warning(f"⚠️ Invalid {key} date format: {value}, error: {e}")
+            return None
 
     async def exists(self, call_id: UUID) -> bool:
         """Check if entity exists by call_id"""
@@ -156,10 +394,12 @@ class AllResultViewRepository:
         
         logger.info(f"🚀 Counting entities with filters: {filters}")
         
-        stmt = select(func.count(self.model_class.call_id))
-        stmt = self._apply_filters(stmt, filters)
+        stmt, params = self._cached_statement(
+            ("count",), filters,
+            lambda clauses: select(func.count(self.model_class.call_id)).where(*clauses)
+        )
         
-        result = await self.session.execute(stmt)
+        result = await self.session.execute(stmt, params)
         count = result.scalar()
         
         logger.debug(f"✅ Entity count: {count}")
@@ -0,0 +1,66 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func
+from sqlalchemy.future import select
+from datetime import datetime
+from typing import Any, List, Optional
+from datalayer.model.schema_call_center_insight.analysis_rollup_db import AnalysisRollupHourlyDB, AnalysisRollupDailyDB
+
+import logging
+logger = logging.getLogger(__name__)
+
+class AnalysisRollupRepository:
+    """
+    Read-only repository for analysis rollup tables.
+    Rollup'lar ingestion script'leri tarafından public.refresh_analysis_rollups ile güncellenir.
+    """
+    
+    GRANULARITY_MODELS = {
+        "hour": AnalysisRollupHourlyDB,
+        "day": AnalysisRollupDailyDB,
+    }
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def get_timeseries(
+        self,
+        granularity: str,
+        bucket_from: Optional[datetime] = None,
+        bucket_to: Optional[datetime] = None,
+        agent_name: Optional[str] = None,
+        call_reason: Optional[str] = None
+    ) -> List[Any]:
+        """
+        Rollup satırlarını bucket'a göre toplar; ham görüşme verisi okunmaz.
+        Her satır: bucket, call_count, total_duration, analyzed_count, follow_up_count,
+        churn_scored_count, churn_risk_sum.
+        """
+        logger.info(f"🚀 Getting {granularity} timeseries from: {bucket_from}, to: {bucket_to}, agent: {agent_name}, reason: {call_reason}")
+        
+        model_class = self.GRANULARITY_MODELS[granularity]
+        stmt = select(
+            model_class.bucket,
+            func.sum(model_class.call_count).label("call_count"),
+            func.sum(model_class.total_duration).label("total_duration"),
+            func.sum(model_class.analyzed_count).label("analyzed_count"),
+            func.sum(model_class.follow_up_count).label("follow_up_count"),
+            func.sum(model_class.churn_scored_count).label("churn_scored_count"),
+            func.sum(model_class.churn_risk_sum).label("churn_risk_sum"),
+        )
+        
+        if bucket_from:
+            stmt = stmt.where(model_class.bucket >= bucket_from)
+        if bucket_to:
+            stmt = stmt.where(model_class.bucket <= bucket_to)
+        if agent_name:
+            stmt = stmt.where(model_class.agent_name == agent_name)
+        if call_reason is not None:
+            stmt = stmt.where(model_class.call_reason == call_reason)
+        
+        stmt = stmt.group_by(model_class.bucket).order_by(model_class.bucket)
+        
+        result = await self.session.execute(stmt)
+        rows = result.all()
+        
+        logger.info(f"✅ Found {len(rows)} {granularity} timeseries buckets")
+        return rows
@@ -0,0 +1,50 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from uuid import UUID
+from typing import Optional
+from datalayer import IssueAnalysisResultDB
+from datalayer.repository._base_repository import AsyncBaseRepository
+
+import logging
+logger = logging.getLogger(__name__)
+
+class IssueAnalysisResultRepository(AsyncBaseRepository[IssueAnalysisResultDB]):
+    """Repository for IssueAnalysisResult model"""
+    
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, IssueAnalysisResultDB)
+    
+    async def get_by_id(self, issue_analysis_id: UUID) -> Optional[IssueAnalysisResultDB]:
+        """Primary key (issue_analysis_id) ile issue analysis result getirir"""
+        logger.info(f"Veritabanında issue_analysis_id ile sorgu: {issue_analysis_id}, tip: {type(issue_analysis_id)}")
+        
+        result = await self.session.execute(
+            select(self.model_class).where(self.model_class.issue_analysis_id == issue_analysis_id)
+        )
+        db_model = result.scalar_one_or_none()
+        
+        if db_model:
+            logger.info(f"Bulunan issue kayıt issue_analysis_id: {db_model.issue_analysis_id}")
+        else:
+            logger.warning(f"Issue kayıt bulunamadı issue_analysis_id: {issue_analysis_id}")
+            
+        return db_model
+
+    async def exists(self, issue_analysis_id: UUID) -> bool:
+        """Check if entity exists by issue_analysis_id"""
+        result = await self.session.execute(
+            select(1).where(self.model_class.issue_analysis_id == issue_analysis_id)
+        )
+        return result.scalar() is not None
+
+    async def count(self, **filters) -> int:
+        """Count entities with optional filters using issue_analysis_id"""
+        from sqlalchemy import func
+        
+        stmt = select(func.count(self.model_class.issue_analysis_id))
+        for key, value in filters.items():
+            if hasattr(self.model_class, key):
+                stmt = stmt.where(getattr(self.model_class, key) == value)
+        
+        result = await self.session.execute(stmt)
+        return result.scalar()
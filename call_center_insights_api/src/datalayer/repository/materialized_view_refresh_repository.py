@@ -0,0 +1,62 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from typing import Optional
+from datalayer.model.schema_call_center_insight import MaterializedViewRefreshDB
+from datalayer.repository._base_repository import AsyncBaseRepository
+
+import logging
+logger = logging.getLogger(__name__)
+
+class MaterializedViewRefreshRepository(AsyncBaseRepository[MaterializedViewRefreshDB]):
+    """Repository for materialized view refresh log (view version history)"""
+    
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, MaterializedViewRefreshDB)
+    
+    async def try_lock(self, view_name: str) -> bool:
+        """
+        View için transaction süresince geçerli advisory lock almaya çalışır.
+        Ingestion script'leri de aynı lock'u kullandığı için aynı anda tek refresh çalışır.
+        """
+        result = await self.session.execute(
+            text("SELECT pg_try_advisory_xact_lock(hashtext(:view_name))"),
+            {"view_name": view_name}
+        )
+        locked = bool(result.scalar())
+        
+        logger.debug(f"Advisory lock for {view_name}: {locked}")
+        return locked
+    
+    async def refresh_view(self, view_name: str, concurrently: bool = True) -> None:
+        """
+        REFRESH MATERIALIZED VIEW çalıştırır.
+        view_name identifier olarak gömüldüğü için sadece servis katmanındaki izinli listeden gelmelidir.
+        """
+        logger.info(f"🚀 Refreshing materialized view: {view_name}, concurrently: {concurrently}")
+        
+        keyword = "CONCURRENTLY " if concurrently else ""
+        # Refresh API isteklerinin statement_timeout'una tabi değil; sadece bu transaction için kapatılır
+        await self.session.execute(text("SET LOCAL statement_timeout = 0"))
+        await self.session.execute(text(f"REFRESH MATERIALIZED VIEW {keyword}{view_name}"))
+        
+        logger.info(f"✅ Materialized view refreshed: {view_name}")
+    
+    async def get_latest(self, view_name: str) -> Optional[MaterializedViewRefreshDB]:
+        """View'ın en son refresh kaydını (güncel versiyon) getirir"""
+        logger.info(f"Veritabanında view_name ile son refresh sorgusu: {view_name}")
+        
+        result = await self.session.execute(
+            select(self.model_class)
+            .where(self.model_class.view_name == view_name)
+            .order_by(self.model_class.version.desc())
+            .limit(1)
+        )
+        db_model = result.scalar_one_or_none()
+        
+        if db_model:
+            logger.info(f"Bulunan view versiyonu {view_name}: {db_model.version}")
+        else:
+            logger.warning(f"View için refresh kaydı bulunamadı: {view_name}")
+            
+        return db_model
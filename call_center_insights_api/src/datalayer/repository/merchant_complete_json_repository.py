@@ -0,0 +1,101 @@
+from sqlalchemy import bindparam, text, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Her merchant_id için MerchantCompleteDto'nun camelCase JSON dokümanı; MerchantMapper/MerchantPersonMapper
+# ile aynı dönüşümler SQL'de yapılır (NULL merchant_name -> 'Unknown Merchant', string alanlar ::text).
+# İstek sırası ordinality ile korunur, bulunamayan id'ler satır üretmez.
+_MERCHANT_DOCUMENTS_SQL = """
+    SELECT ids.ord, json_build_object(
+        'merchantId', m.merchant_id,
+        'merchantName', COALESCE(m.merchant_name::text, 'Unknown Merchant'),
+        'merchantBrand', m.merchant_brand::text,
+        'merchantStatus', m.merchant_status::text,
+        'merchantCity', m.merchant_city::text,
+        'merchantDistrict', m.merchant_district::text,
+        'merchantAddress', m.merchant_address::text,
+        'merchantTaxNo', m.merchant_tax_no::text,
+        'merchantTaxOffice', m.merchant_tax_office::text,
+        'merchantSector', m.merchant_sector::text,
+        'merchantPeople', m.merchant_people,
+        'merchantHardware', m.merchant_hardware::text,
+        'merchantFiscalNo', m.merchant_fiscal_no::text,
+        'merchantService', m.merchant_service::text,
+        'merchantTicket', m.merchant_ticket::text,
+        'merchantInsertedAt', m.merchant_inserted_at,
+        'merchantPersonState', mp.merchant_person_state::text,
+        'merchantPersonName', mp.merchant_person_name::text,
+        'merchantPersonPhone', mp.merchant_person_phone::text,
+        'contactIds', (
+            SELECT json_agg(c.contact_id)
+            FROM public.merchant_contact c
+            WHERE c.merchant_id = m.merchant_id
+        ),
+        'tickets', (
+            SELECT json_agg(json_build_object(
+                'ticketId', t.mercant_ticket_id,
+                'merchantTicketOrderNo', t.merchant_ticket_order_no,
+                'merchantTicketTypeId', t.merchant_ticket_type_id,
+                'merchantTicketTime', t.merchant_ticket_time,
+                'merchantTicketKindId', t.merchant_ticket_kind_id,
+                'merchantTicketSubTypeId', t.merchant_ticket_sub_type_id,
+                'merchantTicketExplanation', t.merchant_ticket_explanation,
+                'merchantTicketFirstExplanation', t.merchant_ticket_first_explanation,
+                'ticketDetail', d.ticket_detail
+            ))
+            FROM public.merchant_ticket t
+            LEFT JOIN public.ticket_details d ON d.ticket_id = t.mercant_ticket_id
+            WHERE t.merchant_id = m.merchant_id
+        )
+    ) AS doc
+    FROM unnest(:merchant_ids) WITH ORDINALITY AS ids(merchant_id, ord)
+    JOIN public.merchant m ON m.merchant_id = ids.merchant_id
+    LEFT JOIN public.merchant_person mp ON mp.merchant_id = m.merchant_id
+"""
+
+
+def _documents_statement(select_sql: str):
+    return text(f"SELECT {select_sql} FROM ({_MERCHANT_DOCUMENTS_SQL}) docs").bindparams(
+        bindparam("merchant_ids", type_=ARRAY(Integer))
+    )
+
+
+class MerchantCompleteJsonRepository:
+    """
+    Read-only repository: MerchantCompleteDto JSON'unu Postgres'te json_build_object/json_agg ile
+    tek sorguda kurar ve metin olarak döndürür. ORM hydration, mapper ve Pydantic adımları atlanır.
+    """
+    
+    DOCUMENT_STMT = _documents_statement("docs.doc::text")
+    LIST_STMT = _documents_statement("COALESCE(json_agg(docs.doc ORDER BY docs.ord), '[]'::json)::text")
+    BATCH_STMT = _documents_statement(
+        "json_build_object('merchants', COALESCE(json_agg(docs.doc ORDER BY docs.ord), '[]'::json), 'totalCount', count(*))::text"
+    )
+    
+    def __init__(self, session: AsyncSession):
+        self.session = session
+    
+    async def get_document(self, merchant_id: int) -> Optional[str]:
+        """Tek merchant'ın JSON dokümanı; bulunamazsa None"""
+        logger.info(f"🚀 Building complete merchant JSON in Postgres for ID: {merchant_id}")
+        
+        result = await self.session.execute(self.DOCUMENT_STMT, {"merchant_ids": [merchant_id]})
+        return result.scalar_one_or_none()
+    
+    async def get_documents(self, merchant_ids: List[int]) -> str:
+        """İstek sırasıyla merchant dokümanlarının JSON dizisi (List[MerchantCompleteDto])"""
+        logger.info(f"🚀 Building complete merchant JSON list in Postgres for {len(merchant_ids)} IDs")
+        
+        result = await self.session.execute(self.LIST_STMT, {"merchant_ids": merchant_ids})
+        return result.scalar_one()
+    
+    async def get_batch_document(self, merchant_ids: List[int]) -> str:
+        """MerchantBatchResponseDto JSON'u: {"merchants": [...], "totalCount": n}"""
+        logger.info(f"🚀 Building merchant batch JSON in Postgres for {len(merchant_ids)} IDs")
+        
+        result = await self.session.execute(self.BATCH_STMT, {"merchant_ids": merchant_ids})
+        return result.scalar_one()
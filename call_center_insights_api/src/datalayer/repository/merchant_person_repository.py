@@ -1,16 +1,31 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from uuid import UUID
-from typing import Optional
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import String, bindparam, text
 from datalayer.model.schema_call_center_insight import MerchantPersonDB
 from datalayer.repository._base_repository import AsyncBaseRepository
 
 import logging
 logger = logging.getLogger(__name__)
 
+# Telefon index'i (migrations/V009): satırlar ve xmin aynı statement'ta, yani aynı snapshot'ta okunur
+# xid8 parametresi metin olarak gönderilip sunucuda çevrilir
+_PHONE_ENTRIES_SQL = """
+    SELECT snap.snapshot_xmin, p.merchant_id, p.merchant_person_phone
+    FROM (SELECT pg_snapshot_xmin(pg_current_snapshot())::text AS snapshot_xmin) snap
+    LEFT JOIN public.merchant_person p ON {condition}
+"""
+
+
 class MerchantPersonRepository(AsyncBaseRepository[MerchantPersonDB]):
     """Repository for MerchantPerson model"""
     
+    PHONE_ENTRIES_STMT = text(_PHONE_ENTRIES_SQL.format(condition="TRUE"))
+    PHONE_ENTRIES_SINCE_STMT = text(_PHONE_ENTRIES_SQL.format(
+        condition="p.merchant_person_xid >= CAST(CAST(:since_xid AS text) AS xid8)"
+    )).bindparams(bindparam("since_xid", type_=String))
+    
     def __init__(self, session: AsyncSession):
         super().__init__(session, MerchantPersonDB)
     
@@ -73,6 +88,31 @@ class MerchantPersonRepository(AsyncBaseRepository[MerchantPersonDB]):
         logger.info(f"Bulunan merchant person sayısı: {len(db_models)}")
         return db_models
 
+    async def get_phone_entries(self, since_xid: Optional[int] = None) -> Tuple[int, List[Any]]:
+        """
+        Telefon index'i için (merchant_id, merchant_person_phone) satırları ve okumanın snapshot xmin'i.
+        since_xid verilirse sadece o transaction id'den itibaren yazılan satırlar döner.
+        xmin'den küçük id'li tüm transaction'lar bu snapshot'ta bitmiş olduğu için, dönen xmin bir sonraki
+        okumanın since_xid'i olarak kullanıldığında commit'i geciken hiçbir satır kaçmaz.
+        """
+        logger.info(f"Veritabanında telefon kayıtları sorgusu, since_xid: {since_xid}")
+        
+        params = {}
+        stmt = self.PHONE_ENTRIES_STMT
+        if since_xid is not None:
+            stmt = self.PHONE_ENTRIES_SINCE_STMT
+            params["since_xid"] = str(since_xid)
+        
+        result = await self.session.execute(stmt, params)
+        rows = result.all()
+        
+        # Snapshot satırı her zaman döner; eşleşme yoksa merchant kolonları NULL'dur
+        snapshot_xmin = int(rows[0].snapshot_xmin)
+        entries = [(row.merchant_id, row.merchant_person_phone) for row in rows if row.merchant_id is not None]
+        
+        logger.info(f"Bulunan telefon kaydı sayısı: {len(entries)}, snapshot xmin: {snapshot_xmin}")
+        return snapshot_xmin, entries
+
     async def get_by_name(self, name: str) -> list[MerchantPersonDB]:
         """İsim ile merchant person listesi getirir"""
         logger.info(f"Veritabanında name ile sorgu: {name}")
@@ -1,16 +1,83 @@
+from sqlalchemy import Float, Integer, bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from uuid import UUID
-from typing import Optional
+from typing import Any, List, Optional, Tuple
 from datalayer.model.schema_call_center_insight import MerchantDB
 from datalayer.repository._base_repository import AsyncBaseRepository
 
 import logging
 logger = logging.getLogger(__name__)
 
+# Merchant araması (migrations/V008 trigram GIN index'leri): aday merchant'lar her kolon için index'lenebilir
+# <% (word_similarity) veya ILIKE koşuluyla bulunur, person eşleşmeleri UNION ile eklenir.
+# Skor en iyi eşleşen alanın word_similarity'sidir; float8'e çevrilir ki cursor'daki değer birebir geri dönsün.
+# ::text cast'leri index ifadeleriyle aynı tutulmalı.
+_MERCHANT_SEARCH_SQL = """
+    WITH matched AS (
+        SELECT m.merchant_id
+        FROM public.merchant m
+        WHERE :query <% m.merchant_name::text
+           OR :query <% m.merchant_brand::text
+           OR :query <% m.merchant_tax_no::text
+           OR :query <% m.merchant_city::text
+           OR m.merchant_name::text ILIKE :pattern
+           OR m.merchant_brand::text ILIKE :pattern
+           OR m.merchant_tax_no::text ILIKE :pattern
+           OR m.merchant_city::text ILIKE :pattern
+        UNION
+        SELECT mp.merchant_id
+        FROM public.merchant_person mp
+        WHERE :query <% mp.merchant_person_name::text
+           OR mp.merchant_person_name::text ILIKE :pattern
+    ),
+    scored AS (
+        SELECT m.merchant_id,
+               m.merchant_name::text AS merchant_name,
+               m.merchant_brand::text AS merchant_brand,
+               m.merchant_status::text AS merchant_status,
+               m.merchant_city::text AS merchant_city,
+               m.merchant_district::text AS merchant_district,
+               m.merchant_tax_no::text AS merchant_tax_no,
+               mp.merchant_person_name::text AS merchant_person_name,
+               COALESCE(GREATEST(
+                   word_similarity(:query, m.merchant_name::text),
+                   word_similarity(:query, m.merchant_brand::text),
+                   word_similarity(:query, m.merchant_tax_no::text),
+                   word_similarity(:query, m.merchant_city::text),
+                   word_similarity(:query, mp.merchant_person_name::text)
+               ), 0)::float8 AS score
+        FROM matched
+        JOIN public.merchant m ON m.merchant_id = matched.merchant_id
+        LEFT JOIN public.merchant_person mp ON mp.merchant_id = m.merchant_id
+    )
+    SELECT *
+    FROM scored
+    {cursor_filter}
+    ORDER BY score DESC, merchant_id
+    LIMIT :limit
+"""
+
+_MERCHANT_SEARCH_CURSOR_FILTER = """
+    WHERE score < :cursor_score OR (score = :cursor_score AND merchant_id > :cursor_merchant_id)
+"""
+
+
+def _search_statement(with_cursor: bool):
+    params = [bindparam("limit", type_=Integer)]
+    if with_cursor:
+        params += [bindparam("cursor_score", type_=Float(precision=53)), bindparam("cursor_merchant_id", type_=Integer)]
+    return text(_MERCHANT_SEARCH_SQL.format(
+        cursor_filter=_MERCHANT_SEARCH_CURSOR_FILTER if with_cursor else ""
+    )).bindparams(*params)
+
+
 class MerchantRepository(AsyncBaseRepository[MerchantDB]):
     """Repository for Merchant model"""
     
+    SEARCH_STMT = _search_statement(with_cursor=False)
+    SEARCH_AFTER_CURSOR_STMT = _search_statement(with_cursor=True)
+    
     def __init__(self, session: AsyncSession):
         super().__init__(session, MerchantDB)
     
@@ -99,6 +166,27 @@ class MerchantRepository(AsyncBaseRepository[MerchantDB]):
             
         return db_model
 
+    async def search(self, query: str, limit: int, cursor: Optional[Tuple[float, int]] = None) -> List[Any]:
+        """
+        Merchant adı, markası, vergi numarası, şehri ve kişi adı üzerinde trigram ile bulanık arama.
+        Özet satırlarını (score, merchant_id) sırasıyla döner; cursor verilirse bu keyset'ten sonrakiler gelir.
+        """
+        logger.info(f"Veritabanında merchant araması: {query!r}, limit: {limit}, cursor: {cursor}")
+        
+        # ILIKE joker karakterleri aranan metnin parçası olarak kaçırılır
+        escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params = {"query": query, "pattern": f"%{escaped}%", "limit": limit}
+        stmt = self.SEARCH_STMT
+        if cursor is not None:
+            stmt = self.SEARCH_AFTER_CURSOR_STMT
+            params["cursor_score"], params["cursor_merchant_id"] = cursor
+        
+        result = await self.session.execute(stmt, params)
+        rows = result.all()
+        
+        logger.info(f"Bulunan merchant sayısı: {len(rows)}")
+        return rows
+
     async def get_by_city(self, city: str) -> list[MerchantDB]:
         """Şehir bazında merchant listesi getirir"""
         logger.info(f"Veritabanında city ile sorgu: {city}")
@@ -1,9 +1,14 @@
+from sqlalchemy import Integer, and_, bindparam, func, or_, true, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
 from uuid import UUID
-from typing import Optional
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 from datalayer.model.schema_call_center_insight import MerchantTicketDB
 from datalayer.repository._base_repository import AsyncBaseRepository
+from datalayer.statement_cache import statement_cache
 
 import logging
 logger = logging.getLogger(__name__)
@@ -61,18 +66,100 @@ class MerchantTicketRepository(AsyncBaseRepository[MerchantTicketDB]):
         logger.debug(f"Entity count: {count}")
         return count
 
-    async def get_by_merchant_id(self, merchant_id: UUID) -> list[MerchantTicketDB]:
-        """Merchant ID ile ticket listesi getirir"""
-        logger.info(f"Veritabanında merchant_id ile sorgu: {merchant_id}")
+    def _ticket_order(self, model=None) -> list:
+        """Ticket sırası: en yeni önce, zamanı olmayanlar sonda; ix_merchant_ticket_merchant_id_time ile aynı"""
+        model = model or self.model_class
+        return [model.merchant_ticket_time.desc().nulls_last(), model.merchant_ticket_id.desc()]
+
+    async def get_by_merchant_id(self, merchant_id: int, since: Optional[datetime] = None, limit: Optional[int] = None) -> list[MerchantTicketDB]:
+        """Merchant ID ile ticket listesi getirir (merchant_ticket_time'a göre en yeni önce)"""
+        logger.info(f"Veritabanında merchant_id ile sorgu: {merchant_id}, since: {since}, limit: {limit}")
         
-        result = await self.session.execute(
-            select(self.model_class).where(self.model_class.merchant_id == merchant_id)
-        )
+        stmt = select(self.model_class).where(self.model_class.merchant_id == merchant_id)
+        if since is not None:
+            stmt = stmt.where(self.model_class.merchant_ticket_time >= since)
+        stmt = stmt.order_by(*self._ticket_order())
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        
+        result = await self.session.execute(stmt)
         db_models = result.scalars().all()
         
         logger.info(f"Bulunan merchant ticket sayısı: {len(db_models)}")
         return db_models
 
+    async def get_pages_by_merchant_ids(
+        self,
+        merchant_ids: List[int],
+        limit: Optional[int] = None,
+        since: Optional[datetime] = None,
+        cursor: Optional[Tuple[Optional[datetime], int]] = None
+    ) -> Dict[int, List[MerchantTicketDB]]:
+        """
+        Her merchant için ticket sayfasını tek sorguda getirir: unnest(merchant_ids) CROSS JOIN LATERAL (... LIMIT n).
+        Sıra (merchant_ticket_time DESC NULLS LAST, ticket id DESC); cursor (time, ticket_id) bu sıradaki son ticket'tır.
+        Merchant başına ix_merchant_ticket_merchant_id_time'dan sadece limit kadar satır okunur. limit None ise sınır yoktur.
+        """
+        logger.info(f"Veritabanında {len(merchant_ids)} merchant için ticket sayfası sorgusu, limit: {limit}, since: {since}, cursor: {cursor}")
+        
+        merchant_ids = list(dict.fromkeys(merchant_ids))
+        if not merchant_ids:
+            return {}
+        
+        cursor_kind = None if cursor is None else ("null_time" if cursor[0] is None else "time")
+        
+        def build():
+            model = self.model_class
+            merchants = func.unnest(
+                bindparam("merchant_ids", type_=ARRAY(model.merchant_id.type))
+            ).table_valued("merchant_id").render_derived(name="m")
+            
+            clauses = [model.merchant_id == merchants.c.merchant_id]
+            if since is not None:
+                clauses.append(model.merchant_ticket_time >= bindparam("since", type_=model.merchant_ticket_time.type))
+            if cursor_kind == "time":
+                # time DESC NULLS LAST sırasında cursor'dan sonrakiler: daha eski zamanlılar ve zamanı olmayanlar
+                cursor_time = bindparam("cursor_time", type_=model.merchant_ticket_time.type)
+                cursor_ticket_id = bindparam("cursor_ticket_id", type_=Integer)
+                clauses.append(or_(
+                    tuple_(model.merchant_ticket_time, model.merchant_ticket_id) < tuple_(cursor_time, cursor_ticket_id),
+                    model.merchant_ticket_time.is_(None)
+                ))
+            elif cursor_kind == "null_time":
+                clauses.append(and_(
+                    model.merchant_ticket_time.is_(None),
+                    model.merchant_ticket_id < bindparam("cursor_ticket_id", type_=Integer)
+                ))
+            
+            tickets = (
+                select(model)
+                .where(*clauses)
+                .order_by(*self._ticket_order())
+                .limit(bindparam("limit", type_=Integer))
+                .lateral("t")
+            )
+            ticket_alias = aliased(model, tickets)
+            return select(ticket_alias).select_from(merchants).join(tickets, true()).order_by(
+                tickets.c.merchant_id, *self._ticket_order(ticket_alias)
+            )
+        
+        stmt = statement_cache.get_or_build(("merchant_ticket_pages", since is not None, cursor_kind), build)
+        params = {"merchant_ids": merchant_ids, "limit": limit}
+        if since is not None:
+            params["since"] = since
+        if cursor is not None:
+            params["cursor_ticket_id"] = cursor[1]
+            if cursor_kind == "time":
+                params["cursor_time"] = cursor[0]
+        
+        result = await self.session.execute(stmt, params)
+        pages: Dict[int, List[MerchantTicketDB]] = {}
+        for db_model in result.scalars().all():
+            pages.setdefault(db_model.merchant_id, []).append(db_model)
+        
+        logger.info(f"Bulunan merchant ticket sayısı: {sum(len(page) for page in pages.values())}")
+        return pages
+
     async def get_by_order_no(self, order_no: str) -> Optional[MerchantTicketDB]:
         """Sipariş numarası ile merchant ticket getirir"""
         logger.info(f"Veritabanında order_no ile sorgu: {order_no}")
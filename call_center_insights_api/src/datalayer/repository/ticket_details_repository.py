@@ -1,16 +1,72 @@
+from sqlalchemy import Float, Integer, bindparam, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from uuid import UUID
-from typing import Optional
+from typing import Any, List, Optional, Tuple
 from datalayer.model.schema_call_center_insight import TicketDetailsDB
+from datalayer.model.dto.ticket_search_dto import SNIPPET_START_SEL, SNIPPET_STOP_SEL
 from datalayer.repository._base_repository import AsyncBaseRepository
 
 import logging
 logger = logging.getLogger(__name__)
 
+# Türkçe tam metin arama (migrations/V007): eşleşmeler GIN index'ten bulunur, rank'e göre keyset ile sayfalanır.
+# ts_headline pahalı olduğu için sadece LIMIT'ten sonra kalan satırlar için dış sorguda hesaplanır.
+# rank float8'e çevrilir; cursor'daki değer Python float'ı olarak birebir geri döner ve karşılaştırma kaymaz.
+# Eşleşmeler HTML olmayan ayraçlarla işaretlenir (metinde geçen ayraçlar önce silinir); HTML escape ve <mark>
+# dönüşümü TicketDetailsMapper.to_search_hit_dto'da yapılır.
+_TICKET_SEARCH_SQL = """
+    SELECT hits.ticket_id, hits.merchant_id, hits.merchant_ticket_time, hits.rank,
+           ts_headline(
+               'turkish', translate(hits.ticket_detail, '{start_sel}{stop_sel}', ''),
+               websearch_to_tsquery('turkish', :query),
+               'StartSel={start_sel}, StopSel={stop_sel}, MaxFragments=2, MaxWords=20, MinWords=5'
+           ) AS snippet
+    FROM (
+        SELECT d.ticket_id, t.merchant_id, t.merchant_ticket_time, d.ticket_detail,
+               ts_rank(d.ticket_detail_tsv, websearch_to_tsquery('turkish', :query))::float8 AS rank
+        FROM public.ticket_details d
+        JOIN public.merchant_ticket t ON t.mercant_ticket_id = d.ticket_id
+        WHERE d.ticket_detail_tsv @@ websearch_to_tsquery('turkish', :query)
+        {filters}
+        ORDER BY rank DESC, d.ticket_id DESC
+        LIMIT :limit
+    ) hits
+    ORDER BY hits.rank DESC, hits.ticket_id DESC
+"""
+
+_TICKET_SEARCH_CURSOR_FILTER = """
+        AND (ts_rank(d.ticket_detail_tsv, websearch_to_tsquery('turkish', :query))::float8, d.ticket_id)
+            < (:cursor_rank, :cursor_ticket_id)
+"""
+
+_TICKET_SEARCH_MERCHANT_FILTER = """
+        AND t.merchant_id = :merchant_id
+"""
+
+
+def _search_statement(with_cursor: bool, with_merchant: bool):
+    filters = (_TICKET_SEARCH_CURSOR_FILTER if with_cursor else "") + (_TICKET_SEARCH_MERCHANT_FILTER if with_merchant else "")
+    params = [bindparam("limit", type_=Integer)]
+    if with_cursor:
+        params += [bindparam("cursor_rank", type_=Float(precision=53)), bindparam("cursor_ticket_id", type_=Integer)]
+    if with_merchant:
+        params.append(bindparam("merchant_id", type_=Integer))
+    return text(_TICKET_SEARCH_SQL.format(
+        filters=filters, start_sel=SNIPPET_START_SEL, stop_sel=SNIPPET_STOP_SEL
+    )).bindparams(*params)
+
+
 class TicketDetailsRepository(AsyncBaseRepository[TicketDetailsDB]):
     """Repository for TicketDetails model"""
     
+    # (cursor var mı, merchant filtresi var mı) -> statement
+    SEARCH_STMTS = {
+        (with_cursor, with_merchant): _search_statement(with_cursor, with_merchant)
+        for with_cursor in (False, True)
+        for with_merchant in (False, True)
+    }
+    
     def __init__(self, session: AsyncSession):
         super().__init__(session, TicketDetailsDB)
     
@@ -61,6 +117,33 @@ class TicketDetailsRepository(AsyncBaseRepository[TicketDetailsDB]):
         logger.debug(f"Entity count: {count}")
         return count
 
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        cursor: Optional[Tuple[float, int]] = None,
+        merchant_id: Optional[int] = None
+    ) -> List[Any]:
+        """
+        ticket_detail_tsv üzerinde Türkçe tam metin arama (websearch_to_tsquery sözdizimi: "tam ifade", -hariç, or).
+        (ticket_id, merchant_id, merchant_ticket_time, rank, snippet) satırlarını (rank, ticket_id) azalan sırasıyla döner.
+        cursor verilirse (rank, ticket_id) keyset'inden sonraki satırlar gelir.
+        """
+        logger.info(f"Veritabanında ticket detail tam metin arama: {query!r}, limit: {limit}, cursor: {cursor}, merchant_id: {merchant_id}")
+        
+        stmt = self.SEARCH_STMTS[(cursor is not None, merchant_id is not None)]
+        params = {"query": query, "limit": limit}
+        if cursor is not None:
+            params["cursor_rank"], params["cursor_ticket_id"] = cursor
+        if merchant_id is not None:
+            params["merchant_id"] = merchant_id
+        
+        result = await self.session.execute(stmt, params)
+        rows = result.all()
+        
+        logger.info(f"Bulunan ticket details sayısı: {len(rows)}")
+        return rows
+
     async def search_by_detail(self, search_term: str) -> list[TicketDetailsDB]:
         """Ticket detayı içinde arama yapar"""
         logger.info(f"Veritabanında detail ile sorgu: {search_term}")
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable
+
+from config import Config
+
+
+class StatementCache:
+    """
+    Filtre şekline (mevcut filtre anahtarları ve operatörleri) göre kurulmuş statement'ları tutan LRU cache.
+    Statement'lar değer yerine bindparam içerir; değerler her çağrıda execute parametresi olarak verilir.
+    Böylece aynı şekildeki istekler select() kurulumunu ve cache key üretimini atlar,
+    SQLAlchemy'nin compiled cache'i de aynı statement nesnesi için tek bir derlenmiş SQL kullanır.
+    """
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._statements: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+    
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """key için cache'teki statement'ı döndürür, yoksa build() ile kurup saklar"""
+        with self._lock:
+            statement = self._statements.get(key)
+            if statement is not None:
+                self._statements.move_to_end(key)
+                self._hits += 1
+                return statement
+            self._misses += 1
+        
+        statement = build()
+        if self.max_size <= 0:
+            return statement
+        
+        with self._lock:
+            self._statements[key] = statement
+            self._statements.move_to_end(key)
+            while len(self._statements) > self.max_size:
+                self._statements.popitem(last=False)
+                self._evictions += 1
+        return statement
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._statements.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._statements),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+statement_cache = StatementCache(Config().filter_statement_cache_size)
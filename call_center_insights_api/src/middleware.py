@@ -0,0 +1,110 @@
+import asyncio
+import logging
+
+from config import Config
+from datalayer.query_stats import start_query_stats, stop_query_stats, shorten_statement
+
+logger = logging.getLogger(__name__)
+
+
+class CancelOnDisconnectMiddleware:
+    """
+    Client bağlantıyı kapattığında isteğin handler task'ını iptal eden ASGI middleware.
+    İptal, bekleyen asyncpg sorgusuna CancelledError olarak ulaşır; asyncpg sunucuya cancel isteği gönderir
+    ve bağlantı havuza geri döner. Böylece terk edilmiş dashboard istekleri havuzu meşgul etmez.
+    Sadece gövdesiz okuma istekleri (GET/HEAD) izlenir; gövdeli isteklerde receive handler'a aittir.
+    uvicorn yanıt tamamlandıktan sonra da http.disconnect döner; bu yüzden son gövde parçası gönderildikten
+    sonra gelen disconnect iptal sebebi sayılmaz (handler o sırada session kapatma gibi temizlik yapıyor olabilir).
+    """
+    
+    def __init__(self, app, methods=("GET", "HEAD")):
+        self.app = app
+        self.methods = methods
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in self.methods:
+            await self.app(scope, receive, send)
+            return
+        
+        # Client mesajları handler'a kuyruk üzerinden iletilir; disconnect izleyici ile paylaşılır
+        messages = asyncio.Queue()
+        disconnected = asyncio.Event()
+        response_complete = asyncio.Event()
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                # Sunucuya iletmeden önce işaretlenir ki ardından gelen disconnect iptal tetiklemesin
+                response_complete.set()
+            await send(message)
+        
+        handler = asyncio.create_task(self.app(scope, messages.get, send_wrapper))
+        watcher = asyncio.create_task(
+            self._watch_disconnect(receive, messages, disconnected, response_complete, handler, scope)
+        )
+        
+        try:
+            await handler
+        except asyncio.CancelledError:
+            if not disconnected.is_set():
+                # Sunucu kapanışı vb. dış iptal: handler da iptal edilir
+                handler.cancel()
+                raise
+        finally:
+            watcher.cancel()
+    
+    @staticmethod
+    async def _watch_disconnect(receive, messages, disconnected, response_complete, handler, scope):
+        while True:
+            message = await receive()
+            messages.put_nowait(message)
+            if message["type"] == "http.disconnect":
+                if not handler.done() and not response_complete.is_set():
+                    disconnected.set()
+                    logger.warning(f"⚠️ Client disconnected, cancelling {scope['method']} {scope['path']}")
+                    handler.cancel()
+                return
+
+
+class QueryStatsMiddleware:
+    """
+    Her HTTP isteği için SQL sayacı başlatan ASGI middleware (bkz. datalayer.query_stats).
+    İstek bitince sorgu sayısı veya toplam DB süresi eşiği aşıldıysa en yavaş statement'larla birlikte,
+    aynı statement N_PLUS_ONE_THRESHOLD kez tekrarlandıysa N+1 şüphesi olarak loglar.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+        config = Config()
+        self.max_queries = config.request_max_queries
+        self.max_db_time_ms = config.request_max_db_time_ms
+        self.n_plus_one_threshold = config.n_plus_one_threshold
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        token = start_query_stats()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stats = stop_query_stats(token)
+            self._report(f"{scope['method']} {scope['path']}", stats)
+    
+    def _report(self, request_name: str, stats) -> None:
+        if not stats.query_count:
+            return
+        
+        summary = f"{request_name}: {stats.query_count} queries, {stats.total_ms:.1f} ms DB time"
+        too_many = self.max_queries and stats.query_count > self.max_queries
+        too_slow = self.max_db_time_ms and stats.total_ms > self.max_db_time_ms
+        
+        if too_many or too_slow:
+            slowest = "; ".join(f"{elapsed_ms:.1f} ms: {shorten_statement(statement)}" for elapsed_ms, statement in stats.slowest_statements())
+            logger.warning(f"⚠️ Query budget exceeded {summary}. Slowest: {slowest}")
+        else:
+            logger.debug(f"📊 {summary}")
+        
+        if self.n_plus_one_threshold:
+            for statement, count in stats.repeated_statements(self.n_plus_one_threshold):
+                logger.warning(f"⚠️ Possible N+1 in {request_name}: statement ran {count} times: {shorten_statement(statement)}")
@@ -19,10 +19,15 @@ from .merchant_unified_routes import (
     router as merchant_unified_router
 )
 
+from .database_routes import (
+    router as database_router
+)
+
 __all__ = [
     "base_analysis_result_router",
     "call_router",
     "all_result_view_router",
     "qdrant_router",
-    "merchant_unified_router"
+    "merchant_unified_router",
+    "database_router"
 ]
\ No newline at end of file
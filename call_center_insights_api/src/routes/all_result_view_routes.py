@@ -1,26 +1,25 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
 import logging
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from datalayer import BusinessLogicDtoGeneric
-from datalayer import get_db_session
+from datalayer import get_read_session, read_session_scope
+from datalayer.database import db_manager
+from datalayer.mapper.all_result_view_mapper import AllResultViewMapper
 from datalayer.model.dto.all_result_view_dto import AllResultViewDto
+from datalayer.model.dto.agent_stats_dto import AgentStatsDto
+from datalayer.model.dto.analysis_timeseries_dto import AnalysisTimeseriesPointDto
 from datalayer.model.dto.analysis_result_response_dto import AnalysisResultResponseDto
 from services.all_result_view_service import AllResultViewService
+from services.analysis_rollup_service import AnalysisRollupService
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/analysis-result", tags=["ANALYSIS_RESULT"])
 
-@router.get(
-    "",
-    response_model=AnalysisResultResponseDto,
-    summary="Retrieve all analysis results",
-    description="Fetches a list of all analysis results from the view with optional pagination and filtering. Includes total count."
-)
-async def get_analysis_results(
-    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of results to return"),
-    offset: Optional[int] = Query(None, ge=0, description="Number of results to skip"),
+def get_analysis_result_filters(
     agent_name: Optional[str] = Query(None, description="Filter by agent name (partial match)"),
     phone_number: Optional[str] = Query(None, description="Filter by phone number (exact match)"),
     follow_up_required: Optional[bool] = Query(None, description="Filter by follow-up requirement"),
@@ -43,20 +42,91 @@ async def get_analysis_results(
     agent_interrupt_count_max: Optional[int] = Query(None, description="Maximum agent interrupt count"),
     churn_risk_min: Optional[int] = Query(None, description="Minimum churn risk level"),
     churn_risk_max: Optional[int] = Query(None, description="Maximum churn risk level"),
-    db: AsyncSession = Depends(get_db_session),
+) -> Dict[str, Any]:
+    """
+    Analysis result endpoint'lerinin ortak filtre query parametrelerini
+    AllResultViewRepository._apply_filters'ın beklediği sözlüğe dönüştürür.
+    """
+    filters = {}
+    if agent_name:
+        filters['agent_name'] = agent_name
+    if phone_number:
+        filters['phone_number'] = phone_number
+    if follow_up_required is not None:
+        filters['follow_up_required'] = follow_up_required
+    if reason_contains:
+        filters['reason_contains'] = reason_contains
+    
+    # Date range filters
+    if created_at_from:
+        filters['created_at_from'] = created_at_from
+    if created_at_to:
+        filters['created_at_to'] = created_at_to
+    
+    # Numeric range filters
+    if duration_min is not None:
+        filters['duration_min'] = duration_min
+    if duration_max is not None:
+        filters['duration_max'] = duration_max
+    if agent_speech_rate_min is not None:
+        filters['agent_speech_rate_min'] = agent_speech_rate_min
+    if agent_speech_rate_max is not None:
+        filters['agent_speech_rate_max'] = agent_speech_rate_max
+    if customer_speech_rate_min is not None:
+        filters['customer_speech_rate_min'] = customer_speech_rate_min
+    if customer_speech_rate_max is not None:
+        filters['customer_speech_rate_max'] = customer_speech_rate_max
+    if silence_rate_min is not None:
+        filters['silence_rate_min'] = silence_rate_min
+    if silence_rate_max is not None:
+        filters['silence_rate_max'] = silence_rate_max
+    if cross_talk_rate_min is not None:
+        filters['cross_talk_rate_min'] = cross_talk_rate_min
+    if cross_talk_rate_max is not None:
+        filters['cross_talk_rate_max'] = cross_talk_rate_max
+    if agent_interrupt_count_min is not None:
+        filters['agent_interrupt_count_min'] = agent_interrupt_count_min
+    if agent_interrupt_count_max is not None:
+        filters['agent_interrupt_count_max'] = agent_interrupt_count_max
+    if churn_risk_min is not None:
+        filters['churn_risk_min'] = churn_risk_min
+    if churn_risk_max is not None:
+        filters['churn_risk_max'] = churn_risk_max
+    return filters
+
+
+def _split_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Virgülle ayrılmış fields= parametresini listeye çevirir"""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(",") if field.strip()] or None
+
+
+@router.get(
+    "",
+    response_model=AnalysisResultResponseDto,
+    response_model_exclude_unset=True,
+    summary="Retrieve all analysis results",
+    description="Fetches a list of analysis results from the view with optional filtering and keyset pagination ordered by (created_at, call_id). Includes total count and nextCursor."
+)
+async def get_analysis_results(
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of results to return"),
+    offset: Optional[int] = Query(None, ge=0, description="Number of results to skip (ignored when cursor is given)"),
+    cursor: Optional[str] = Query(None, description="Opaque keyset cursor from the previous page's nextCursor"),
+    count: Literal["exact", "estimate", "none"] = Query("exact", description="Total count mode: exact (same statement as the page), estimate (planner statistics) or none"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to return (e.g. agentName,duration,callReason); all fields when omitted"),
+    filters: Dict[str, Any] = Depends(get_analysis_result_filters),
+    db: AsyncSession = Depends(get_read_session),
 ) -> AnalysisResultResponseDto:
     """
     Retrieve all analysis results with optional filtering and pagination. Includes total count.
     Args:
         limit (int, optional): Maximum number of results to return (1-1000).
         offset (int, optional): Number of results to skip for pagination.
-        agent_name (str, optional): Filter by agent name (partial match).
-        phone_number (str, optional): Filter by phone number (exact match).
-        follow_up_required (bool, optional): Filter by follow-up requirement.
-        reason_contains (str, optional): Filter by call reason (partial match).
-        created_at_from/to (str, optional): Filter by creation date range.
-        duration_min/max (float, optional): Filter by call duration range.
-        Various min/max range filters for numeric fields.
+        cursor (str, optional): Opaque keyset cursor returned as nextCursor by the previous page.
+        count (str): Total count mode - exact, estimate or none.
+        fields (str, optional): Comma-separated sparse fieldset; only these columns are selected and returned.
+        filters (dict): Filter query parameters, see get_analysis_result_filters.
         db (AsyncSession): Database session dependency.
     Returns:
         AnalysisResultResponseDto: A response containing filtered analysis results with count.
@@ -66,67 +136,158 @@ async def get_analysis_results(
     try:
         analysis_service = AllResultViewService(db)
         
-        # Apply filters if provided
-        filters = {}
-        if agent_name:
-            filters['agent_name'] = agent_name
-        if phone_number:
-            filters['phone_number'] = phone_number
-        if follow_up_required is not None:
-            filters['follow_up_required'] = follow_up_required
-        if reason_contains:
-            filters['reason_contains'] = reason_contains
-        
-        # Date range filters
-        if created_at_from:
-            filters['created_at_from'] = created_at_from
-        if created_at_to:
-            filters['created_at_to'] = created_at_to
-        
-        # Numeric range filters
-        if duration_min is not None:
-            filters['duration_min'] = duration_min
-        if duration_max is not None:
-            filters['duration_max'] = duration_max
-        if agent_speech_rate_min is not None:
-            filters['agent_speech_rate_min'] = agent_speech_rate_min
-        if agent_speech_rate_max is not None:
-            filters['agent_speech_rate_max'] = agent_speech_rate_max
-        if customer_speech_rate_min is not None:
-            filters['customer_speech_rate_min'] = customer_speech_rate_min
-        if customer_speech_rate_max is not None:
-            filters['customer_speech_rate_max'] = customer_speech_rate_max
-        if silence_rate_min is not None:
-            filters['silence_rate_min'] = silence_rate_min
-        if silence_rate_max is not None:
-            filters['silence_rate_max'] = silence_rate_max
-        if cross_talk_rate_min is not None:
-            filters['cross_talk_rate_min'] = cross_talk_rate_min
-        if cross_talk_rate_max is not None:
-            filters['cross_talk_rate_max'] = cross_talk_rate_max
-        if agent_interrupt_count_min is not None:
-            filters['agent_interrupt_count_min'] = agent_interrupt_count_min
-        if agent_interrupt_count_max is not None:
-            filters['agent_interrupt_count_max'] = agent_interrupt_count_max
-        if churn_risk_min is not None:
-            filters['churn_risk_min'] = churn_risk_min
-        if churn_risk_max is not None:
-            filters['churn_risk_max'] = churn_risk_max
-        
         # Use the new service method that returns data with count
         result = await analysis_service.get_analysis_results_with_count(
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            count_mode=count,
+            fields=_split_fields(fields),
             **filters
         )
         
         logger.info(f"✅ Route: Returning {len(result.data)} analysis result records with total count: {result.count}")
         return result
         
+    except ValueError as e:
+        logger.warning(f"❌ Route: Invalid analysis result request: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"❌ Route: Error getting analysis results: {e}")
         raise HTTPException(status_code=500, detail="Internal server error while fetching analysis results")
 
+@router.get(
+    "/stats/agents",
+    response_model=BusinessLogicDtoGeneric[List[AgentStatsDto]],
+    summary="Retrieve per-agent statistics",
+    description="Aggregates the analysis results matching the filters per agent with SQL GROUP BY: call count, average duration, silence and cross talk rates, interrupt counts and churn risk distribution. Only the aggregates are returned."
+)
+async def get_agent_stats(
+    filters: Dict[str, Any] = Depends(get_analysis_result_filters),
+    db: AsyncSession = Depends(get_read_session),
+) -> BusinessLogicDtoGeneric[List[AgentStatsDto]]:
+    """
+    Retrieve per-agent statistics over the filtered analysis results.
+    Args:
+        filters (dict): Filter query parameters, see get_analysis_result_filters.
+        db (AsyncSession): Database session dependency.
+    Returns:
+        BusinessLogicDtoGeneric[List[AgentStatsDto]]: One statistics entry per agent, ordered by agent name.
+    """
+    logger.info("🚀 Route: Getting agent stats")
+    
+    try:
+        analysis_service = AllResultViewService(db)
+        agent_stats = await analysis_service.get_agent_stats(**filters)
+        
+        logger.info(f"✅ Route: Returning stats for {len(agent_stats)} agents")
+        return BusinessLogicDtoGeneric(
+            data=agent_stats,
+            is_success=True,
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ Route: Error getting agent stats: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error while fetching agent stats")
+
+@router.get(
+    "/timeseries",
+    response_model=BusinessLogicDtoGeneric[List[AnalysisTimeseriesPointDto]],
+    summary="Retrieve analysis timeseries",
+    description="Returns call volume, average duration, follow-up ratio and average churn risk per hour or day. Reads only the incrementally maintained rollup tables, so latency does not grow with history."
+)
+async def get_analysis_timeseries(
+    granularity: Literal["hour", "day"] = Query("day", description="Bucket size: hour or day (Europe/Istanbul boundaries)"),
+    bucket_from: Optional[datetime] = Query(None, alias="from", description="First bucket to include (ISO 8601)"),
+    bucket_to: Optional[datetime] = Query(None, alias="to", description="Last bucket to include (ISO 8601)"),
+    agent_name: Optional[str] = Query(None, description="Filter by agent name (exact match)"),
+    call_reason: Optional[str] = Query(None, description="Filter by call reason (exact match)"),
+    db: AsyncSession = Depends(get_read_session),
+) -> BusinessLogicDtoGeneric[List[AnalysisTimeseriesPointDto]]:
+    """
+    Retrieve the analysis timeseries from the rollup tables.
+    Args:
+        granularity (str): hour or day.
+        bucket_from (datetime, optional): First bucket to include.
+        bucket_to (datetime, optional): Last bucket to include.
+        agent_name (str, optional): Exact agent name.
+        call_reason (str, optional): Exact call reason.
+        db (AsyncSession): Database session dependency.
+    Returns:
+        BusinessLogicDtoGeneric[List[AnalysisTimeseriesPointDto]]: One point per non-empty bucket, ordered by bucket.
+    """
+    logger.info(f"🚀 Route: Getting {granularity} analysis timeseries")
+    
+    try:
+        rollup_service = AnalysisRollupService(db)
+        timeseries = await rollup_service.get_timeseries(
+            granularity=granularity,
+            bucket_from=bucket_from,
+            bucket_to=bucket_to,
+            agent_name=agent_name,
+            call_reason=call_reason
+        )
+        
+        logger.info(f"✅ Route: Returning {len(timeseries)} timeseries points")
+        return BusinessLogicDtoGeneric(
+            data=timeseries,
+            is_success=True,
+        )
+        
+    except ValueError as e:
+        logger.warning(f"❌ Route: Invalid timeseries request: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Route: Error getting analysis timeseries: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error while fetching analysis timeseries")
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export analysis results as a stream",
+    description="Streams every analysis result matching the filters as NDJSON or CSV through a server-side cursor, ordered by (created_at, call_id). Memory stays flat regardless of the export size."
+)
+async def export_analysis_results(
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Export format: ndjson (one JSON object per line) or csv"),
+    fields: Optional[str] = Query(None, description="Comma-separated list of fields to export; all fields when omitted"),
+    filters: Dict[str, Any] = Depends(get_analysis_result_filters),
+) -> StreamingResponse:
+    """
+    Export analysis results matching the filters without buffering them.
+    Args:
+        request (Request): Incoming request, used to resolve the route statement timeout.
+        format (str): ndjson or csv.
+        fields (str, optional): Comma-separated sparse fieldset.
+        filters (dict): Filter query parameters, see get_analysis_result_filters.
+    Returns:
+        StreamingResponse: NDJSON or CSV body streamed chunk by chunk.
+    """
+    logger.info(f"🚀 Route: Exporting analysis results as {format}")
+    
+    try:
+        # Geçersiz alanlar stream başlamadan 400 dönsün
+        selected_fields = AllResultViewMapper.resolve_fields(_split_fields(fields) or list(AllResultViewMapper.FIELD_COLUMNS))
+    except ValueError as e:
+        logger.warning(f"❌ Route: Invalid analysis result export request: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    statement_timeout_ms = db_manager.statement_timeout_for(request.url.path)
+    
+    async def _export_stream():
+        # Yield'li dependency'ler response gönderilmeden kapandığı için session stream içinde açılır (replica'ya yönlenir)
+        async with read_session_scope(statement_timeout_ms) as session:
+            analysis_service = AllResultViewService(session)
+            async for chunk in analysis_service.export_analysis_results(format, selected_fields, **filters):
+                yield chunk
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _export_stream(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="analysis_results.{format}"'}
+    )
+
 @router.get(
     "/{call_id}",
     response_model=BusinessLogicDtoGeneric[AllResultViewDto],
@@ -135,7 +296,7 @@ async def get_analysis_results(
 )
 async def get_analysis_result_by_call_id(
     call_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_session),
 ) -> BusinessLogicDtoGeneric[AllResultViewDto]:
     """
     Retrieve an analysis result by its call ID (primary key).
@@ -4,7 +4,7 @@ from uuid import UUID
 from fastapi import APIRouter, Body, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from datalayer import BusinessLogicDtoGeneric
-from datalayer import get_db_session, BaseAnalysisResultDB
+from datalayer import get_db_session, get_read_session, BaseAnalysisResultDB
 from datalayer import BaseAnalysisResultCreateDto, BaseAnalysisResultDto
 from services import BaseResultService
 
@@ -18,7 +18,7 @@ router = APIRouter(prefix="/base-result", tags=["BASE_RESULT"])
     description="Fetches a list of all base analysis results from the database."
 )
 async def get_base_analysis_results(
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_session),
 ) -> BusinessLogicDtoGeneric[List[BaseAnalysisResultDto]]:
     """
     Retrieve all base analysis results.
@@ -46,7 +46,7 @@ async def get_base_analysis_results(
 )
 async def get_base_analysis_result_by_id(
     result_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_session),
 ) -> BusinessLogicDtoGeneric[BaseAnalysisResultDto]:
     """
     Retrieve a base analysis result by its primary key ID.
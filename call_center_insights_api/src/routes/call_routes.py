@@ -4,7 +4,7 @@ from uuid import UUID
 from fastapi import APIRouter, Body, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from datalayer import BusinessLogicDtoGeneric
-from datalayer import get_db_session, CallDB
+from datalayer import get_db_session, get_read_session, CallDB
 from datalayer import CallCreateDto, CallDto
 from services import CallService
 
@@ -18,7 +18,7 @@ router = APIRouter(prefix="/call", tags=["CALL"])
     description="Fetches a list of all call records from the database."
 )
 async def get_calls(
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_session),
 ) -> BusinessLogicDtoGeneric[List[CallDto]]:
     """
     Retrieve all call records.
@@ -46,7 +46,7 @@ async def get_calls(
 )
 async def get_call_by_id(
     call_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
+    db: AsyncSession = Depends(get_read_session),
 ) -> BusinessLogicDtoGeneric[CallDto]:
     """
     Retrieve a call record by its primary key ID.
@@ -0,0 +1,166 @@
+import logging
+from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from datalayer import BusinessLogicDtoGeneric, session_scope
+from datalayer.database import db_manager
+from datalayer.model.dto.database_pool_dto import DatabasePoolStatsDto
+from datalayer.model.dto.materialized_view_dto import MaterializedViewVersionDto
+from datalayer.model.dto.statement_cache_dto import StatementCacheStatsDto
+from datalayer.model.dto.merchant_cache_dto import MerchantCacheStatsDto
+from datalayer.statement_cache import statement_cache
+from datalayer.merchant_cache import merchant_complete_cache
+from services.materialized_view_service import MaterializedViewService, materialized_view_scheduler
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/database", tags=["DATABASE"])
+
+@router.get(
+    "/pool",
+    response_model=BusinessLogicDtoGeneric[List[DatabasePoolStatsDto]],
+    summary="Inspect the connection pools",
+    description="Returns the connection pool state (size, checked in/out, overflow) and the connection acquire counters (checkouts, timeouts, wait times) of the primary and every read replica."
+)
+async def get_pool_stats() -> BusinessLogicDtoGeneric[List[DatabasePoolStatsDto]]:
+    """
+    Retrieve connection pool counters.
+    Returns:
+        BusinessLogicDtoGeneric[List[DatabasePoolStatsDto]]: One entry for the primary and one per replica.
+    """
+    logger.info("🚀 Route: Getting connection pool stats")
+    
+    pool_stats = [DatabasePoolStatsDto(**stats) for stats in db_manager.pool_stats()]
+    
+    logger.info(f"✅ Route: Returning stats for {len(pool_stats)} connection pools")
+    return BusinessLogicDtoGeneric(
+        data=pool_stats,
+        is_success=True,
+    )
+
+@router.get(
+    "/statement-cache",
+    response_model=BusinessLogicDtoGeneric[StatementCacheStatsDto],
+    summary="Inspect the filter statement cache",
+    description="Returns the size and hit/miss counters of the cache that keeps one parameterized SQL statement per filter shape for the repository filter builders."
+)
+async def get_statement_cache_stats() -> BusinessLogicDtoGeneric[StatementCacheStatsDto]:
+    """
+    Retrieve filter statement cache counters.
+    Returns:
+        BusinessLogicDtoGeneric[StatementCacheStatsDto]: Cache size and hit/miss counters.
+    """
+    logger.info("🚀 Route: Getting statement cache stats")
+    
+    cache_stats = StatementCacheStatsDto(**statement_cache.stats())
+    
+    logger.info(f"✅ Route: Statement cache hit rate: {cache_stats.hit_rate}")
+    return BusinessLogicDtoGeneric(
+        data=cache_stats,
+        is_success=True,
+    )
+
+@router.get(
+    "/merchant-cache",
+    response_model=BusinessLogicDtoGeneric[MerchantCacheStatsDto],
+    summary="Inspect the merchant complete data cache",
+    description="Returns the backend, size and hit/miss/invalidation counters of the cache in front of the merchant complete endpoints. Counters are per process."
+)
+async def get_merchant_cache_stats() -> BusinessLogicDtoGeneric[MerchantCacheStatsDto]:
+    """
+    Retrieve merchant complete data cache counters.
+    Returns:
+        BusinessLogicDtoGeneric[MerchantCacheStatsDto]: Cache size and hit/miss/invalidation counters.
+    """
+    logger.info("🚀 Route: Getting merchant cache stats")
+    
+    cache_stats = MerchantCacheStatsDto(**merchant_complete_cache.stats())
+    
+    logger.info(f"✅ Route: Merchant cache hit rate: {cache_stats.hit_rate}")
+    return BusinessLogicDtoGeneric(
+        data=cache_stats,
+        is_success=True,
+    )
+
+@router.post(
+    "/materialized-views/{view_name}/refresh",
+    response_model=BusinessLogicDtoGeneric[MaterializedViewVersionDto],
+    summary="Refresh a materialized view",
+    description="Refreshes the materialized view (CONCURRENTLY by default, readers are not blocked) under an advisory lock and returns the new view version. Returns 409 when another refresh is already running."
+)
+async def refresh_materialized_view(
+    view_name: str,
+    concurrently: bool = Query(True, description="Use REFRESH MATERIALIZED VIEW CONCURRENTLY; set false for the first population of the view"),
+) -> BusinessLogicDtoGeneric[MaterializedViewVersionDto]:
+    """
+    Refresh a materialized view on demand.
+    Args:
+        view_name (str): Materialized view name, e.g. mvw_analysis_result.
+        concurrently (bool): Whether to refresh concurrently.
+    Returns:
+        BusinessLogicDtoGeneric[MaterializedViewVersionDto]: The new view version.
+    """
+    logger.info(f"🚀 Route: Refreshing materialized view: {view_name}")
+    
+    try:
+        version = await materialized_view_scheduler.refresh(view_name, concurrently=concurrently, trigger="manual")
+        
+        if not version:
+            logger.warning(f"❌ Route: Refresh already running for materialized view: {view_name}")
+            raise HTTPException(status_code=409, detail="A refresh is already running for the specified view")
+        
+        logger.info(f"✅ Route: Materialized view {view_name} refreshed, version: {version.version}")
+        return BusinessLogicDtoGeneric(
+            data=version,
+            is_success=True,
+        )
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"❌ Route: Invalid materialized view: {e}")
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Route: Error refreshing materialized view {view_name}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error while refreshing materialized view")
+
+@router.get(
+    "/materialized-views/{view_name}/version",
+    response_model=BusinessLogicDtoGeneric[MaterializedViewVersionDto],
+    summary="Get the current version of a materialized view",
+    description="Returns the latest refresh record of the materialized view. The version increases on every refresh and can be used as a cache key or ETag."
+)
+async def get_materialized_view_version(
+    view_name: str,
+) -> BusinessLogicDtoGeneric[MaterializedViewVersionDto]:
+    """
+    Retrieve the current version of a materialized view.
+    Args:
+        view_name (str): Materialized view name, e.g. mvw_analysis_result.
+    Returns:
+        BusinessLogicDtoGeneric[MaterializedViewVersionDto]: The latest view version.
+    """
+    logger.info(f"🚀 Route: Getting materialized view version: {view_name}")
+    
+    try:
+        # Refresh'ten hemen sonra tazeliği doğrulamak için çağrılır; gecikmeli replica eski version dönebileceği için primary'den okunur
+        async with session_scope() as session:
+            version = await MaterializedViewService(session).get_view_version(view_name)
+        
+        if not version:
+            logger.warning(f"❌ Route: No refresh recorded for materialized view: {view_name}")
+            raise HTTPException(status_code=404, detail="No refresh recorded for the specified view")
+        
+        materialized_view_scheduler.remember(version)
+        logger.info(f"✅ Route: Returning version {version.version} for materialized view: {view_name}")
+        return BusinessLogicDtoGeneric(
+            data=version,
+            is_success=True,
+        )
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"❌ Route: Invalid materialized view: {e}")
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Route: Error getting materialized view version {view_name}: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error while fetching materialized view version")
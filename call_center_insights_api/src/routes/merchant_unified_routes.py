@@ -1,23 +1,63 @@
 import logging
-from typing import List
+from datetime import datetime
+from typing import List, Optional
+from zoneinfo import ZoneInfo
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from services import MerchantUnifiedService
+from services import MerchantUnifiedService, MerchantSearchService, TicketSearchService, normalize_phone
 from datalayer.model.dto.merchant_complete_dto import (
     MerchantCompleteDto,
     MerchantBatchRequestDto,
-    MerchantBatchResponseDto
+    MerchantBatchResponseDto,
+    MerchantTicketQueryDto
 )
-from datalayer import get_db_session
+from datalayer.model.dto.merchant_search_dto import MerchantSearchResponseDto
+from datalayer.model.dto.ticket_search_dto import TicketSearchResponseDto
+from datalayer import get_read_session
+from config import Config
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/merchants", tags=["Unified Merchants"])
 
-@router.get("/complete/{merchant_id}", response_model=MerchantCompleteDto)
+# ---! Açıksa complete endpoint'leri Postgres'te kurulan JSON'u doğrudan döner (aynı şema)
+MERCHANT_JSON_FAST_PATH = Config().merchant_json_fast_path
+
+# merchant_ticket_time offset'siz (TIMESTAMP) ve Europe/Istanbul saatiyle tutulur
+TICKET_TIMEZONE = ZoneInfo("Europe/Istanbul")
+
+INCLUDE_DESCRIPTION = (
+    "Dönecek bölümler, virgülle ayrılmış: person,contacts,tickets,ticket_details. "
+    "Verilmezse tümü; boş bırakılırsa sadece merchant başlığı. İstenmeyen bölümler sorgulanmaz ve yanıtta yer almaz."
+)
+
+
+def _parse_include(include: Optional[str]):
+    """include= parametresini çözer; geçersiz bölüm 400 döner"""
+    try:
+        return MerchantUnifiedService.parse_include(include)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _ticket_query(tickets_since: Optional[datetime], tickets_limit: Optional[int], tickets_cursor: Optional[str] = None) -> Optional[MerchantTicketQueryDto]:
+    """Ticket parametrelerinden biri verildiyse sayfalama sorgusu döner; hiçbiri yoksa None (tüm ticket'lar)"""
+    if tickets_since is None and tickets_limit is None and tickets_cursor is None:
+        return None
+    if tickets_since is not None and tickets_since.tzinfo is not None:
+        # Offset'li değer naive TIMESTAMP kolonuna bağlanamaz; kolonun saat dilimine çevrilip offset atılır
+        tickets_since = tickets_since.astimezone(TICKET_TIMEZONE).replace(tzinfo=None)
+    return MerchantTicketQueryDto(since=tickets_since, limit=tickets_limit, cursor=tickets_cursor)
+
+@router.get("/complete/{merchant_id}", response_model=MerchantCompleteDto, response_model_exclude_unset=True)
 async def get_merchant_complete_data(
     merchant_id: int,
-    db: AsyncSession = Depends(get_db_session)
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    tickets_since: Optional[datetime] = Query(None, description="Sadece bu zamandan (dahil) sonraki ticket'lar"),
+    tickets_limit: Optional[int] = Query(None, ge=1, le=1000, description="En fazla ticket sayısı (en yeni önce)"),
+    tickets_cursor: Optional[str] = Query(None, description="Önceki yanıttaki ticketsNextCursor"),
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Tek bir merchant_id için beş tablodan (merchant, merchant_person, merchant_contact, 
@@ -25,15 +65,29 @@ async def get_merchant_complete_data(
     
     Args:
         merchant_id: Merchant benzersiz ID'si
+        include: Dönecek bölümler (örn. person,contacts); verilmezse tümü
+        tickets_since / tickets_limit / tickets_cursor: Ticket'ları merchant_ticket_time'a göre (en yeni önce) sınırlar ve sayfalar
         
     Returns:
         MerchantCompleteDto: Konsolide merchant verisi
     """
-    logger.info(f"🌐 Route: GET /merchants/complete/{merchant_id}")
+    logger.info(f"🌐 Route: GET /merchants/complete/{merchant_id}, include: {include}")
     
     try:
+        sections = _parse_include(include)
+        ticket_query = _ticket_query(tickets_since, tickets_limit, tickets_cursor)
         service = MerchantUnifiedService(db)
-        result = await service.get_merchant_complete_data(merchant_id)
+        if MERCHANT_JSON_FAST_PATH and include is None and ticket_query is None:
+            document = await service.get_merchant_complete_json(merchant_id)
+            if document is None:
+                raise HTTPException(
+                    status_code=404, 
+                    detail=f"Merchant bulunamadı ID: {merchant_id}"
+                )
+            logger.info(f"✅ Route: Complete merchant JSON returned for ID: {merchant_id}")
+            return Response(content=document, media_type="application/json")
+        
+        result = await service.get_merchant_complete_data(merchant_id, sections, ticket_query)
         
         if not result:
             raise HTTPException(
@@ -44,21 +98,31 @@ async def get_merchant_complete_data(
         logger.info(f"✅ Route: Complete merchant data returned for ID: {merchant_id}")
         return result
         
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning(f"❌ Route: Invalid merchant request for ID {merchant_id}: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"❌ Route: Error getting complete merchant data for ID {merchant_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@router.post("/complete/batch", response_model=MerchantBatchResponseDto)
+@router.post("/complete/batch", response_model=MerchantBatchResponseDto, response_model_exclude_unset=True)
 async def get_merchants_batch_data(
     request: MerchantBatchRequestDto,
-    db: AsyncSession = Depends(get_db_session)
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    tickets_since: Optional[datetime] = Query(None, description="Sadece bu zamandan (dahil) sonraki ticket'lar"),
+    tickets_limit: Optional[int] = Query(None, ge=1, le=1000, description="Merchant başına en fazla ticket sayısı (en yeni önce)"),
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Birden fazla merchant_id için beş tablodan tüm veriyi getirir (batch işlem).
     
     Args:
         request: Merchant ID'lerin listesini içeren request DTO
+        include: Dönecek bölümler (örn. person,contacts); verilmezse tümü
+        tickets_since / tickets_limit: Her merchant'ın ticket'larını sınırlar; devamı tek merchant endpoint'inden ticketsNextCursor ile alınır
         
     Returns:
         MerchantBatchResponseDto: Birden fazla merchant verisi
@@ -78,8 +142,15 @@ async def get_merchants_batch_data(
                 detail="Tek seferde maksimum 100 merchant sorgulanabilir"
             )
         
+        sections = _parse_include(include)
+        ticket_query = _ticket_query(tickets_since, tickets_limit)
         service = MerchantUnifiedService(db)
-        result = await service.get_merchants_batch_data(request)
+        if MERCHANT_JSON_FAST_PATH and include is None and ticket_query is None:
+            document = await service.get_merchants_batch_json(request)
+            logger.info(f"✅ Route: Batch merchant JSON returned for {len(request.merchant_ids)} IDs")
+            return Response(content=document, media_type="application/json")
+        
+        result = await service.get_merchants_batch_data(request, sections, ticket_query)
         
         logger.info(f"✅ Route: Batch merchant data returned for {result.total_count} merchants")
         return result
@@ -91,10 +162,13 @@ async def get_merchants_batch_data(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@router.get("/complete", response_model=List[MerchantCompleteDto])
+@router.get("/complete", response_model=List[MerchantCompleteDto], response_model_exclude_unset=True)
 async def get_merchants_by_ids(
     merchant_ids: List[int] = Query(..., description="Sorgulanacak merchant ID'lerin listesi"),
-    db: AsyncSession = Depends(get_db_session)
+    include: Optional[str] = Query(None, description=INCLUDE_DESCRIPTION),
+    tickets_since: Optional[datetime] = Query(None, description="Sadece bu zamandan (dahil) sonraki ticket'lar"),
+    tickets_limit: Optional[int] = Query(None, ge=1, le=1000, description="Merchant başına en fazla ticket sayısı (en yeni önce)"),
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Query parameter olarak verilen birden fazla merchant_id için 
@@ -102,12 +176,15 @@ async def get_merchants_by_ids(
     
     Args:
         merchant_ids: Query parameter olarak verilen merchant ID'lerin listesi
+        include: Dönecek bölümler (örn. person,contacts); verilmezse tümü
+        tickets_since / tickets_limit: Her merchant'ın ticket'larını sınırlar; devamı tek merchant endpoint'inden ticketsNextCursor ile alınır
         
     Returns:
         List[MerchantCompleteDto]: Merchant verilerinin listesi
         
     Example:
         GET /merchants/complete?merchant_ids=1&merchant_ids=2&merchant_ids=3
+        GET /merchants/complete?merchant_ids=1&merchant_ids=2&include=person
     """
     logger.info(f"🌐 Route: GET /merchants/complete with IDs: {merchant_ids}")
     
@@ -124,8 +201,15 @@ async def get_merchants_by_ids(
                 detail="Tek seferde maksimum 100 merchant sorgulanabilir"
             )
         
+        sections = _parse_include(include)
+        ticket_query = _ticket_query(tickets_since, tickets_limit)
         service = MerchantUnifiedService(db)
-        result = await service.get_merchants_by_ids(merchant_ids)
+        if MERCHANT_JSON_FAST_PATH and include is None and ticket_query is None:
+            document = await service.get_merchants_by_ids_json(merchant_ids)
+            logger.info(f"✅ Route: Complete merchant JSON returned for {len(merchant_ids)} IDs")
+            return Response(content=document, media_type="application/json")
+        
+        result = await service.get_merchants_by_ids(merchant_ids, sections, ticket_query)
         
         logger.info(f"✅ Route: Complete merchant data returned for {len(result)} merchants")
         return result
@@ -137,10 +221,51 @@ async def get_merchants_by_ids(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
-@router.get("/search/phone/{phone}", response_model=MerchantCompleteDto)
+@router.get("/search", response_model=MerchantSearchResponseDto)
+async def search_merchants(
+    q: str = Query(..., min_length=MerchantSearchService.MIN_QUERY_LENGTH, max_length=200, description="Merchant adı, markası, vergi numarası, şehri veya kişi adı (yazım hatalarına toleranslı)"),
+    limit: Optional[int] = Query(None, ge=1, le=MerchantSearchService.MAX_PAGE_SIZE, description="Sayfa boyutu (varsayılan 20)"),
+    cursor: Optional[str] = Query(None, description="Önceki sayfadaki nextCursor"),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """
+    Merchant'ları ad, marka, vergi numarası, şehir ve kişi adı üzerinde bulanık arar (pg_trgm).
+    Sadece özet satırlar döner; seçilen merchant'ın detayı /complete/{merchantId}?include=... ile alınır.
+    
+    Args:
+        q: Aranacak metin (en az 3 karakter)
+        limit: Sayfa boyutu
+        cursor: Önceki sayfadaki nextCursor
+        
+    Returns:
+        MerchantSearchResponseDto: Skora göre sıralı merchant özetleri ve sonraki sayfa cursor'ı
+        
+    Example:
+        GET /merchants/search?q=migros kadıköy&limit=20
+    """
+    logger.info(f"🌐 Route: GET /merchants/search q={q!r}")
+    
+    try:
+        service = MerchantSearchService(db)
+        result = await service.search(q, limit=limit, cursor=cursor)
+        
+        logger.info(f"✅ Route: Merchant search returned {len(result.merchants)} merchants")
+        return result
+        
+    except ValueError as e:
+        logger.warning(f"❌ Route: Invalid merchant search request: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Route: Error searching merchants: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/search/phone/{phone}", response_model=MerchantCompleteDto, response_model_exclude_unset=True)
 async def get_merchant_by_phone(
     phone: str,
-    db: AsyncSession = Depends(get_db_session)
+    tickets_since: Optional[datetime] = Query(None, description="Sadece bu zamandan (dahil) sonraki ticket'lar"),
+    tickets_limit: Optional[int] = Query(None, ge=1, le=1000, description="En fazla ticket sayısı (en yeni önce)"),
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Telefon numarası ile merchant person tablosunu arar ve bulunan merchant_id için
@@ -173,15 +298,11 @@ async def get_merchant_by_phone(
                 detail="Geçerli bir telefon numarası giriniz"
             )
         
-        # Türkiye telefon numarası formatını normalize et
-        # +90 ile başlıyorsa veya 90 ile başlıyorsa, onu kaldır
-        if clean_phone.startswith('90') and len(clean_phone) == 12:
-            clean_phone = clean_phone[2:]  # 90 prefikisini kaldır
-        elif clean_phone.startswith('0') and len(clean_phone) == 11:
-            clean_phone = clean_phone[1:]  # 0 prefikisini kaldır
+        # Türkiye telefon numarası formatını normalize et (+90 / 90 / 0 prefix'leri kaldırılır)
+        clean_phone = normalize_phone(clean_phone)
         
         service = MerchantUnifiedService(db)
-        result = await service.get_merchant_by_phone(clean_phone)
+        result = await service.get_merchant_by_phone(clean_phone, _ticket_query(tickets_since, tickets_limit))
         
         if not result:
             raise HTTPException(
@@ -196,4 +317,45 @@ async def get_merchant_by_phone(
         raise
     except Exception as e:
         logger.error(f"❌ Route: Error getting merchant by phone {phone}: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/tickets/search", response_model=TicketSearchResponseDto)
+async def search_ticket_details(
+    q: str = Query(..., min_length=2, max_length=200, description="Aranacak metin (websearch sözdizimi: \"tam ifade\", -hariç, or)"),
+    merchant_id: Optional[int] = Query(None, description="Sadece bu merchant'ın ticket'ları"),
+    limit: Optional[int] = Query(None, ge=1, le=TicketSearchService.MAX_PAGE_SIZE, description="Sayfa boyutu (varsayılan 20)"),
+    cursor: Optional[str] = Query(None, description="Önceki sayfadaki nextCursor"),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """
+    Ticket detaylarında Türkçe tam metin arama yapar (kök bulma ve stopword'ler dahil).
+    Sonuçlar alaka skoruna göre sıralanır; her eşleşme vurgulanmış parça ve merchant ID'si ile döner.
+    
+    Args:
+        q: Aranacak metin
+        merchant_id: Opsiyonel merchant filtresi
+        limit: Sayfa boyutu
+        cursor: Önceki sayfadaki nextCursor
+        
+    Returns:
+        TicketSearchResponseDto: Eşleşmeler, merchant ID'leri ve sonraki sayfa cursor'ı
+        
+    Example:
+        GET /merchants/tickets/search?q=pos cihazı arıza&limit=20
+    """
+    logger.info(f"🌐 Route: GET /merchants/tickets/search q={q!r}")
+    
+    try:
+        service = TicketSearchService(db)
+        result = await service.search(q, limit=limit, cursor=cursor, merchant_id=merchant_id)
+        
+        logger.info(f"✅ Route: Ticket search returned {len(result.hits)} hits")
+        return result
+        
+    except ValueError as e:
+        logger.warning(f"❌ Route: Invalid ticket search request: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Route: Error searching ticket details: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -17,10 +17,48 @@ from .merchant_unified_service import (
     MerchantUnifiedService
 )
 
+from .analysis_rollup_service import (
+    AnalysisRollupService
+)
+
+from .ticket_search_service import (
+    TicketSearchService
+)
+
+from .merchant_search_service import (
+    MerchantSearchService
+)
+
+from .materialized_view_service import (
+    MaterializedViewService,
+    materialized_view_scheduler
+)
+
+from .merchant_phone_index_service import (
+    MerchantPhoneIndex,
+    merchant_phone_index,
+    normalize_phone
+)
+
+from .merchant_cache_service import (
+    MerchantCacheInvalidationListener,
+    merchant_cache_listener
+)
+
 __all__ = [
     "BaseResultService",
     "CallService",
     "AllResultViewService",
     "SearchApiService",
-    "MerchantUnifiedService"
+    "MerchantUnifiedService",
+    "AnalysisRollupService",
+    "TicketSearchService",
+    "MerchantSearchService",
+    "MaterializedViewService",
+    "materialized_view_scheduler",
+    "MerchantPhoneIndex",
+    "merchant_phone_index",
+    "normalize_phone",
+    "MerchantCacheInvalidationListener",
+    "merchant_cache_listener"
 ]
@@ -1,12 +1,17 @@
 # services/all_result_view_service.py
+import csv
+import io
 import logging
-from typing import List, Optional, Dict, Any
+from datetime import datetime
+from typing import List, Optional, Dict, Any, AsyncIterator, Iterable, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from datalayer.model.dto.all_result_view_dto import AllResultViewDto
+from datalayer.model.dto.all_result_view_dto import AllResultViewDto, AllResultViewPartialDto
+from datalayer.model.dto.agent_stats_dto import AgentStatsDto
 from datalayer.model.dto.analysis_result_response_dto import AnalysisResultResponseDto
 from datalayer.mapper.all_result_view_mapper import AllResultViewMapper
 from datalayer.repository.all_result_view_repository import AllResultViewRepository
+from datalayer.repository._cursor import encode_cursor, decode_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +21,9 @@ class AllResultViewService:
     Bu bir view olduğu için sadece SELECT işlemleri desteklenir.
     """
     
+    # Route'un izin verdiği en büyük sayfa; limit verilmezse de bellek bununla sınırlı kalır
+    MAX_PAGE_SIZE = 1000
+    
     def __init__(self, db: AsyncSession):
         self.repository = AllResultViewRepository(db)
         self.mapper = AllResultViewMapper()
@@ -91,36 +99,56 @@ class AllResultViewService:
             logger.error(f"❌ Service: Error counting analysis result views: {e}")
             raise
 
-    async def get_analysis_results_with_count(self, limit: Optional[int] = None, offset: Optional[int] = None, **filters) -> AnalysisResultResponseDto:
+    async def get_analysis_results_with_count(
+        self,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        count_mode: str = "exact",
+        fields: Optional[List[str]] = None,
+        **filters
+    ) -> AnalysisResultResponseDto:
         """
-        Tüm analysis result view kayıtlarını count ile birlikte döndürür.
+        Analysis result view kayıtlarını count ile birlikte döndürür.
+        Sayfalama SQL tarafında (call_created_at, call_id) keyset'i ile yapılır;
+        bir sonraki sayfa için opak next_cursor döner.
+        count_mode: exact (sayfa ile aynı sorguda), estimate (planner istatistiği) veya none.
+        fields verilirse sadece bu alanların kolonları seçilir ve kısmi DTO döner.
         """
-        logger.info(f"🚀 Service: getting analysis result views with count, filters: {filters}")
+        logger.info(f"🚀 Service: getting analysis result views with count ({count_mode}), filters: {filters}")
         
         try:
-            # Filters varsa filtered query kullan, yoksa get_all kullan
-            if filters:
-                # Filtered query for data
-                db_models = await self.repository.get_by_filter(**filters)
-                # Apply pagination manually if needed
-                if offset or limit:
-                    start = offset or 0
-                    end = start + limit if limit else None
-                    paginated_models = db_models[start:end]
-                else:
-                    paginated_models = db_models
-                
-                # Count with same filters
-                total_count = await self.repository.count(**filters)
-            else:
-                # No filters, use get_all with pagination
-                db_models = await self.repository.get_all(limit=limit, offset=offset)
-                paginated_models = db_models
-                # Count all records
-                total_count = await self.repository.count()
+            page_size = limit or self.MAX_PAGE_SIZE
+            keyset = self._decode_keyset_cursor(cursor) if cursor else None
+            selected_fields = self.mapper.resolve_fields(fields) if fields else None
+            
+            # Bir fazla satır çekerek sonraki sayfanın varlığını anla
+            db_models, total_count = await self.repository.get_page(
+                limit=page_size + 1,
+                cursor=keyset,
+                offset=offset,
+                with_total=count_mode == "exact",
+                columns=self.mapper.to_columns(selected_fields) if selected_fields else None,
+                **filters
+            )
+            page_models = db_models[:page_size]
+            
+            next_cursor = None
+            if len(db_models) > page_size:
+                last = page_models[-1]
+                next_cursor = encode_cursor([last.call_created_at.isoformat(), str(last.call_id)])
+            
+            if count_mode == "exact" and total_count is None:
+                # Boş sayfada toplam sayı satırlarla gelmez; ilk sayfadaysak sonuç zaten 0
+                total_count = await self.repository.count(**filters) if (keyset or offset) else 0
+            elif count_mode == "estimate":
+                total_count = await self.repository.estimate_count(**filters)
             
             # Convert to DTOs
-            results = self.mapper.to_dto_list(paginated_models)
+            if selected_fields:
+                results = [self.mapper.to_partial_dto(row, selected_fields) for row in page_models]
+            else:
+                results = self.mapper.to_dto_list(page_models)
             
             logger.info(f"✅ Service: Retrieved {len(results)} analysis result records with total count: {total_count}")
             
@@ -128,9 +156,89 @@ class AllResultViewService:
                 is_success=True,
                 count=total_count,
                 message=None,
-                data=results
+                data=results,
+                next_cursor=next_cursor
             )
             
         except Exception as e:
             logger.error(f"❌ Service: Error getting analysis result views with count: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    async def get_agent_stats(self, **filters) -> List[AgentStatsDto]:
+        """
+        Filtreye uyan görüşmelerin ajan bazlı istatistiklerini SQL'de hesaplar;
+        satırlar uygulamaya taşınmaz, sadece ajan başına bir özet döner.
+        """
+        logger.info(f"🚀 Service: getting agent stats with filters: {filters}")
+        
+        try:
+            stats_rows = await self.repository.get_agent_stats(**filters)
+            churn_rows = await self.repository.get_agent_churn_distribution(**filters)
+            
+            # Churn dağılımı ayrı GROUP BY ile gelir; ajan adına göre sözlüklere dağıt
+            distributions: Dict[str, Dict[str, int]] = {}
+            for row in churn_rows:
+                churn_risk = self.mapper._convert_churn_risk(row.churn_risk) or "unknown"
+                distributions.setdefault(row.agent_name, {})[churn_risk] = row.call_count
+            
+            results = [
+                self.mapper.to_agent_stats_dto(row, distributions.get(row.agent_name))
+                for row in stats_rows
+            ]
+            
+            logger.info(f"✅ Service: Retrieved stats for {len(results)} agents")
+            return results
+            
+        except Exception as e:
+            logger.error(f"❌ Service: Error getting agent stats: {e}")
+            raise
+
+    async def export_analysis_results(self, export_format: str, fields: List[str], **filters) -> AsyncIterator[str]:
+        """
+        Filtreye uyan tüm kayıtları server-side cursor üzerinden NDJSON veya CSV parçaları
+        olarak üretir. Her parça repository'nin bir stream partition'ına karşılık gelir.
+        """
+        logger.info(f"🚀 Service: exporting analysis result views as {export_format}, filters: {filters}")
+        
+        try:
+            columns = self.mapper.to_columns(fields)
+            exported = 0
+            
+            if export_format == "csv":
+                header = [AllResultViewPartialDto.model_fields[field].alias or field for field in fields]
+                yield self._to_csv([header])
+            
+            async for partition in self.repository.stream_by_filter(columns, **filters):
+                dtos = self.mapper.iter_partial_dto(partition, fields)
+                if export_format == "csv":
+                    yield self._to_csv(self._to_csv_row(dto, fields) for dto in dtos)
+                else:
+                    yield "".join(dto.model_dump_json(by_alias=True, exclude_unset=True) + "\n" for dto in dtos)
+                exported += len(partition)
+            
+            logger.info(f"✅ Service: Exported {exported} analysis result records as {export_format}")
+            
+        except Exception as e:
+            # Stream başladıktan sonra HTTP durumu değiştirilemez; bağlantı hata ile kapanır
+            logger.error(f"❌ Service: Error exporting analysis result views: {e}")
+            raise
+
+    @staticmethod
+    def _to_csv_row(dto: AllResultViewPartialDto, fields: List[str]) -> List[Any]:
+        values = dto.model_dump(mode="json")
+        return ["" if values[field] is None else values[field] for field in fields]
+
+    @staticmethod
+    def _to_csv(rows: Iterable[List[Any]]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _decode_keyset_cursor(cursor: str) -> Tuple[datetime, UUID]:
+        """Opak cursor'ı (call_created_at, call_id) keyset değerlerine çözer"""
+        created_at, call_id = decode_cursor(cursor, size=2)
+        try:
+            return datetime.fromisoformat(created_at), UUID(call_id)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Geçersiz cursor: {cursor}") from e
@@ -0,0 +1,69 @@
+# services/analysis_rollup_service.py
+import logging
+from datetime import datetime
+from typing import List, Optional
+from zoneinfo import ZoneInfo
+from sqlalchemy.ext.asyncio import AsyncSession
+from datalayer.model.dto.analysis_timeseries_dto import AnalysisTimeseriesPointDto
+from datalayer.mapper.analysis_rollup_mapper import AnalysisRollupMapper
+from datalayer.repository.analysis_rollup_repository import AnalysisRollupRepository
+
+logger = logging.getLogger(__name__)
+
+class AnalysisRollupService:
+    """
+    Read-only service for the hourly/daily analysis rollups.
+    Zaman serisi sadece rollup tablolarından okunur; gecikme geçmiş büyüdükçe sabit kalır.
+    """
+    
+    # Rollup bucket sınırlarının zaman dilimi (migrations/V003); offset'siz tarihler bu saatte kabul edilir
+    BUCKET_TIMEZONE = ZoneInfo("Europe/Istanbul")
+    
+    def __init__(self, db: AsyncSession):
+        self.repository = AnalysisRollupRepository(db)
+        self.mapper = AnalysisRollupMapper()
+    
+    async def get_timeseries(
+        self,
+        granularity: str = "day",
+        bucket_from: Optional[datetime] = None,
+        bucket_to: Optional[datetime] = None,
+        agent_name: Optional[str] = None,
+        call_reason: Optional[str] = None
+    ) -> List[AnalysisTimeseriesPointDto]:
+        """
+        Çağrı hacmi, ortalama süre, takip oranı ve ortalama churn risk zaman serisini döndürür.
+        """
+        logger.info(f"🚀 Service: getting {granularity} analysis timeseries")
+        
+        try:
+            # Biri offset'li biri offset'siz gelirse karşılaştırma TypeError verir; ikisi de aware yapılır
+            bucket_from = self._to_bucket_timezone(bucket_from)
+            bucket_to = self._to_bucket_timezone(bucket_to)
+            if bucket_from and bucket_to and bucket_from > bucket_to:
+                raise ValueError("from tarihi to tarihinden sonra olamaz")
+            
+            rows = await self.repository.get_timeseries(
+                granularity,
+                bucket_from=bucket_from,
+                bucket_to=bucket_to,
+                agent_name=agent_name,
+                call_reason=call_reason
+            )
+            results = [self.mapper.to_timeseries_dto(row) for row in rows]
+            
+            logger.info(f"✅ Service: Retrieved {len(results)} timeseries points")
+            return results
+            
+        except Exception as e:
+            logger.error(f"❌ Service: Error getting analysis timeseries: {e}")
+            raise
+    
+    @classmethod
+    def _to_bucket_timezone(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """Offset'siz tarihi Europe/Istanbul saati olarak yorumlar, offset'li tarihi o zaman dilimine çevirir"""
+        if value is None:
+            return None
+        if value.tzinfo is None:
+            return value.replace(tzinfo=cls.BUCKET_TIMEZONE)
+        return value.astimezone(cls.BUCKET_TIMEZONE)
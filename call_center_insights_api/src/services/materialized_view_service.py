@@ -0,0 +1,180 @@
+# services/materialized_view_service.py
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import Config
+from datalayer.database import session_scope
+from datalayer.model.dto.materialized_view_dto import MaterializedViewVersionDto
+from datalayer.model.schema_call_center_insight import MaterializedViewRefreshDB
+from datalayer.mapper.materialized_view_refresh_mapper import MaterializedViewRefreshMapper
+from datalayer.repository.materialized_view_refresh_repository import MaterializedViewRefreshRepository
+
+logger = logging.getLogger(__name__)
+
+class MaterializedViewService:
+    """
+    Materialized view refresh ve versiyon servisi.
+    Refresh advisory lock altında çalışır, her başarılı refresh yeni bir versiyon kaydı üretir.
+    """
+    
+    # Dışarıdan refresh edilebilen view'lar; identifier SQL'e gömüldüğü için liste dışı isim kabul edilmez
+    REFRESHABLE_VIEWS: Dict[str, str] = {
+        "mvw_analysis_result": "public.mvw_analysis_result",
+    }
+    
+    def __init__(self, db: AsyncSession):
+        self.repository = MaterializedViewRefreshRepository(db)
+        self.mapper = MaterializedViewRefreshMapper()
+    
+    @classmethod
+    def resolve_view(cls, view_name: str) -> str:
+        """View adını şema nitelikli ada çevirir, bilinmeyen view için ValueError fırlatır"""
+        qualified_name = cls.REFRESHABLE_VIEWS.get(view_name)
+        if not qualified_name:
+            raise ValueError(f"Bilinmeyen materialized view: {view_name}")
+        return qualified_name
+    
+    async def refresh_view(self, view_name: str, concurrently: bool = True, trigger: str = "manual") -> Optional[MaterializedViewVersionDto]:
+        """
+        View'ı refresh eder ve yeni versiyonu döndürür.
+        Başka bir refresh lock'u tutuyorsa None döner; commit çağıran tarafa aittir.
+        """
+        logger.info(f"🚀 Service: refreshing materialized view: {view_name}, trigger: {trigger}")
+        qualified_name = self.resolve_view(view_name)
+        
+        try:
+            if not await self.repository.try_lock(qualified_name):
+                logger.warning(f"❌ Service: Refresh already running for {qualified_name}")
+                return None
+            
+            started = time.perf_counter()
+            await self.repository.refresh_view(qualified_name, concurrently=concurrently)
+            duration_ms = (time.perf_counter() - started) * 1000
+            
+            db_model = await self.repository.save(MaterializedViewRefreshDB(
+                view_name=qualified_name,
+                refreshed_at=datetime.now(timezone.utc),
+                duration_ms=duration_ms,
+                concurrent=concurrently,
+                trigger=trigger
+            ))
+            
+            logger.info(f"✅ Service: Refreshed {qualified_name} in {duration_ms:.0f} ms, version: {db_model.version}")
+            return self.mapper.to_dto(db_model)
+            
+        except Exception as e:
+            logger.error(f"❌ Service: Error refreshing materialized view {view_name}: {e}")
+            raise
+    
+    async def get_view_version(self, view_name: str) -> Optional[MaterializedViewVersionDto]:
+        """View'ın güncel versiyonunu getirir, hiç refresh kaydı yoksa None döner"""
+        logger.info(f"🚀 Service: getting materialized view version: {view_name}")
+        qualified_name = self.resolve_view(view_name)
+        
+        try:
+            db_model = await self.repository.get_latest(qualified_name)
+            return self.mapper.to_dto(db_model) if db_model else None
+            
+        except Exception as e:
+            logger.error(f"❌ Service: Error getting materialized view version {view_name}: {e}")
+            raise
+
+
+class MaterializedViewRefreshScheduler:
+    """
+    Materialized view'ları MV_REFRESH_INTERVAL_SECONDS aralığıyla arka planda refresh eden singleton.
+    Son bilinen versiyonları bellekte tutar; cache anahtarları ve ETag'ler DB'ye gitmeden okuyabilir.
+    """
+    _instance = None
+    _initialized = False
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MaterializedViewRefreshScheduler, cls).__new__(cls)
+        return cls._instance
+    
+    def __init__(self):
+        if MaterializedViewRefreshScheduler._initialized:
+            return
+        
+        self._task: Optional[asyncio.Task] = None
+        self._versions: Dict[str, MaterializedViewVersionDto] = {}
+        
+        MaterializedViewRefreshScheduler._initialized = True
+    
+    def current_version(self, view_name: str) -> Optional[int]:
+        """Bellekteki son versiyonu döndürür; henüz bilinmiyorsa None"""
+        version = self._versions.get(view_name)
+        return version.version if version else None
+    
+    def remember(self, version: MaterializedViewVersionDto) -> None:
+        """Daha yeni bir versiyon geldiyse bellekteki değeri günceller"""
+        view_name = version.view_name.split(".")[-1]
+        current = self._versions.get(view_name)
+        if current is None or version.version > current.version:
+            self._versions[view_name] = version
+    
+    async def refresh(self, view_name: str, concurrently: bool = True, trigger: str = "manual") -> Optional[MaterializedViewVersionDto]:
+        """View'ı kendi session'ında refresh eder; versiyon commit'ten sonra belleğe alınır"""
+        async with session_scope() as session:
+            version = await MaterializedViewService(session).refresh_view(view_name, concurrently=concurrently, trigger=trigger)
+        
+        if version:
+            self.remember(version)
+        return version
+    
+    async def load_versions(self) -> None:
+        """Başlangıçta tüm view'ların güncel versiyonlarını DB'den yükler"""
+        async with session_scope() as session:
+            service = MaterializedViewService(session)
+            for view_name in MaterializedViewService.REFRESHABLE_VIEWS:
+                version = await service.get_view_version(view_name)
+                if version:
+                    self.remember(version)
+    
+    def start(self) -> None:
+        """Zamanlanmış refresh döngüsünü başlatır; aralık 0 veya negatifse kapalıdır"""
+        interval = Config().mv_refresh_interval_seconds
+        if interval <= 0:
+            logger.info("Materialized view scheduled refresh disabled")
+            return
+        if self._task and not self._task.done():
+            return
+        
+        self._task = asyncio.create_task(self._run(interval))
+        logger.info(f"✅ Materialized view refresh scheduler started, interval: {interval}s")
+    
+    async def stop(self) -> None:
+        """Çalışan refresh döngüsünü iptal eder ve bitmesini bekler"""
+        if not self._task:
+            return
+        
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Materialized view refresh scheduler stopped")
+    
+    async def _run(self, interval: int) -> None:
+        try:
+            await self.load_versions()
+        except Exception as e:
+            logger.error(f"❌ Scheduler: Error loading materialized view versions: {e}")
+        
+        while True:
+            await asyncio.sleep(interval)
+            for view_name in MaterializedViewService.REFRESHABLE_VIEWS:
+                try:
+                    await self.refresh(view_name, trigger="schedule")
+                except Exception as e:
+                    # Bir refresh hatası döngüyü durdurmamalı, bir sonraki turda tekrar denenir
+                    logger.error(f"❌ Scheduler: Error refreshing materialized view {view_name}: {e}")
+
+
+# Singleton instance'ını oluştur
+materialized_view_scheduler = MaterializedViewRefreshScheduler()
@@ -0,0 +1,104 @@
+# services/merchant_cache_service.py
+import asyncio
+import logging
+from typing import Optional, Set
+from config import Config
+from datalayer.database import db_manager
+from datalayer.merchant_cache import merchant_complete_cache
+
+logger = logging.getLogger(__name__)
+
+class MerchantCacheInvalidationListener:
+    """
+    merchant_changed kanalını LISTEN eden singleton (bildirimler migrations/V005 trigger'larından gelir).
+    merchant, merchant_person, merchant_contact, merchant_ticket veya ticket_details satırı değiştiğinde
+    payload'daki merchant_id'nin cache kaydı silinir. Bağlantı koptuğunda kaçan bildirimler bilinemediği için
+    yeniden bağlanınca cache tamamen temizlenir.
+    """
+    _instance = None
+    _initialized = False
+
+    CHANNEL = "merchant_changed"
+    RECONNECT_DELAY_SECONDS = 5
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MerchantCacheInvalidationListener, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if MerchantCacheInvalidationListener._initialized:
+            return
+
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+
+        MerchantCacheInvalidationListener._initialized = True
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        """asyncpg listener callback'i senkron çağrılır; silme işlemi task olarak planlanır"""
+        try:
+            merchant_id = int(payload)
+        except ValueError:
+            logger.warning(f"⚠️ Merchant cache: invalid {channel} payload: {payload!r}")
+            return
+
+        task = asyncio.get_running_loop().create_task(merchant_complete_cache.invalidate([merchant_id]))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def start(self) -> None:
+        """Dinleme döngüsünü başlatır; cache kapalıysa veya PgBouncer modundaysa (LISTEN taşınmaz) başlatılmaz"""
+        config = Config()
+        if not merchant_complete_cache.enabled or not config.merchant_cache_listen:
+            logger.info("Merchant cache invalidation listener disabled")
+            return
+        if config.db_pgbouncer_mode:
+            logger.warning("⚠️ Merchant cache invalidation listener disabled in PgBouncer mode, entries expire by TTL only")
+            return
+        if self._task and not self._task.done():
+            return
+
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"✅ Merchant cache invalidation listener started on channel: {self.CHANNEL}")
+
+    async def stop(self) -> None:
+        """Dinleme döngüsünü iptal eder ve bitmesini bekler"""
+        if not self._task:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Merchant cache invalidation listener stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Bağlantı dinleme süresince havuzdan ayrılır (primary havuzunda bir slot)
+                async with db_manager.engine.connect() as conn:
+                    raw_connection = await conn.get_raw_connection()
+                    driver_connection = raw_connection.driver_connection
+                    await driver_connection.add_listener(self.CHANNEL, self._on_notification)
+                    try:
+                        cleared = await merchant_complete_cache.clear()
+                        logger.info(f"✅ Merchant cache: listening on {self.CHANNEL}, cleared {cleared} entries")
+                        while not driver_connection.is_closed():
+                            await asyncio.sleep(self.RECONNECT_DELAY_SECONDS)
+                    finally:
+                        if not driver_connection.is_closed():
+                            await driver_connection.remove_listener(self.CHANNEL, self._on_notification)
+                logger.warning("⚠️ Merchant cache: listener connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Bağlantı hatası döngüyü durdurmamalı, bir süre sonra tekrar bağlanılır
+                logger.error(f"❌ Merchant cache: listener error: {e}")
+            await asyncio.sleep(self.RECONNECT_DELAY_SECONDS)
+
+
+# Singleton instance'ını oluştur
+merchant_cache_listener = MerchantCacheInvalidationListener()
@@ -0,0 +1,176 @@
+# services/merchant_phone_index_service.py
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Set
+from config import Config
+from datalayer.database import read_session_scope
+from datalayer.repository.merchant_person_repository import MerchantPersonRepository
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_phone(phone: Optional[str]) -> str:
+    """
+    Telefon numarasını sadece rakamlara indirger ve Türkiye formatını normalize eder.
+    +90 / 90 (12 hane) veya 0 (11 hane) prefix'i kaldırılır: "+90 542 214 78 88" -> "5422147888"
+    """
+    clean_phone = ''.join(filter(str.isdigit, phone or ""))
+    if clean_phone.startswith('90') and len(clean_phone) == 12:
+        clean_phone = clean_phone[2:]  # 90 prefikisini kaldır
+    elif clean_phone.startswith('0') and len(clean_phone) == 11:
+        clean_phone = clean_phone[1:]  # 0 prefikisini kaldır
+    return clean_phone
+
+
+class MerchantPhoneIndex:
+    """
+    Normalize telefon -> merchant_id index'ini bellekte tutan singleton (screen-pop aramaları için).
+    Başlangıçta merchant_person'dan tamamen yüklenir, sonra merchant_person_xid watermark'ı ile artımlı yenilenir:
+    her okuma snapshot xmin'ini döner ve sonraki okuma o transaction id'den itibaren yazılan satırları alır.
+    Watermark commit sırasına dayandığı için uzun süren yazma transaction'ları da kaçmaz.
+    Silinen satırlar artımlı yenilemede görünmediği için belirli aralıkla tam yeniden kurulur.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MerchantPhoneIndex, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if MerchantPhoneIndex._initialized:
+            return
+
+        self._task: Optional[asyncio.Task] = None
+        self._merchants_by_phone: Dict[str, Set[int]] = {}
+        self._phone_by_merchant: Dict[int, str] = {}
+        self._watermark: Optional[int] = None
+        self._last_full_load: float = 0.0
+        self._ready = False
+
+        MerchantPhoneIndex._initialized = True
+
+    @property
+    def ready(self) -> bool:
+        """İlk tam yükleme tamamlandıysa True; öncesinde aramalar DB'ye düşmelidir"""
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._merchants_by_phone)
+
+    def lookup(self, phone: str) -> Optional[int]:
+        """
+        Telefon için merchant_id döndürür; birden fazla merchant varsa en küçük id (deterministik).
+        Index hazır değilse veya numara yoksa None döner, çağıran DB'ye düşer.
+        """
+        merchant_ids = self._merchants_by_phone.get(normalize_phone(phone))
+        if not merchant_ids:
+            return None
+        return min(merchant_ids)
+
+    def _apply(self, merchant_id: int, phone: Optional[str]) -> None:
+        """Tek bir merchant_person satırını index'e uygular; eski numarası varsa önce kaldırılır"""
+        old_phone = self._phone_by_merchant.pop(merchant_id, None)
+        if old_phone is not None:
+            merchant_ids = self._merchants_by_phone.get(old_phone)
+            if merchant_ids is not None:
+                merchant_ids.discard(merchant_id)
+                if not merchant_ids:
+                    del self._merchants_by_phone[old_phone]
+
+        clean_phone = normalize_phone(phone)
+        if not clean_phone:
+            return
+        self._phone_by_merchant[merchant_id] = clean_phone
+        self._merchants_by_phone.setdefault(clean_phone, set()).add(merchant_id)
+
+    async def load(self) -> None:
+        """Index'i merchant_person'dan baştan kurar; yeni sözlükler hazır olunca tek atamada değiştirilir"""
+        started = time.perf_counter()
+        async with read_session_scope() as session:
+            watermark, rows = await MerchantPersonRepository(session).get_phone_entries()
+
+        merchants_by_phone: Dict[str, Set[int]] = {}
+        phone_by_merchant: Dict[int, str] = {}
+        for merchant_id, phone in rows:
+            clean_phone = normalize_phone(phone)
+            if clean_phone:
+                phone_by_merchant[merchant_id] = clean_phone
+                merchants_by_phone.setdefault(clean_phone, set()).add(merchant_id)
+
+        self._merchants_by_phone = merchants_by_phone
+        self._phone_by_merchant = phone_by_merchant
+        self._watermark = watermark
+        self._last_full_load = time.monotonic()
+        self._ready = True
+        logger.info(
+            f"✅ Phone index loaded: {len(merchants_by_phone)} phones, {len(phone_by_merchant)} merchants "
+            f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+
+    async def refresh(self) -> int:
+        """Watermark'tan sonra değişen satırları index'e uygular; uygulanan satır sayısını döndürür"""
+        if not self._ready:
+            await self.load()
+            return len(self._phone_by_merchant)
+
+        async with read_session_scope() as session:
+            watermark, rows = await MerchantPersonRepository(session).get_phone_entries(since_xid=self._watermark)
+
+        # Hâlâ açık transaction'ların satırları bir sonraki okumada tekrar gelir; aynı satırı iki kez uygulamak zararsız
+        for merchant_id, phone in rows:
+            self._apply(merchant_id, phone)
+        self._watermark = watermark
+
+        if rows:
+            logger.info(f"Phone index refreshed: {len(rows)} changed rows applied")
+        return len(rows)
+
+    def start(self) -> None:
+        """Yükleme ve artımlı yenileme döngüsünü başlatır; aralık 0 veya negatifse index kapalıdır"""
+        interval = Config().phone_index_refresh_interval_seconds
+        if interval <= 0:
+            logger.info("Phone index disabled")
+            return
+        if self._task and not self._task.done():
+            return
+
+        self._task = asyncio.create_task(self._run(interval, Config().phone_index_full_reload_seconds))
+        logger.info(f"✅ Phone index refresher started, interval: {interval}s")
+
+    async def stop(self) -> None:
+        """Çalışan yenileme döngüsünü iptal eder ve bitmesini bekler"""
+        if not self._task:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info("Phone index refresher stopped")
+
+    async def _run(self, interval: int, full_reload_seconds: int) -> None:
+        try:
+            await self.load()
+        except Exception as e:
+            logger.error(f"❌ Phone index: Error loading index: {e}")
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                # Silinen satırlar watermark ile yakalanamaz; belirli aralıkla baştan kurulur
+                if full_reload_seconds > 0 and time.monotonic() - self._last_full_load >= full_reload_seconds:
+                    await self.load()
+                else:
+                    await self.refresh()
+            except Exception as e:
+                # Bir yenileme hatası döngüyü durdurmamalı, bir sonraki turda tekrar denenir
+                logger.error(f"❌ Phone index: Error refreshing index: {e}")
+
+
+# Singleton instance'ını oluştur
+merchant_phone_index = MerchantPhoneIndex()
@@ -0,0 +1,72 @@
+# services/merchant_search_service.py
+import logging
+from typing import Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from datalayer.model.dto.merchant_search_dto import MerchantSearchResponseDto
+from datalayer.mapper.merchant_mapper import MerchantMapper
+from datalayer.repository.merchant_repository import MerchantRepository
+from datalayer.repository._cursor import encode_cursor, decode_cursor
+
+logger = logging.getLogger(__name__)
+
+class MerchantSearchService:
+    """
+    Merchant adı, markası, vergi numarası, şehri ve kişi adı üzerinde bulanık arama (migrations/V008 pg_trgm + GIN).
+    Hafif özet satırları döner; detay /complete/{merchantId}?include=... ile ihtiyaç olduğunda alınır.
+    Sonuçlar (score, merchant_id) keyset'i ile sayfalanır.
+    """
+    
+    DEFAULT_PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+    # Trigram eşleşmesi için en az bir tam trigram gerekir; daha kısa metinler tüm tabloyu tarar
+    MIN_QUERY_LENGTH = 3
+    
+    def __init__(self, db: AsyncSession):
+        self.repository = MerchantRepository(db)
+        self.mapper = MerchantMapper()
+    
+    async def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> MerchantSearchResponseDto:
+        """
+        query'ye en çok benzeyen merchant'ların özetlerini benzerlik skoruna göre azalan sırada döndürür.
+        """
+        logger.info(f"🚀 Service: searching merchants for {query!r}")
+        
+        try:
+            query = query.strip()
+            if len(query) < self.MIN_QUERY_LENGTH:
+                raise ValueError(f"Arama metni en az {self.MIN_QUERY_LENGTH} karakter olmalı")
+            
+            page_size = min(limit or self.DEFAULT_PAGE_SIZE, self.MAX_PAGE_SIZE)
+            keyset = self._decode_search_cursor(cursor) if cursor else None
+            
+            # Bir fazla satır çekerek sonraki sayfanın varlığını anla
+            rows = await self.repository.search(query, limit=page_size + 1, cursor=keyset)
+            page_rows = rows[:page_size]
+            
+            next_cursor = None
+            if len(rows) > page_size:
+                last = page_rows[-1]
+                next_cursor = encode_cursor([last.score, last.merchant_id])
+            
+            merchants = [self.mapper.to_summary_dto(row) for row in page_rows]
+            
+            logger.info(f"✅ Service: Found {len(merchants)} merchants")
+            return MerchantSearchResponseDto(merchants=merchants, next_cursor=next_cursor)
+            
+        except Exception as e:
+            logger.error(f"❌ Service: Error searching merchants: {e}")
+            raise
+    
+    @staticmethod
+    def _decode_search_cursor(cursor: str) -> Tuple[float, int]:
+        """Opak cursor'ı (score, merchant_id) keyset değerlerine çözer"""
+        score, merchant_id = decode_cursor(cursor, size=2)
+        try:
+            return float(score), int(merchant_id)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Geçersiz cursor: {cursor}") from e
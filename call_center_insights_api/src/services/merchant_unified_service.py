@@ -1,12 +1,14 @@
 import logging
-from typing import List, Optional
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from datalayer.repository import (
     MerchantRepository, 
     MerchantPersonRepository, 
     MerchantContactRepository,
     MerchantTicketRepository,
-    TicketDetailsRepository
+    TicketDetailsRepository,
+    MerchantCompleteJsonRepository
 )
 from datalayer.mapper import (
     MerchantMapper,
@@ -19,11 +21,27 @@ from datalayer.model.dto.merchant_complete_dto import (
     MerchantCompleteDto,
     MerchantTicketWithDetailsDto,
     MerchantBatchRequestDto,
-    MerchantBatchResponseDto
+    MerchantBatchResponseDto,
+    MerchantTicketQueryDto,
+    MERCHANT_INCLUDE_SECTIONS
 )
+from datalayer.repository._cursor import encode_cursor, decode_cursor
+from datalayer.database import session_scope
+from datalayer.merchant_cache import merchant_complete_cache
+from services.merchant_phone_index_service import merchant_phone_index
 
 logger = logging.getLogger(__name__)
 
+# ---! include verilmediğinde tüm bölümler döner (önceki davranış)
+MERCHANT_INCLUDE_ALL: FrozenSet[str] = frozenset(MERCHANT_INCLUDE_SECTIONS)
+
+# Bölüm istenmediğinde MerchantCompleteDto'dan çıkarılan alanlar (ticket_details tickets içinde ayrıca ele alınır)
+_SECTION_FIELDS = {
+    "person": ("merchant_person_state", "merchant_person_name", "merchant_person_phone"),
+    "contacts": ("contact_ids",),
+    "tickets": ("tickets",),
+}
+
 class MerchantUnifiedService:
     def __init__(self, db: AsyncSession):
         # Initialize all repositories
@@ -32,6 +50,7 @@ class MerchantUnifiedService:
         self.merchant_contact_repo = MerchantContactRepository(db)
         self.merchant_ticket_repo = MerchantTicketRepository(db)
         self.ticket_details_repo = TicketDetailsRepository(db)
+        self.merchant_complete_json_repo = MerchantCompleteJsonRepository(db)
         
         # Initialize all mappers
         self.merchant_mapper = MerchantMapper()
@@ -40,59 +59,268 @@ class MerchantUnifiedService:
         self.merchant_ticket_mapper = MerchantTicketMapper()
         self.ticket_details_mapper = TicketDetailsMapper()
     
-    async def get_merchant_complete_data(self, merchant_id: int) -> Optional[MerchantCompleteDto]:
+    @staticmethod
+    def parse_include(include: Optional[str]) -> FrozenSet[str]:
+        """
+        include= parametresini (virgülle ayrılmış bölüm listesi) bölüm kümesine çevirir.
+        None ise tüm bölümler; boş string sadece merchant başlığı. Bilinmeyen bölüm için ValueError.
+        """
+        if include is None:
+            return MERCHANT_INCLUDE_ALL
+        
+        sections = {section.strip() for section in include.split(",") if section.strip()}
+        unknown = sections - MERCHANT_INCLUDE_ALL
+        if unknown:
+            raise ValueError(
+                f"Geçersiz include bölümü: {', '.join(sorted(unknown))} "
+                f"(geçerli: {', '.join(MERCHANT_INCLUDE_SECTIONS)})"
+            )
+        if "ticket_details" in sections:
+            sections.add("tickets")
+        return frozenset(sections)
+    
+    async def get_merchant_complete_data(
+        self,
+        merchant_id: int,
+        include: FrozenSet[str] = MERCHANT_INCLUDE_ALL,
+        ticket_query: Optional[MerchantTicketQueryDto] = None
+    ) -> Optional[MerchantCompleteDto]:
         """
-        Tek bir merchant_id için beş tablodan tüm veriyi getirir.
+        Tek bir merchant_id için beş tablodan (include ile seçilen bölümlerin) verisini getirir.
+        ticket_query verilirse ticket'lar zamana göre sınırlanır/sayfalanır.
         """
-        logger.info(f"🚀 Service: getting complete merchant data for ID: {merchant_id}")
+        logger.info(f"🚀 Service: getting complete merchant data for ID: {merchant_id}, include: {sorted(include)}, tickets: {ticket_query}")
+        
+        complete_data = await self._load_complete_data([merchant_id], include, ticket_query)
+        complete_dto = complete_data.get(merchant_id)
         
-        # 1. Merchant basic data
-        merchant_db = await self.merchant_repo.get_by_id(merchant_id)
-        if not merchant_db:
+        if complete_dto:
+            logger.info(f"✅ Complete merchant data assembled for ID: {merchant_id}")
+        else:
             logger.warning(f"Merchant bulunamadı ID: {merchant_id}")
-            return None
+        return complete_dto
+    
+    async def get_merchants_batch_data(
+        self,
+        request: MerchantBatchRequestDto,
+        include: FrozenSet[str] = MERCHANT_INCLUDE_ALL,
+        ticket_query: Optional[MerchantTicketQueryDto] = None
+    ) -> MerchantBatchResponseDto:
+        """
+        Birden fazla merchant_id için beş tablodan tüm veriyi getirir (batch işlem).
+        """
+        logger.info(f"🚀 Service: getting batch merchant data for {len(request.merchant_ids)} merchants")
         
-        merchant_dto = self.merchant_mapper.to_dto(merchant_db)
+        merchants = await self.get_merchants_by_ids(request.merchant_ids, include, ticket_query)
+        
+        response = MerchantBatchResponseDto(
+            merchants=merchants,
+            totalCount=len(merchants)
+        )
+        
+        logger.info(f"✅ Batch merchant data assembled for {len(merchants)} merchants")
+        return response
+    
+    async def get_merchants_by_ids(
+        self,
+        merchant_ids: List[int],
+        include: FrozenSet[str] = MERCHANT_INCLUDE_ALL,
+        ticket_query: Optional[MerchantTicketQueryDto] = None
+    ) -> List[MerchantCompleteDto]:
+        """
+        Birden fazla merchant_id için complete data listesi döner (istek sırasıyla, bulunamayanlar atlanır).
+        """
+        logger.info(f"🚀 Service: getting merchants by IDs: {merchant_ids}")
         
-        # 2. Merchant person data
-        merchant_person_db = await self.merchant_person_repo.get_by_merchant_id(merchant_id)
-        merchant_person_dto = None
-        if merchant_person_db:
-            merchant_person_dto = self.merchant_person_mapper.to_dto(merchant_person_db)
+        complete_data = await self._load_complete_data(merchant_ids, include, ticket_query)
+        return [complete_data[merchant_id] for merchant_id in merchant_ids if merchant_id in complete_data]
+    
+    async def get_merchant_complete_json(self, merchant_id: int) -> Optional[str]:
+        """
+        get_merchant_complete_data'nın hızlı yolu: MerchantCompleteDto JSON'u Postgres'te kurulur ve metin olarak döner.
+        """
+        logger.info(f"🚀 Service: getting complete merchant JSON for ID: {merchant_id}")
+        return await self.merchant_complete_json_repo.get_document(merchant_id)
+    
+    async def get_merchants_by_ids_json(self, merchant_ids: List[int]) -> str:
+        """
+        get_merchants_by_ids'in hızlı yolu: List[MerchantCompleteDto] JSON dizisi.
+        """
+        logger.info(f"🚀 Service: getting merchants JSON by IDs: {merchant_ids}")
+        return await self.merchant_complete_json_repo.get_documents(merchant_ids)
+    
+    async def get_merchants_batch_json(self, request: MerchantBatchRequestDto) -> str:
+        """
+        get_merchants_batch_data'nın hızlı yolu: MerchantBatchResponseDto JSON'u.
+        """
+        logger.info(f"🚀 Service: getting batch merchant JSON for {len(request.merchant_ids)} merchants")
+        return await self.merchant_complete_json_repo.get_batch_document(request.merchant_ids)
+    
+    async def invalidate_merchants(self, merchant_ids: List[int]) -> int:
+        """
+        Uygulama içinden merchant verisi değiştiren kod için cache invalidation hook'u.
+        DB'deki değişiklikler ayrıca migrations/V005 trigger'ları ve merchant_cache_listener ile yakalanır.
+        """
+        deleted = await merchant_complete_cache.invalidate(merchant_ids)
+        logger.info(f"Merchant cache invalidated for {len(merchant_ids)} merchants, {deleted} entries removed")
+        return deleted
+    
+    async def _load_complete_data(
+        self,
+        merchant_ids: List[int],
+        include: FrozenSet[str] = MERCHANT_INCLUDE_ALL,
+        ticket_query: Optional[MerchantTicketQueryDto] = None
+    ) -> Dict[int, MerchantCompleteDto]:
+        """
+        Önce merchant complete cache'e bakar, bulunamayan merchant'ları DB'den yükler.
+        Cache her zaman tam dokümanı tutar: kısmi include'lar cache'ten kesilerek okunur ama cache'e yazılmaz.
+        Ticket sayfalaması istendiğinde cache kullanılmaz; sayfa doğrudan DB'den okunur.
+        Cache'e yazılacak dokümanlar primary'den yüklenir: invalidation bildirimi primary'de commit anında gelir,
+        gecikmeli bir replica'dan okunan değişiklik öncesi doküman TTL boyunca cache'te kalırdı.
+        """
+        if ticket_query is not None and "tickets" in include:
+            if ticket_query.cursor and len(set(merchant_ids)) > 1:
+                raise ValueError("tickets_cursor sadece tek merchant sorgusunda kullanılabilir")
+            return await self._query_complete_data(merchant_ids, include, ticket_query)
         
-        # 3. Merchant contacts
-        merchant_contacts_db = await self.merchant_contact_repo.get_by_merchant_id(merchant_id)
-        contact_ids = [contact.contact_id for contact in merchant_contacts_db] if merchant_contacts_db else []
+        cached = await merchant_complete_cache.get_many(merchant_ids)
+        complete_data = {
+            merchant_id: self._select_sections(MerchantCompleteDto.model_validate_json(document), include)
+            for merchant_id, document in cached.items()
+        }
         
-        # 4. Merchant tickets with details
-        merchant_tickets_db = await self.merchant_ticket_repo.get_by_merchant_id(merchant_id)
-        tickets_with_details = []
+        missing_ids = [merchant_id for merchant_id in dict.fromkeys(merchant_ids) if merchant_id not in cached]
+        if not missing_ids:
+            logger.info(f"⚡ All {len(complete_data)} merchants served from cache")
+            return complete_data
         
-        for ticket_db in merchant_tickets_db:
-            ticket_dto = self.merchant_ticket_mapper.to_dto(ticket_db)
-            
-            # Get ticket details
-            ticket_details_db = await self.ticket_details_repo.get_by_ticket_id(ticket_db.merchant_ticket_id)
-            ticket_detail = None
-            if ticket_details_db:
-                ticket_detail = ticket_details_db.ticket_detail
-            
-            # Create combined ticket with details DTO
-            ticket_with_details = MerchantTicketWithDetailsDto(
-                ticketId=ticket_dto.id,
-                merchantTicketOrderNo=ticket_dto.merchant_ticket_order_no,
-                merchantTicketTypeId=ticket_dto.merchant_ticket_type_id,
-                merchantTicketTime=ticket_dto.merchant_ticket_time,
-                merchantTicketKindId=ticket_dto.merchant_ticket_kind_id,
-                merchantTicketSubTypeId=ticket_dto.merchant_ticket_sub_type_id,
-                merchantTicketExplanation=ticket_dto.merchant_ticket_explanation,
-                merchantTicketFirstExplanation=ticket_dto.merchant_ticket_first_explanation,
-                ticketDetail=ticket_detail
+        if include != MERCHANT_INCLUDE_ALL or not merchant_complete_cache.enabled:
+            loaded = await self._query_complete_data(missing_ids, include)
+        else:
+            # Token yüklemeden önce alınır; yükleme sürerken invalidate edilen merchant'lar cache'e yazılmaz
+            generation = merchant_complete_cache.generation()
+            async with session_scope() as session:
+                loaded = await MerchantUnifiedService(session)._query_complete_data(missing_ids, include)
+            # exclude_unset: set edilmemiş alanlar (örn. ticketsNextCursor) cache'ten okununca da unset kalır,
+            # böylece cache hit ve miss yanıtları response_model_exclude_unset ile aynı anahtarları taşır
+            await merchant_complete_cache.set_many({
+                merchant_id: complete_dto.model_dump_json(by_alias=True, exclude_unset=True)
+                for merchant_id, complete_dto in loaded.items()
+            }, generation=generation)
+        
+        complete_data.update(loaded)
+        return complete_data
+    
+    async def _query_complete_data(
+        self,
+        merchant_ids: List[int],
+        include: FrozenSet[str] = MERCHANT_INCLUDE_ALL,
+        ticket_query: Optional[MerchantTicketQueryDto] = None
+    ) -> Dict[int, MerchantCompleteDto]:
+        """
+        Tabloları merchant sayısından bağımsız olarak sabit sayıda = ANY($1) sorgusuyla yükler ve DTO'ları bellekte birleştirir.
+        Sadece include'daki bölümlerin tabloları sorgulanır: başlık 1, başlık + person 2, tümü 5 sorgu.
+        ticket_query verilirse ticket'lar merchant başına tek LATERAL sorguda zamana göre sınırlanır.
+        """
+        merchants_db = await self.merchant_repo.get_by_ids(merchant_ids)
+        if not merchants_db:
+            return {}
+        
+        found_ids = list(merchants_db)
+        persons_db = await self.merchant_person_repo.get_by_ids(found_ids) if "person" in include else {}
+        contacts_db = await self.merchant_contact_repo.get_many_by("merchant_id", found_ids) if "contacts" in include else {}
+        tickets_db = {}
+        next_cursors: Dict[int, Optional[str]] = {}
+        if "tickets" in include and ticket_query is not None:
+            tickets_db, next_cursors = await self._load_ticket_pages(found_ids, ticket_query)
+        elif "tickets" in include:
+            tickets_db = await self.merchant_ticket_repo.get_many_by("merchant_id", found_ids)
+        
+        ticket_ids = [ticket_db.merchant_ticket_id for tickets in tickets_db.values() for ticket_db in tickets]
+        ticket_details_db = {}
+        if "ticket_details" in include and ticket_ids:
+            ticket_details_db = await self.ticket_details_repo.get_by_ids(ticket_ids)
+        
+        logger.info(f"📦 Loaded {len(merchants_db)} merchants, {len(ticket_ids)} tickets, include: {sorted(include)}")
+        
+        complete_data = {
+            merchant_id: self._build_complete_dto(
+                merchant_db,
+                persons_db.get(merchant_id),
+                contacts_db.get(merchant_id, []),
+                tickets_db.get(merchant_id, []),
+                ticket_details_db,
+                include
             )
-            tickets_with_details.append(ticket_with_details)
+            for merchant_id, merchant_db in merchants_db.items()
+        }
+        
+        # Sayfalamada alan her zaman set edilir (null = son sayfa); diğer durumlarda yanıtta yer almaz
+        if "tickets" in include and ticket_query is not None:
+            for merchant_id, complete_dto in complete_data.items():
+                complete_dto.tickets_next_cursor = next_cursors.get(merchant_id)
+        return complete_data
+    
+    async def _load_ticket_pages(self, merchant_ids: List[int], ticket_query: MerchantTicketQueryDto):
+        """
+        Merchant başına ticket sayfasını getirir; limit'ten bir fazla satır çekilerek sonraki sayfanın varlığı anlaşılır.
+        (merchant_id -> ticket listesi, merchant_id -> sonraki sayfa cursor'ı) döner.
+        """
+        limit = ticket_query.limit
+        cursor = self._decode_ticket_cursor(ticket_query.cursor) if ticket_query.cursor else None
         
-        # 5. Create complete DTO
-        complete_dto = MerchantCompleteDto(
+        pages = await self.merchant_ticket_repo.get_pages_by_merchant_ids(
+            merchant_ids,
+            limit=limit + 1 if limit else None,
+            since=ticket_query.since,
+            cursor=cursor
+        )
+        
+        tickets_db = {}
+        next_cursors = {}
+        for merchant_id, page in pages.items():
+            if limit and len(page) > limit:
+                page = page[:limit]
+                last = page[-1]
+                next_cursors[merchant_id] = encode_cursor([
+                    last.merchant_ticket_time.isoformat() if last.merchant_ticket_time else None,
+                    last.merchant_ticket_id
+                ])
+            tickets_db[merchant_id] = page
+        return tickets_db, next_cursors
+    
+    @staticmethod
+    def _decode_ticket_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+        """Opak ticket cursor'ını (merchant_ticket_time, ticket_id) keyset değerlerine çözer"""
+        ticket_time, ticket_id = decode_cursor(cursor, size=2)
+        try:
+            return (datetime.fromisoformat(ticket_time) if ticket_time is not None else None), int(ticket_id)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Geçersiz tickets_cursor: {cursor}") from e
+    
+    @staticmethod
+    def _select_sections(complete_dto: MerchantCompleteDto, include: FrozenSet[str]) -> MerchantCompleteDto:
+        """Tam DTO'dan include dışındaki bölümleri çıkarır; çıkarılan alanlar yanıtta yer almaz (unset)"""
+        if include == MERCHANT_INCLUDE_ALL:
+            return complete_dto
+        
+        exclude = {
+            field: True
+            for section, fields in _SECTION_FIELDS.items() if section not in include
+            for field in fields
+        }
+        if "tickets" in include and "ticket_details" not in include:
+            exclude["tickets"] = {"__all__": {"ticket_detail": True}}
+        return MerchantCompleteDto.model_validate(complete_dto.model_dump(exclude=exclude, exclude_unset=True))
+    
+    def _build_complete_dto(self, merchant_db, merchant_person_db, merchant_contacts_db, merchant_tickets_db, ticket_details_db, include: FrozenSet[str] = MERCHANT_INCLUDE_ALL) -> MerchantCompleteDto:
+        """
+        Önceden yüklenmiş satırlardan tek merchant'ın MerchantCompleteDto'sunu kurar.
+        include dışındaki bölümlerin alanları hiç verilmez (unset); route'lar bunları yanıta yazmaz.
+        """
+        merchant_dto = self.merchant_mapper.to_dto(merchant_db)
+        
+        complete_values = dict(
             merchantId=merchant_dto.id,
             merchantName=merchant_dto.merchant_name,
             merchantBrand=merchant_dto.merchant_brand,
@@ -109,71 +337,71 @@ class MerchantUnifiedService:
             merchantService=merchant_dto.merchant_service,
             merchantTicket=merchant_dto.merchant_ticket,
             merchantInsertedAt=merchant_dto.inserted_at,
-            merchantPersonState=merchant_person_dto.merchant_person_state if merchant_person_dto else None,
-            merchantPersonName=merchant_person_dto.merchant_person_name if merchant_person_dto else None,
-            merchantPersonPhone=merchant_person_dto.merchant_person_phone if merchant_person_dto else None,
-            contactIds=contact_ids if contact_ids else None,
-            tickets=tickets_with_details if tickets_with_details else None
         )
         
-        logger.info(f"✅ Complete merchant data assembled for ID: {merchant_id}")
-        return complete_dto
-    
-    async def get_merchants_batch_data(self, request: MerchantBatchRequestDto) -> MerchantBatchResponseDto:
-        """
-        Birden fazla merchant_id için beş tablodan tüm veriyi getirir (batch işlem).
-        """
-        logger.info(f"🚀 Service: getting batch merchant data for {len(request.merchant_ids)} merchants")
-        
-        merchants = []
-        for merchant_id in request.merchant_ids:
-            merchant_data = await self.get_merchant_complete_data(merchant_id)
-            if merchant_data:
-                merchants.append(merchant_data)
-        
-        response = MerchantBatchResponseDto(
-            merchants=merchants,
-            totalCount=len(merchants)
-        )
+        if "person" in include:
+            merchant_person_dto = None
+            if merchant_person_db:
+                merchant_person_dto = self.merchant_person_mapper.to_dto(merchant_person_db)
+            
+            complete_values.update(
+                merchantPersonState=merchant_person_dto.merchant_person_state if merchant_person_dto else None,
+                merchantPersonName=merchant_person_dto.merchant_person_name if merchant_person_dto else None,
+                merchantPersonPhone=merchant_person_dto.merchant_person_phone if merchant_person_dto else None,
+            )
         
-        logger.info(f"✅ Batch merchant data assembled for {len(merchants)} merchants")
-        return response
-    
-    async def get_merchants_by_ids(self, merchant_ids: List[int]) -> List[MerchantCompleteDto]:
-        """
-        Birden fazla merchant_id için complete data listesi döner.
-        """
-        logger.info(f"🚀 Service: getting merchants by IDs: {merchant_ids}")
+        if "contacts" in include:
+            contact_ids = [contact.contact_id for contact in merchant_contacts_db]
+            complete_values["contactIds"] = contact_ids if contact_ids else None
         
-        merchants = []
-        for merchant_id in merchant_ids:
-            merchant_data = await self.get_merchant_complete_data(merchant_id)
-            if merchant_data:
-                merchants.append(merchant_data)
+        if "tickets" in include:
+            tickets_with_details = []
+            for ticket_db in merchant_tickets_db:
+                ticket_dto = self.merchant_ticket_mapper.to_dto(ticket_db)
+                
+                ticket_values = dict(
+                    ticketId=ticket_dto.id,
+                    merchantTicketOrderNo=ticket_dto.merchant_ticket_order_no,
+                    merchantTicketTypeId=ticket_dto.merchant_ticket_type_id,
+                    merchantTicketTime=ticket_dto.merchant_ticket_time,
+                    merchantTicketKindId=ticket_dto.merchant_ticket_kind_id,
+                    merchantTicketSubTypeId=ticket_dto.merchant_ticket_sub_type_id,
+                    merchantTicketExplanation=ticket_dto.merchant_ticket_explanation,
+                    merchantTicketFirstExplanation=ticket_dto.merchant_ticket_first_explanation,
+                )
+                if "ticket_details" in include:
+                    ticket_details = ticket_details_db.get(ticket_db.merchant_ticket_id)
+                    ticket_values["ticketDetail"] = ticket_details.ticket_detail if ticket_details else None
+                
+                # Create combined ticket with details DTO
+                tickets_with_details.append(MerchantTicketWithDetailsDto(**ticket_values))
+            
+            complete_values["tickets"] = tickets_with_details if tickets_with_details else None
         
-        return merchants
+        return MerchantCompleteDto(**complete_values)
     
-    async def get_merchant_by_phone(self, phone: str) -> Optional[MerchantCompleteDto]:
+    async def get_merchant_by_phone(self, phone: str, ticket_query: Optional[MerchantTicketQueryDto] = None) -> Optional[MerchantCompleteDto]:
         """
         Telefon numarası ile merchant person tablosunu arar ve merchant_id'yi bularak
         tüm merchant verilerini getirir.
         """
         logger.info(f"🚀 Service: searching merchant by phone: {phone}")
         
-        # 1. Telefon numarası ile merchant person ara
-        merchant_persons = await self.merchant_person_repo.get_by_phone(phone)
-        if not merchant_persons:
-            logger.warning(f"Telefon numarası için merchant person bulunamadı: {phone}")
-            return None
-        
-        # İlk bulunan merchant person'ı kullan (birden fazla olabilir)
-        merchant_person = merchant_persons[0]
-        merchant_id = merchant_person.merchant_id
+        # 1. Önce bellek içi index; bulunamazsa (henüz yüklenmedi / son yenilemeden sonra eklendi) DB'ye düş
+        merchant_id = merchant_phone_index.lookup(phone)
+        if merchant_id is None:
+            merchant_persons = await self.merchant_person_repo.get_by_phone(phone)
+            if not merchant_persons:
+                logger.warning(f"Telefon numarası için merchant person bulunamadı: {phone}")
+                return None
+            
+            # İlk bulunan merchant person'ı kullan (birden fazla olabilir)
+            merchant_id = merchant_persons[0].merchant_id
         
         logger.info(f"📞 Phone {phone} için bulunan merchant_id: {merchant_id}")
         
         # 2. Merchant ID ile tüm verileri getir
-        complete_data = await self.get_merchant_complete_data(merchant_id)
+        complete_data = await self.get_merchant_complete_data(merchant_id, ticket_query=ticket_query)
         
         if complete_data:
             logger.info(f"✅ Complete merchant data found for phone: {phone}")
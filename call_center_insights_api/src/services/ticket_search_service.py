@@ -0,0 +1,71 @@
+# services/ticket_search_service.py
+import logging
+from typing import Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from datalayer.model.dto.ticket_search_dto import TicketSearchResponseDto
+from datalayer.mapper.ticket_details_mapper import TicketDetailsMapper
+from datalayer.repository.ticket_details_repository import TicketDetailsRepository
+from datalayer.repository._cursor import encode_cursor, decode_cursor
+
+logger = logging.getLogger(__name__)
+
+class TicketSearchService:
+    """
+    Ticket detayları üzerinde Türkçe tam metin arama (migrations/V007 tsvector + GIN).
+    Sonuçlar alaka skoruna göre sıralanır ve (rank, ticket_id) keyset'i ile sayfalanır.
+    """
+    
+    DEFAULT_PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+    
+    def __init__(self, db: AsyncSession):
+        self.repository = TicketDetailsRepository(db)
+        self.mapper = TicketDetailsMapper()
+    
+    async def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        merchant_id: Optional[int] = None
+    ) -> TicketSearchResponseDto:
+        """
+        query ile eşleşen ticket detaylarını, vurgulanmış parçaları ve bağlı merchant ID'leriyle döndürür.
+        """
+        logger.info(f"🚀 Service: searching ticket details for {query!r}, merchant_id: {merchant_id}")
+        
+        try:
+            query = query.strip()
+            if not query:
+                raise ValueError("Arama metni boş olamaz")
+            
+            page_size = min(limit or self.DEFAULT_PAGE_SIZE, self.MAX_PAGE_SIZE)
+            keyset = self._decode_search_cursor(cursor) if cursor else None
+            
+            # Bir fazla satır çekerek sonraki sayfanın varlığını anla
+            rows = await self.repository.search(query, limit=page_size + 1, cursor=keyset, merchant_id=merchant_id)
+            page_rows = rows[:page_size]
+            
+            next_cursor = None
+            if len(rows) > page_size:
+                last = page_rows[-1]
+                next_cursor = encode_cursor([last.rank, last.ticket_id])
+            
+            hits = [self.mapper.to_search_hit_dto(row) for row in page_rows]
+            merchant_ids = list(dict.fromkeys(hit.merchant_id for hit in hits))
+            
+            logger.info(f"✅ Service: Found {len(hits)} ticket details across {len(merchant_ids)} merchants")
+            return TicketSearchResponseDto(hits=hits, merchant_ids=merchant_ids, next_cursor=next_cursor)
+            
+        except Exception as e:
+            logger.error(f"❌ Service: Error searching ticket details: {e}")
+            raise
+    
+    @staticmethod
+    def _decode_search_cursor(cursor: str) -> Tuple[float, int]:
+        """Opak cursor'ı (rank, ticket_id) keyset değerlerine çözer"""
+        rank, ticket_id = decode_cursor(cursor, size=2)
+        try:
+            return float(rank), int(ticket_id)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Geçersiz cursor: {cursor}") from e